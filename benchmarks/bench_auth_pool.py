@@ -0,0 +1,59 @@
+"""Login throughput benchmark: bcrypt verification through the auth pool
+
+Runs a burst of concurrent verifications from an asyncio loop (as the login
+handler does) for increasing pool sizes and reports verifications/second.
+
+Usage:
+    python benchmarks/bench_auth_pool.py [--requests 64] [--kind thread|process]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from executors import BoundedExecutor  # noqa: E402
+from utils import hash_password, verify_password  # noqa: E402
+
+
+async def burst(executor: BoundedExecutor, hashed: str, requests: int) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(executor.run(verify_password, "password123", hashed) for _ in range(requests))
+    )
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=64, help="Concurrent logins per run")
+    parser.add_argument("--kind", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    hashed = hash_password("password123")
+    cores = os.cpu_count() or 1
+    sizes = sorted({1, 2, 4, cores} & set(range(1, cores + 1))) or [1]
+
+    # Baseline: what the handlers did before, verifying inline on the loop thread
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        verify_password("password123", hashed)
+    inline = time.perf_counter() - start
+    print(f"{'inline (event loop)':<22} {args.requests / inline:8.1f} logins/s")
+
+    for workers in sizes:
+        executor = BoundedExecutor("bench", kind=args.kind, max_workers=workers, max_queue=args.requests)
+        try:
+            asyncio.run(burst(executor, hashed, workers))  # warm up workers
+            elapsed = asyncio.run(burst(executor, hashed, args.requests))
+        finally:
+            executor.shutdown()
+        print(f"{f'{args.kind} pool x{workers}':<22} {args.requests / elapsed:8.1f} logins/s")
+
+
+if __name__ == "__main__":
+    main()
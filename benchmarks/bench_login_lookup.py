@@ -0,0 +1,57 @@
+"""Login lookup latency: SELECT * per-connection vs pooled, prepared credential lookup
+
+Runs the user lookup done by AuthService.login from many threads at once
+(as the db executor does) and reports p50/p99 latency for both paths.
+Needs a reachable MySQL configured through the DB_* environment variables
+and at least one registered user.
+
+Usage:
+    python benchmarks/bench_login_lookup.py --email user@example.com [--threads 32] [--requests 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.user_repository import UserRepository  # noqa: E402
+
+
+def timed(fn, email: str) -> float:
+    start = time.perf_counter()
+    assert fn(email) is not None, f"No user registered with {email}"
+    return (time.perf_counter() - start) * 1000
+
+
+def run(fn, email: str, threads: int, requests: int):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: timed(fn, email), range(threads)))  # warm up connections
+        start = time.perf_counter()
+        latencies = sorted(pool.map(lambda _: timed(fn, email), range(requests)))
+        elapsed = time.perf_counter() - start
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return p50, p99, requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--email", required=True, help="Email of an existing user")
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent lookups (db executor size)")
+    parser.add_argument("--requests", type=int, default=2000, help="Lookups per path")
+    args = parser.parse_args()
+
+    paths = [
+        ("get_user_by_email", UserRepository.get_user_by_email),
+        ("get_credentials_by_email", UserRepository.get_credentials_by_email),
+    ]
+    for name, fn in paths:
+        p50, p99, throughput = run(fn, args.email, args.threads, args.requests)
+        print(f"{name:<26} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   {throughput:8.1f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Bloom filter of registered emails
+
+A negative answer is definite, so signup can skip even the indexed
+existence query for addresses that were never registered. A positive
+answer is only "maybe" and is confirmed against the database. The unique
+key on users.email stays the source of truth: the filter is per worker and
+misses emails registered by other workers since it was built, which just
+falls back to the duplicate-key error on INSERT.
+"""
+import hashlib
+import logging
+import math
+import threading
+from typing import Iterable, Optional
+
+import metrics
+from config import SIGNUP_EMAIL_BLOOM_ENABLED, SIGNUP_EMAIL_BLOOM_CAPACITY, SIGNUP_EMAIL_BLOOM_ERROR_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("Bloom filter needs capacity >= 1 and 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        with self._lock:
+            for position in self._positions(item):
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def stats(self):
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "bits": self.num_bits,
+            "hashes": self.num_hashes,
+            "target_error_rate": self.error_rate,
+        }
+
+
+class RegisteredEmailFilter:
+    """Process-wide filter of registered emails, swapped atomically on rebuild"""
+
+    def __init__(self, capacity: int = SIGNUP_EMAIL_BLOOM_CAPACITY, error_rate: float = SIGNUP_EMAIL_BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        self.negatives = 0
+        self.maybes = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def rebuild(self, emails: Iterable[str]) -> int:
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for email in emails:
+            bloom.add(email.lower())
+        self._filter = bloom
+        if bloom.count > self.capacity:
+            logger.warning(
+                f"Registered email filter holds {bloom.count} emails, above its capacity of {self.capacity}; "
+                "raise SIGNUP_EMAIL_BLOOM_CAPACITY to keep the false positive rate down"
+            )
+        return bloom.count
+
+    def might_contain(self, email: str) -> bool:
+        """False only when the email is certainly not registered (or was registered elsewhere since the rebuild)"""
+        bloom = self._filter
+        if bloom is None:
+            return True
+        if email.lower() in bloom:
+            self.maybes += 1
+            return True
+        self.negatives += 1
+        return False
+
+    def add(self, email: str) -> None:
+        bloom = self._filter
+        if bloom is not None:
+            bloom.add(email.lower())
+
+    def stats(self):
+        bloom = self._filter
+        return {
+            "ready": bloom is not None,
+            "negatives": self.negatives,
+            "maybes": self.maybes,
+            **(bloom.stats() if bloom is not None else {}),
+        }
+
+
+_email_filter: Optional[RegisteredEmailFilter] = None
+_email_filter_lock = threading.Lock()
+
+
+def get_registered_email_filter() -> Optional[RegisteredEmailFilter]:
+    """Return the process-wide filter, or None when SIGNUP_EMAIL_BLOOM_ENABLED is off"""
+    global _email_filter
+    if not SIGNUP_EMAIL_BLOOM_ENABLED:
+        return None
+    if _email_filter is None:
+        with _email_filter_lock:
+            if _email_filter is None:
+                _email_filter = RegisteredEmailFilter()
+                metrics.register("signup_email_filter", _email_filter.stats)
+    return _email_filter
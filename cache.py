@@ -0,0 +1,244 @@
+"""Shared cache backends used by the service layer
+
+Entries are stored together with the versions of the tags they depend on.
+Invalidating a tag just bumps its version, so every entry carrying the old
+version becomes a miss. With the Redis backend the tag versions live in Redis
+as well, which makes a write in one worker visible to all the others.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config import (
+    CACHE_BACKEND,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_ENTRIES,
+    CACHE_REDIS_URL,
+    CACHE_KEY_PREFIX
+)
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Base cache with tag-versioned entries built on raw key/value primitives"""
+
+    def __init__(self, default_ttl: int = CACHE_TTL_SECONDS, prefix: str = CACHE_KEY_PREFIX):
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    # Raw primitives implemented by the backends
+    def _get_raw(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set_raw(self, key: str, data: bytes, ttl: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def _delete_raw(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _get_tag_versions(self, tags: List[str]) -> List[int]:
+        raise NotImplementedError
+
+    def _bump_tag(self, tag: str) -> None:
+        raise NotImplementedError
+
+    # Public API
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing, expired or invalidated"""
+        data = self._get_raw(self.prefix + key)
+        if data is None:
+            return None
+        try:
+            versions, value = pickle.loads(data)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+            self._delete_raw(self.prefix + key)
+            return None
+        if versions:
+            tags = list(versions)
+            if self._get_tag_versions(tags) != [versions[tag] for tag in tags]:
+                return None
+        return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[int] = None,
+            versions: Optional[Dict[str, int]] = None) -> None:
+        """Store a value; `versions` is the tag snapshot taken before loading it"""
+        tags = list(tags)
+        if versions is None:
+            versions = self.snapshot(tags)
+        data = pickle.dumps((versions, value), protocol=pickle.HIGHEST_PROTOCOL)
+        self._set_raw(self.prefix + key, data, ttl if ttl is not None else self.default_ttl)
+
+    def snapshot(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        return dict(zip(tags, self._get_tag_versions(tags)))
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], tags: Iterable[str] = (),
+                    ttl: Optional[int] = None) -> Any:
+        """Return the cached value or call `loader` and cache its (non-None) result.
+
+        Tag versions are read before the loader runs so a write that lands
+        while the value is being loaded invalidates it instead of being lost.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        versions = self.snapshot(tags)
+        value = loader()
+        if value is not None:
+            self.set(key, value, ttl=ttl, versions=versions)
+        return value
+
+    def delete(self, key: str) -> None:
+        self._delete_raw(self.prefix + key)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        for tag in tags:
+            self._bump_tag(tag)
+
+
+class NullCache(CacheBackend):
+    """Cache that never stores anything"""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[int] = None,
+            versions: Optional[Dict[str, int]] = None) -> None:
+        pass
+
+    def snapshot(self, tags: Iterable[str]) -> Dict[str, int]:
+        return {}
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def invalidate_tags(self, *tags: str) -> None:
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """Per-process LRU cache with TTL
+
+    Tag versions are kept outside the LRU so evicting entries can never
+    resurrect an invalidated value.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, default_ttl: int = CACHE_TTL_SECONDS,
+                 prefix: str = CACHE_KEY_PREFIX):
+        super().__init__(default_ttl=default_ttl, prefix=prefix)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _get_raw(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def _set_raw(self, key: str, data: bytes, ttl: Optional[int]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _delete_raw(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _get_tag_versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            return [self._tags.get(tag, 0) for tag in tags]
+
+    def _bump_tag(self, tag: str) -> None:
+        with self._lock:
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisCache(CacheBackend):
+    """Cache shared by all workers through a Redis-protocol server"""
+
+    def __init__(self, url: str = CACHE_REDIS_URL, client=None, default_ttl: int = CACHE_TTL_SECONDS,
+                 prefix: str = CACHE_KEY_PREFIX):
+        super().__init__(default_ttl=default_ttl, prefix=prefix)
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The 'redis' package is required for the redis cache backend")
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _get_raw(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def _set_raw(self, key: str, data: bytes, ttl: Optional[int]) -> None:
+        if ttl:
+            self.client.set(key, data, ex=ttl)
+        else:
+            self.client.set(key, data)
+
+    def _delete_raw(self, key: str) -> None:
+        self.client.delete(key)
+
+    def _get_tag_versions(self, tags: List[str]) -> List[int]:
+        values = self.client.mget([self._tag_key(tag) for tag in tags])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def _bump_tag(self, tag: str) -> None:
+        self.client.incr(self._tag_key(tag))
+
+
+def create_cache(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """Build the cache backend selected in configuration"""
+    backend = (backend or "none").lower()
+    if backend == "memory":
+        logger.warning("In-process cache: entries are per worker, run a single worker or use CACHE_BACKEND=redis")
+        return InMemoryCache()
+    if backend == "redis":
+        return RedisCache()
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+_cache: Optional[CacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache instance"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_cache()
+                logger.info(f"Cache backend initialized: {type(_cache).__name__}")
+    return _cache
@@ -13,6 +13,12 @@ DB_CONFIG = {
     "database": os.getenv("DB_NAME", "eventplanner"),
 }
 
+# Pooled connections for hot read paths (e.g. the login credential lookup)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+# Ping connections idle for longer than this before reuse
+DB_POOL_PING_AFTER_SECONDS = float(os.getenv("DB_POOL_PING_AFTER_SECONDS", "60"))
+
 # لو في أي كود قديم بيستخدم DATABASE_URL (مش أساسي هنا)
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -34,3 +40,165 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
 )
+# Rotating refresh tokens let clients get new access tokens without a bcrypt login
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+# ==============================
+# Cache configuration
+# ==============================
+
+# "redis" (shared between workers), "memory" (per-worker LRU: only coherent with a
+# single worker, a write in one worker never invalidates the others) or "none"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "eventplanner:")
+
+# ==============================
+# Password hashing pool
+# ==============================
+
+# bcrypt releases the GIL, so a thread pool scales with cores; "process" is also supported
+AUTH_POOL_KIND = os.getenv("AUTH_POOL_KIND", "thread")
+AUTH_POOL_WORKERS = int(os.getenv("AUTH_POOL_WORKERS", str(os.cpu_count() or 1)))
+# Hash/verify jobs allowed to wait for a worker before requests get 503
+AUTH_POOL_MAX_QUEUE = int(os.getenv("AUTH_POOL_MAX_QUEUE", "64"))
+
+# ==============================
+# Worker pools for I/O and background work
+# ==============================
+
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "32"))
+DB_EXECUTOR_MAX_QUEUE = int(os.getenv("DB_EXECUTOR_MAX_QUEUE", "256"))
+BACKGROUND_EXECUTOR_WORKERS = int(os.getenv("BACKGROUND_EXECUTOR_WORKERS", "4"))
+BACKGROUND_EXECUTOR_MAX_QUEUE = int(os.getenv("BACKGROUND_EXECUTOR_MAX_QUEUE", "1000"))
+# User-triggered bulk imports; with no queue, an import past the limit gets 503 before it starts
+IMPORT_EXECUTOR_WORKERS = int(os.getenv("IMPORT_EXECUTOR_WORKERS", "2"))
+IMPORT_EXECUTOR_MAX_QUEUE = int(os.getenv("IMPORT_EXECUTOR_MAX_QUEUE", "0"))
+
+# ==============================
+# Password hashing cost
+# ==============================
+
+# Fixed bcrypt cost; leave unset to use passlib's default (12) or autotuning
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS")) if os.getenv("BCRYPT_ROUNDS") else None
+# Calibrate the cost at startup so a verification takes about BCRYPT_TARGET_VERIFY_MS
+BCRYPT_AUTOTUNE = os.getenv("BCRYPT_AUTOTUNE", "False").lower() == "true"
+BCRYPT_TARGET_VERIFY_MS = float(os.getenv("BCRYPT_TARGET_VERIFY_MS", "250"))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+
+# ==============================
+# Verified token cache
+# ==============================
+
+# Serve repeat bearer tokens from memory instead of re-verifying the JWT on every request
+TOKEN_CACHE_ENABLED = os.getenv("TOKEN_CACHE_ENABLED", "True").lower() == "true"
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+# ==============================
+# Token revocation (logout)
+# ==============================
+
+# "memory" (per worker) or "redis" (shared, required when running several workers)
+REVOCATION_BACKEND = os.getenv("REVOCATION_BACKEND", "memory")
+REVOCATION_REDIS_URL = os.getenv("REVOCATION_REDIS_URL", CACHE_REDIS_URL)
+
+# ==============================
+# Login throttling
+# ==============================
+
+# Token buckets checked before any database or bcrypt work on /login
+LOGIN_RATE_LIMIT_ENABLED = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "True").lower() == "true"
+# "memory" (per worker) or "redis" (shared budget across workers)
+LOGIN_RATE_LIMIT_BACKEND = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "memory")
+LOGIN_RATE_LIMIT_REDIS_URL = os.getenv("LOGIN_RATE_LIMIT_REDIS_URL", CACHE_REDIS_URL)
+# Burst size and sustained attempts per minute for each email address and each client IP
+LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", "5"))
+LOGIN_EMAIL_PER_MINUTE = float(os.getenv("LOGIN_EMAIL_PER_MINUTE", "5"))
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "20"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "30"))
+# Buckets kept in memory per limiter; least recently used keys are dropped first
+LOGIN_RATE_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_RATE_LIMIT_MAX_KEYS", "100000"))
+# Take the client IP from X-Forwarded-For (only behind a trusted proxy / router)
+LOGIN_RATE_LIMIT_TRUST_FORWARDED = os.getenv("LOGIN_RATE_LIMIT_TRUST_FORWARDED", "False").lower() == "true"
+
+# ==============================
+# Admin API and bulk user import
+# ==============================
+
+# Key expected in the X-Admin-Key header; the admin endpoints are disabled while unset
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+USER_IMPORT_BATCH_SIZE = int(os.getenv("USER_IMPORT_BATCH_SIZE", "500"))
+USER_IMPORT_MAX_ROWS = int(os.getenv("USER_IMPORT_MAX_ROWS", "20000"))
+# Processes hashing imported passwords (separate from the auth pool serving logins)
+USER_IMPORT_HASH_WORKERS = int(os.getenv("USER_IMPORT_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# ==============================
+# Signup duplicate-email filter
+# ==============================
+
+# Per-worker Bloom filter of registered emails, built at startup, checked before the existence query
+SIGNUP_EMAIL_BLOOM_ENABLED = os.getenv("SIGNUP_EMAIL_BLOOM_ENABLED", "False").lower() == "true"
+SIGNUP_EMAIL_BLOOM_CAPACITY = int(os.getenv("SIGNUP_EMAIL_BLOOM_CAPACITY", "1000000"))
+SIGNUP_EMAIL_BLOOM_ERROR_RATE = float(os.getenv("SIGNUP_EMAIL_BLOOM_ERROR_RATE", "0.01"))
+
+# ==============================
+# Bulk event operations
+# ==============================
+
+# Largest list accepted by the bulk invite / RSVP / delete / archive endpoints in one request
+BULK_EVENT_MAX_ITEMS = int(os.getenv("BULK_EVENT_MAX_ITEMS", "1000"))
+# Bulk archives moving more attendee rows than this run as a chunked background job
+EVENT_ARCHIVE_SYNC_MAX_ROWS = int(os.getenv("EVENT_ARCHIVE_SYNC_MAX_ROWS", "5000"))
+# The archive job moves events whose last occurrence is older than this many days,
+# EVENT_ARCHIVE_BATCH_SIZE events per transaction
+EVENT_ARCHIVE_AFTER_DAYS = int(os.getenv("EVENT_ARCHIVE_AFTER_DAYS", "730"))
+EVENT_ARCHIVE_BATCH_SIZE = int(os.getenv("EVENT_ARCHIVE_BATCH_SIZE", "200"))
+# Archive tables are RANGE partitioned by date: months per partition (1 or 3), first
+# partition boundary (older rows share p_history), and how far ahead
+# `manage.py add-event-partitions` creates partitions
+EVENT_PARTITION_MONTHS = int(os.getenv("EVENT_PARTITION_MONTHS", "3"))
+EVENT_PARTITION_START = os.getenv("EVENT_PARTITION_START", "2020-01-01")
+EVENT_PARTITION_AHEAD_MONTHS = int(os.getenv("EVENT_PARTITION_AHEAD_MONTHS", "12"))
+
+# ==============================
+# Attendance write-behind
+# ==============================
+
+# Acknowledge attendance updates once queued and write them in coalesced batches.
+# Queued updates are lost if the process dies before the next flush, and reads (attendee
+# lists, feeds) lag an acknowledged update by up to the interval; see write_behind.py
+ATTENDANCE_WRITE_BEHIND_ENABLED = os.getenv("ATTENDANCE_WRITE_BEHIND_ENABLED", "False").lower() == "true"
+ATTENDANCE_WRITE_BEHIND_INTERVAL_MS = int(os.getenv("ATTENDANCE_WRITE_BEHIND_INTERVAL_MS", "200"))
+# Pending (event, user) pairs that trigger a flush before the interval is up
+ATTENDANCE_WRITE_BEHIND_MAX_BATCH = int(os.getenv("ATTENDANCE_WRITE_BEHIND_MAX_BATCH", "500"))
+# Flushes an update is retried for before it is dropped and logged
+ATTENDANCE_WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("ATTENDANCE_WRITE_BEHIND_MAX_ATTEMPTS", "5"))
+
+# ==============================
+# Bulk event import
+# ==============================
+
+# Events written per INSERT transaction, and the most records read from one file
+EVENT_IMPORT_BATCH_SIZE = int(os.getenv("EVENT_IMPORT_BATCH_SIZE", "500"))
+EVENT_IMPORT_MAX_ROWS = int(os.getenv("EVENT_IMPORT_MAX_ROWS", "50000"))
+
+# ==============================
+# Recurring events
+# ==============================
+
+# How far past today a recurring series is expanded when a request gives no end date
+RECURRENCE_EXPANSION_DAYS = int(os.getenv("RECURRENCE_EXPANSION_DAYS", "365"))
+# Most occurrences of one series returned by an expanded listing (its newest ones);
+# one-off events are never cut
+RECURRENCE_MAX_OCCURRENCES = int(os.getenv("RECURRENCE_MAX_OCCURRENCES", "1000"))
+
+# ==============================
+# Event deletion
+# ==============================
+
+# Rows deleted per committed chunk when purging a deleted event, and the pause between chunks
+EVENT_PURGE_CHUNK_SIZE = int(os.getenv("EVENT_PURGE_CHUNK_SIZE", "1000"))
+EVENT_PURGE_PAUSE_MS = int(os.getenv("EVENT_PURGE_PAUSE_MS", "50"))
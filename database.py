@@ -1,8 +1,16 @@
 import mysql.connector
 from mysql.connector import errorcode
-from typing import Optional
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator
 import logging
-from config import DB_CONFIG
+import queue
+import threading
+import time
+import metrics
+from datetime import date
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_TIMEOUT_SECONDS, DB_POOL_PING_AFTER_SECONDS
+from config import EVENT_PARTITION_START, EVENT_PARTITION_MONTHS, EVENT_PARTITION_AHEAD_MONTHS
+from partitions import PARTITIONED_TABLES, initial_partitioning
 from handlers.exceptions import DatabaseConnectionException
 
 logger = logging.getLogger(__name__)
@@ -60,6 +68,12 @@ def init_db() -> None:
             cursor.execute("ALTER TABLE `users` ADD COLUMN `name` VARCHAR(255) NOT NULL FIRST")
             logger.info("Column 'name' added to 'users' table.")
 
+        # Covering index for the login lookup (InnoDB appends the primary key, id)
+        cursor.execute("SHOW INDEX FROM `users` WHERE Key_name = 'idx_users_credentials'")
+        if not cursor.fetchall():
+            cursor.execute("ALTER TABLE `users` ADD INDEX `idx_users_credentials` (email, name, password)")
+            logger.info("Index 'idx_users_credentials' added to 'users' table.")
+
         # Create events table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS events (
@@ -78,6 +92,24 @@ def init_db() -> None:
             DEFAULT CHARSET=utf8
         ''')
 
+        # Recurrence rule of a series; `date` is its first occurrence
+        cursor.execute("SHOW COLUMNS FROM `events` LIKE 'recurrence_freq'")
+        if not cursor.fetchone():
+            cursor.execute('''
+                ALTER TABLE `events`
+                    ADD COLUMN `recurrence_freq` ENUM('weekly', 'monthly') NULL AFTER `description`,
+                    ADD COLUMN `recurrence_interval` SMALLINT NOT NULL DEFAULT 1 AFTER `recurrence_freq`,
+                    ADD COLUMN `recurrence_until` DATE NULL AFTER `recurrence_interval`,
+                    ADD COLUMN `recurrence_count` INT NULL AFTER `recurrence_until`
+            ''')
+            logger.info("Recurrence columns added to 'events' table.")
+
+        # Soft delete: a deleted event is hidden at once and purged in the background
+        cursor.execute("SHOW COLUMNS FROM `events` LIKE 'deleted_at'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE `events` ADD COLUMN `deleted_at` DATETIME NULL AFTER `updated_at`")
+            logger.info("Column 'deleted_at' added to 'events' table.")
+
         # Create event_attendees table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS event_attendees (
@@ -105,6 +137,196 @@ def init_db() -> None:
             cursor.execute("ALTER TABLE `event_attendees` ADD COLUMN `attendance_status` ENUM('pending', 'going', 'maybe', 'not_going') DEFAULT 'pending' AFTER role")
             logger.info("Column 'attendance_status' added to 'event_attendees' table.")
 
+        # Per-occurrence attendance of recurring events, only where it differs from the series row
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS event_occurrence_overrides (
+                event_id INT NOT NULL,
+                occurrence_date DATE NOT NULL,
+                user_id INT NOT NULL,
+                attendance_status ENUM('pending', 'going', 'maybe', 'not_going') NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (event_id, occurrence_date, user_id),
+                CONSTRAINT fk_overrides_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+                CONSTRAINT fk_overrides_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+        ''')
+
+        # Create user_event_feed table (denormalized per-user event listing)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_event_feed (
+                user_id INT NOT NULL,
+                event_id INT NOT NULL,
+                role ENUM('organizer','attendee') NOT NULL,
+                attendance_status ENUM('pending', 'going', 'maybe', 'not_going') DEFAULT 'pending',
+                event_date DATE NOT NULL,
+                title VARCHAR(255) NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, event_id),
+                KEY idx_feed_user_date (user_id, event_date, event_id),
+                KEY idx_feed_event (event_id),
+                CONSTRAINT fk_feed_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+                CONSTRAINT fk_feed_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+        ''')
+
+        # Create event_rsvp_counts table (denormalized attendance counters)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS event_rsvp_counts (
+                event_id INT PRIMARY KEY,
+                pending_count INT NOT NULL DEFAULT 0,
+                going_count INT NOT NULL DEFAULT 0,
+                maybe_count INT NOT NULL DEFAULT 0,
+                not_going_count INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                CONSTRAINT fk_rsvp_counts_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+        ''')
+
+        # Progress of the chunked purges of deleted events (outlives the event row)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS event_purge_jobs (
+                event_id INT PRIMARY KEY,
+                organizer_user_id INT NOT NULL,
+                status ENUM('pending', 'running', 'done', 'failed') NOT NULL DEFAULT 'pending',
+                total_rows INT NOT NULL DEFAULT 0,
+                purged_rows INT NOT NULL DEFAULT 0,
+                error VARCHAR(255) NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                finished_at DATETIME NULL,
+                KEY idx_purge_status (status)
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+        ''')
+
+        # Archive tier: archived events, frozen with their RSVP counts, and their
+        # attendee and override rows. No foreign keys; rows are moved here whole.
+        # RANGE partitioned by date (see partitions.py), so every unique key
+        # includes the date column
+        partition_by = {
+            table: initial_partitioning(column, date.fromisoformat(EVENT_PARTITION_START), EVENT_PARTITION_MONTHS,
+                                        date.today(), EVENT_PARTITION_AHEAD_MONTHS)
+            for table, column in PARTITIONED_TABLES.items()
+        }
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS events_archive (
+                id INT NOT NULL,
+                title VARCHAR(255) NOT NULL,
+                date DATE NOT NULL,
+                time TIME NOT NULL,
+                location VARCHAR(255) NOT NULL,
+                description TEXT,
+                recurrence_freq ENUM('weekly', 'monthly') NULL,
+                recurrence_interval SMALLINT NOT NULL DEFAULT 1,
+                recurrence_until DATE NULL,
+                recurrence_count INT NULL,
+                organizer_user_id INT NOT NULL,
+                pending_count INT NOT NULL DEFAULT 0,
+                going_count INT NOT NULL DEFAULT 0,
+                maybe_count INT NOT NULL DEFAULT 0,
+                not_going_count INT NOT NULL DEFAULT 0,
+                created_at TIMESTAMP NULL,
+                updated_at TIMESTAMP NULL,
+                archived_at DATETIME NOT NULL,
+                PRIMARY KEY (id, date),
+                KEY idx_events_archive_organizer (organizer_user_id, date),
+                KEY idx_events_archive_date (date)
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+            {partition_by["events_archive"]}
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS event_attendees_archive (
+                id INT NOT NULL,
+                event_id INT NOT NULL,
+                event_date DATE NOT NULL,
+                user_id INT NOT NULL,
+                role ENUM('organizer','attendee') NOT NULL,
+                attendance_status ENUM('pending', 'going', 'maybe', 'not_going') DEFAULT 'pending',
+                created_at TIMESTAMP NULL,
+                updated_at TIMESTAMP NULL,
+                PRIMARY KEY (id, event_date),
+                UNIQUE KEY uq_attendees_archive_event_user (event_id, user_id, event_date),
+                KEY idx_attendees_archive_user_role (user_id, role)
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+            {partition_by["event_attendees_archive"]}
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS event_occurrence_overrides_archive (
+                event_id INT NOT NULL,
+                occurrence_date DATE NOT NULL,
+                user_id INT NOT NULL,
+                attendance_status ENUM('pending', 'going', 'maybe', 'not_going') NOT NULL,
+                updated_at TIMESTAMP NULL,
+                PRIMARY KEY (event_id, occurrence_date, user_id)
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+            {partition_by["event_occurrence_overrides_archive"]}
+        ''')
+
+        # Archive tables created before partitioning: add the attendee date, widen the keys, partition
+        cursor.execute("SHOW COLUMNS FROM `event_attendees_archive` LIKE 'event_date'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE `events_archive` DROP PRIMARY KEY, ADD PRIMARY KEY (id, date)")
+            cursor.execute("ALTER TABLE `event_attendees_archive` ADD COLUMN `event_date` DATE NOT NULL DEFAULT '1970-01-01' AFTER `event_id`")
+            cursor.execute('''
+                UPDATE event_attendees_archive a
+                INNER JOIN events_archive e ON e.id = a.event_id
+                SET a.event_date = e.date
+            ''')
+            cursor.execute('''
+                ALTER TABLE `event_attendees_archive`
+                    DROP PRIMARY KEY, ADD PRIMARY KEY (id, event_date),
+                    DROP INDEX uq_attendees_archive_event_user,
+                    ADD UNIQUE KEY uq_attendees_archive_event_user (event_id, user_id, event_date)
+            ''')
+            for table, clause in partition_by.items():
+                cursor.execute(f"ALTER TABLE `{table}` {clause}")
+            logger.info("Archive tables partitioned by date.")
+
+        # Latest date an archived event has an occurrence on; reads whose date
+        # range starts after it never need the archive tables
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS event_archive_state (
+                id TINYINT PRIMARY KEY,
+                archived_through DATE NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+        ''')
+
+        # Create refresh_tokens table (SHA-256 digests only, rotated on every use)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS refresh_tokens (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                user_id INT NOT NULL,
+                token_hash CHAR(64) NOT NULL,
+                family_id CHAR(32) NOT NULL,
+                expires_at DATETIME NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                revoked_at DATETIME NULL,
+                replaced_by BIGINT NULL,
+                UNIQUE KEY uq_refresh_token_hash (token_hash),
+                KEY idx_refresh_family (family_id),
+                KEY idx_refresh_expires (expires_at),
+                CONSTRAINT fk_refresh_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            ENGINE=InnoDB
+            DEFAULT CHARSET=utf8
+        ''')
+
         conn.commit()
         logger.info("Database initialized successfully")
         
@@ -133,3 +355,151 @@ def close_db(conn) -> None:
             conn.close()
         except Exception as e:
             logger.warning(f"Error closing database connection: {str(e)}")
+
+
+class PooledConnection:
+    """A pooled connection and the prepared statements created on it"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.last_used = time.monotonic()
+        self._statements: Dict[str, object] = {}
+
+    def prepared(self, sql: str):
+        """Cursor for `sql`, prepared on the server once per connection and then reused"""
+        cursor = self._statements.get(sql)
+        if cursor is None:
+            cursor = self.conn.cursor(prepared=True)
+            self._statements[sql] = cursor
+        return cursor
+
+    def reset_statements(self) -> None:
+        for cursor in self._statements.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._statements.clear()
+
+    def close(self) -> None:
+        self.reset_statements()
+        close_db(self.conn)
+
+
+class ConnectionPool:
+    """Fixed-size pool of autocommit connections for short, hot read paths.
+
+    Connections already have the schema selected and keep their prepared
+    statements between checkouts, saving the connect, USE and PREPARE round
+    trips that get_db_connection() pays on every call. Sessions are not reset
+    on return, so only run statements that leave no session state behind.
+    """
+
+    def __init__(self, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT_SECONDS,
+                 ping_after: float = DB_POOL_PING_AFTER_SECONDS):
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._idle: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._discarded = 0
+
+    def _connect(self) -> PooledConnection:
+        try:
+            conn = mysql.connector.connect(
+                host=DB_CONFIG["host"],
+                port=DB_CONFIG["port"],
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                database=DB_CONFIG["database"],
+                autocommit=True
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Pooled connection error: {err.errno} - {err.msg}")
+            raise DatabaseConnectionException(f"Failed to connect to database: {err.msg}")
+        return PooledConnection(conn)
+
+    def _checkout(self) -> PooledConnection:
+        try:
+            pooled = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            with self._lock:
+                self._waits += 1
+            try:
+                pooled = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise DatabaseConnectionException("Timed out waiting for a pooled database connection")
+
+        if time.monotonic() - pooled.last_used > self.ping_after:
+            # The server may have dropped an idle connection (wait_timeout); a reconnect loses prepared statements
+            try:
+                pooled.conn.ping(reconnect=True, attempts=1)
+            except mysql.connector.Error:
+                self._discard(pooled)
+                return self._checkout()
+            pooled.reset_statements()
+        return pooled
+
+    def _discard(self, pooled: PooledConnection) -> None:
+        pooled.close()
+        with self._lock:
+            self._created -= 1
+            self._discarded += 1
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Borrow a connection; it is dropped instead of returned if the block raises a MySQL error"""
+        pooled = self._checkout()
+        with self._lock:
+            self._checkouts += 1
+        try:
+            yield pooled
+        except mysql.connector.Error:
+            self._discard(pooled)
+            raise
+        except BaseException:
+            self._idle.put(pooled)
+            raise
+        else:
+            pooled.last_used = time.monotonic()
+            self._idle.put(pooled)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "discarded": self._discarded,
+            }
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+                metrics.register("db_pool", _pool.stats)
+    return _pool
@@ -5,14 +5,24 @@ from .schemas import (
     UserResponse,
     UserInfo,
     LoginResponse,
+    TokenRefreshRequest,
+    TokenResponse,
+    LogoutRequest,
     ErrorResponse,
+    UserImportRowResult,
+    UserImportResponse,
     HealthResponse,
     EventCreateRequest,
     EventResponse,
+    RsvpCounts,
     Attendee,
     InviteRequest,
+    BulkInviteRequest,
+    BulkInviteResult,
+    BulkInviteResponse,
     AttendanceStatusUpdate,
-    InvitationInfo
+    InvitationInfo,
+    FeedItem
 )
 
 __all__ = [
@@ -21,12 +31,22 @@ __all__ = [
     'UserResponse',
     'UserInfo',
     'LoginResponse',
+    'TokenRefreshRequest',
+    'TokenResponse',
+    'LogoutRequest',
     'ErrorResponse',
+    'UserImportRowResult',
+    'UserImportResponse',
     'HealthResponse',
     'EventCreateRequest',
     'EventResponse',
+    'RsvpCounts',
     'Attendee',
     'InviteRequest',
+    'BulkInviteRequest',
+    'BulkInviteResult',
+    'BulkInviteResponse',
     'AttendanceStatusUpdate',
-    'InvitationInfo'
+    'InvitationInfo',
+    'FeedItem'
 ]
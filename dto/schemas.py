@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, List, Literal
-from datetime import date as Date, time as Time
+from datetime import date as Date, time as Time, datetime as DateTime
+from config import BULK_EVENT_MAX_ITEMS
 
 class SignUpRequest(BaseModel):
     name: str = Field(..., description="User's full name", example="John Doe")
@@ -34,27 +35,67 @@ class LoginResponse(BaseModel):
     name: str = Field(..., description="User's full name")
     email: str = Field(..., description="User email")
     token: str = Field(..., description="JWT access token")
+    refresh_token: Optional[str] = Field(None, description="Single-use token for POST /token/refresh")
     message: str = Field(..., description="Response message")
 
+class TokenRefreshRequest(BaseModel):
+    refresh_token: str = Field(..., description="Refresh token from login or the previous refresh")
+
+class TokenResponse(BaseModel):
+    user_id: int = Field(..., description="User ID")
+    token: str = Field(..., description="New JWT access token")
+    refresh_token: str = Field(..., description="Replacement refresh token; the one sent is no longer valid")
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = Field(None, description="Refresh token to revoke along with the access token")
+
 class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
 
+class UserImportRowResult(BaseModel):
+    row: int = Field(..., description="1-based position of the record in the import file")
+    email: Optional[str] = Field(None, description="Email as given (normalized when valid)")
+    status: Literal['created', 'conflict', 'invalid', 'error'] = Field(..., description="Outcome for this row")
+    user_id: Optional[int] = Field(None, description="ID of the created user")
+    message: Optional[str] = Field(None, description="Why the row was not imported")
+
+class UserImportResponse(BaseModel):
+    total: int = Field(..., description="Records in the import file")
+    created: int = Field(..., description="Users created")
+    conflict: int = Field(..., description="Rows skipped because the email is already taken")
+    invalid: int = Field(..., description="Rows that failed validation")
+    error: int = Field(..., description="Rows whose batch failed to insert")
+    results: List[UserImportRowResult] = Field(default_factory=list, description="Per-row outcomes")
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
 
 # Event schemas
+class RecurrenceRule(BaseModel):
+    freq: Literal['weekly', 'monthly'] = Field(..., description="Repeat weekly or monthly", example="weekly")
+    interval: int = Field(1, ge=1, le=52, description="Repeat every N weeks/months", example=1)
+    until: Optional[Date] = Field(None, description="Last possible occurrence date", example="2026-06-30")
+    count: Optional[int] = Field(None, ge=1, description="Number of occurrences", example=10)
+
 class EventCreateRequest(BaseModel):
     title: str = Field(..., description="Event title", example="Meetup")
     date: Date = Field(..., description="Event date", example="2025-12-05")
     time: Time = Field(..., description="Event time", example="18:00")
     location: str = Field(..., description="Event location", example="Cairo")
     description: Optional[str] = Field(None, description="Event description", example="Monthly meetup")
+    recurrence: Optional[RecurrenceRule] = Field(None, description="Make the event a recurring series starting on `date`")
 
 class Attendee(BaseModel):
     user_id: int = Field(..., description="User ID")
     role: Literal['organizer', 'attendee'] = Field(..., description="Attendee role")
     attendance_status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(default='pending', description="Attendance status")
 
+class RsvpCounts(BaseModel):
+    pending: int = Field(0, description="Attendees who have not responded")
+    going: int = Field(0, description="Attendees going")
+    maybe: int = Field(0, description="Attendees who might go")
+    not_going: int = Field(0, description="Attendees not going")
+
 class EventResponse(BaseModel):
     id: int = Field(..., description="Event ID")
     title: str = Field(..., description="Event title")
@@ -64,13 +105,100 @@ class EventResponse(BaseModel):
     description: Optional[str] = Field(None, description="Event description")
     organizer_user_id: int = Field(..., description="Organizer user ID")
     attendees: List[Attendee] = Field(default_factory=list, description="List of attendees")
+    rsvp_counts: RsvpCounts = Field(default_factory=RsvpCounts, description="Attendance counts by status")
+    recurrence: Optional[RecurrenceRule] = Field(None, description="Recurrence rule of the series this event belongs to")
+    occurrence_date: Optional[Date] = Field(None, description="Set when this entry is one occurrence of a recurring series")
+
+class OccurrenceAttendanceResponse(BaseModel):
+    event_id: int = Field(..., description="Series event ID")
+    user_id: int = Field(..., description="Attendee's user ID")
+    occurrence_date: Date = Field(..., description="Occurrence date")
+    status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(..., description="Attendance status for this occurrence")
+
+class EventDeletionStatus(BaseModel):
+    event_id: int = Field(..., description="Deleted event ID")
+    status: Literal['pending', 'running', 'done', 'failed'] = Field(..., description="State of the background purge")
+    total_rows: int = Field(..., description="Attendee and occurrence rows to remove")
+    purged_rows: int = Field(..., description="Rows removed so far")
+    progress: float = Field(..., description="Fraction of the rows removed, from 0 to 1")
+    error: Optional[str] = Field(None, description="Why the last purge attempt failed")
+    deleted_at: Optional[DateTime] = Field(None, description="When the event was deleted")
+    finished_at: Optional[DateTime] = Field(None, description="When the purge finished or failed")
+
+class BulkEventIdsRequest(BaseModel):
+    event_ids: List[int] = Field(..., min_length=1, max_length=BULK_EVENT_MAX_ITEMS, description="IDs of the organizer's events", example=[12, 15, 19])
+
+class BulkEventResult(BaseModel):
+    event_id: int = Field(..., description="Requested event ID")
+    status: Literal['deleted', 'archived', 'scheduled', 'not_found', 'forbidden', 'not_past'] = Field(..., description="Outcome for this event; 'not_past' events still have an occurrence today or later and are not archived")
+
+class BulkEventResponse(BaseModel):
+    action: Literal['delete', 'archive'] = Field(..., description="Action applied")
+    processed_count: int = Field(..., description="Number of events deleted, archived or scheduled")
+    scheduled: bool = Field(False, description="True when the events are being archived by a background job")
+    results: List[BulkEventResult] = Field(default_factory=list, description="One outcome per distinct event")
 
 class InviteRequest(BaseModel):
     userId: int = Field(..., description="User ID to invite", example=2)
 
+class BulkInviteRequest(BaseModel):
+    user_ids: List[int] = Field(default_factory=list, max_length=BULK_EVENT_MAX_ITEMS, description="User IDs to invite", example=[2, 3, 4])
+    emails: List[str] = Field(default_factory=list, max_length=BULK_EVENT_MAX_ITEMS, description="Emails of users to invite", example=["jane@example.com"])
+
+    @validator('emails', always=True)
+    def validate_total(cls, v, values):
+        if not v and not values.get('user_ids'):
+            raise ValueError('Provide user_ids and/or emails')
+        if len(v) + len(values.get('user_ids') or []) > BULK_EVENT_MAX_ITEMS:
+            raise ValueError(f'At most {BULK_EVENT_MAX_ITEMS} users can be invited at once')
+        return v
+
+class BulkInviteResult(BaseModel):
+    user_id: Optional[int] = Field(None, description="Requested or resolved user ID")
+    email: Optional[str] = Field(None, description="Requested email, when the user was given by email")
+    status: Literal['invited', 'already_invited', 'unknown_user', 'self', 'invalid_email', 'unknown_email'] = Field(..., description="Outcome for this user")
+
+class BulkInviteResponse(BaseModel):
+    event_id: int = Field(..., description="Event ID")
+    invited_count: int = Field(..., description="Number of users newly invited")
+    unresolved_emails: List[str] = Field(default_factory=list, description="Emails that are malformed or not registered")
+    results: List[BulkInviteResult] = Field(default_factory=list, description="One outcome per distinct user")
+
 class AttendanceStatusUpdate(BaseModel):
     status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(..., description="Attendance status", example="going")
 
+class BulkAttendanceItem(BaseModel):
+    user_id: int = Field(..., description="Attendee's user ID", example=2)
+    status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(..., description="New attendance status", example="going")
+
+class BulkAttendanceUpdateRequest(BaseModel):
+    updates: List[BulkAttendanceItem] = Field(..., min_length=1, max_length=BULK_EVENT_MAX_ITEMS, description="Status changes to apply")
+
+class BulkAttendanceResult(BaseModel):
+    user_id: int = Field(..., description="Attendee's user ID")
+    status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(..., description="Requested attendance status")
+    result: Literal['updated', 'unchanged', 'not_attendee'] = Field(..., description="Outcome for this user")
+
+class BulkAttendanceResponse(BaseModel):
+    event_id: int = Field(..., description="Event ID")
+    updated_count: int = Field(..., description="Number of statuses changed")
+    results: List[BulkAttendanceResult] = Field(default_factory=list, description="One outcome per distinct user")
+
+class EventImportRowResult(BaseModel):
+    row: int = Field(..., description="1-based position of the record in the import file")
+    title: Optional[str] = Field(None, description="Event title as given")
+    status: Literal['created', 'invalid', 'error'] = Field(..., description="Outcome for this row")
+    event_id: Optional[int] = Field(None, description="ID of the created event")
+    message: Optional[str] = Field(None, description="Why the row was not imported")
+
+class EventImportResponse(BaseModel):
+    total: int = Field(..., description="Records read from the import file")
+    created: int = Field(..., description="Events created")
+    invalid: int = Field(..., description="Rows that failed validation")
+    error: int = Field(..., description="Rows whose batch failed to insert")
+    truncated: bool = Field(False, description="True when the file had more records than one import accepts")
+    results: List[EventImportRowResult] = Field(default_factory=list, description="Per-row outcomes")
+
 class InvitationInfo(BaseModel):
     event_id: int = Field(..., description="Event ID")
     event_title: str = Field(..., description="Event title")
@@ -80,3 +208,9 @@ class InvitationInfo(BaseModel):
     invited_user_email: str = Field(..., description="Invited user's email")
     attendance_status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(..., description="Invitation status")
 
+class FeedItem(BaseModel):
+    event_id: int = Field(..., description="Event ID")
+    title: str = Field(..., description="Event title")
+    date: Date = Field(..., description="Event date")
+    role: Literal['organizer', 'attendee'] = Field(..., description="User's role in the event")
+    attendance_status: Literal['pending', 'going', 'maybe', 'not_going'] = Field(default='pending', description="User's attendance status")
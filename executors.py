@@ -0,0 +1,180 @@
+"""Named, separately sized worker pools
+
+Each workload class gets its own bounded pool so a burst in one cannot
+starve the others:
+
+- "auth": CPU-bound password hashing/verification (bcrypt releases the GIL)
+- "db": blocking database I/O issued from async handlers
+- "background": fire-and-forget maintenance work (rehash updates, purges, flushes)
+- "import": long, user-triggered bulk imports, kept apart so they cannot
+  crowd out the background work
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import metrics
+from config import (
+    AUTH_POOL_KIND,
+    AUTH_POOL_WORKERS,
+    AUTH_POOL_MAX_QUEUE,
+    DB_EXECUTOR_WORKERS,
+    DB_EXECUTOR_MAX_QUEUE,
+    BACKGROUND_EXECUTOR_WORKERS,
+    BACKGROUND_EXECUTOR_MAX_QUEUE,
+    IMPORT_EXECUTOR_WORKERS,
+    IMPORT_EXECUTOR_MAX_QUEUE
+)
+from handlers.exceptions import ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_CONFIG = {
+    "auth": {"kind": AUTH_POOL_KIND, "max_workers": AUTH_POOL_WORKERS, "max_queue": AUTH_POOL_MAX_QUEUE},
+    "db": {"kind": "thread", "max_workers": DB_EXECUTOR_WORKERS, "max_queue": DB_EXECUTOR_MAX_QUEUE},
+    "background": {"kind": "thread", "max_workers": BACKGROUND_EXECUTOR_WORKERS, "max_queue": BACKGROUND_EXECUTOR_MAX_QUEUE},
+    "import": {"kind": "thread", "max_workers": IMPORT_EXECUTOR_WORKERS, "max_queue": IMPORT_EXECUTOR_MAX_QUEUE},
+}
+
+
+def _call_with_start_time(fn: Callable[..., Any], args: tuple, kwargs: dict):
+    # Module level so it can be pickled for process pools
+    return time.time(), fn(*args, **kwargs)
+
+
+class BoundedExecutor:
+    """Thread or process pool that rejects work once `max_queue` jobs are waiting.
+
+    Rejection raises ServiceUnavailableException (503) instead of letting the
+    backlog, and every client's latency, grow without bound.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: int = 1, max_queue: int = 0):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"Executor '{self.name}' saturated, rejecting work")
+            raise ServiceUnavailableException()
+
+        submitted_at = time.time()
+        try:
+            inner = self._executor.submit(_call_with_start_time, fn, args, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_flight += 1
+            self._submitted += 1
+
+        outer: Future = Future()
+        inner.add_done_callback(lambda f: self._finish(f, outer, submitted_at))
+        return outer
+
+    def _finish(self, inner: Future, outer: Future, submitted_at: float) -> None:
+        self._slots.release()
+        error = None if inner.cancelled() else inner.exception()
+        with self._lock:
+            self._in_flight -= 1
+            if inner.cancelled() or error is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+                started_at, _ = inner.result()
+                wait = max(0.0, started_at - submitted_at)
+                self._queue_wait_total += wait
+                self._queue_wait_max = max(self._queue_wait_max, wait)
+        if inner.cancelled():
+            outer.cancel()
+        elif error is not None:
+            outer.set_exception(error)
+        else:
+            outer.set_result(inner.result()[1])
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn` in the pool and await its result without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": min(in_flight, self.max_workers),
+                "queued": max(0, in_flight - self.max_workers),
+                "saturation": round(in_flight / (self.max_workers + self.max_queue), 3),
+                "submitted": self._submitted,
+                "completed": completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "queue_wait_avg_ms": round(self._queue_wait_total / completed * 1000, 3) if completed else 0.0,
+                "queue_wait_max_ms": round(self._queue_wait_max * 1000, 3),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Return the named pool ("auth", "db", "background" or "import"), creating it on first use"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                if name not in EXECUTOR_CONFIG:
+                    raise ValueError(f"Unknown executor: {name}")
+                executor = BoundedExecutor(name, **EXECUTOR_CONFIG[name])
+                _executors[name] = executor
+                metrics.register(f"executor.{name}", executor.stats)
+    return executor
+
+
+def get_auth_executor() -> BoundedExecutor:
+    """Pool used for bcrypt hashing and verification"""
+    return get_executor("auth")
+
+
+async def run_in(name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Await `fn(*args, **kwargs)` on the named pool"""
+    return await get_executor(name).run(fn, *args, **kwargs)
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Stop every pool created by this module (called on application shutdown)"""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
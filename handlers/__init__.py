@@ -8,7 +8,9 @@ from handlers.exceptions import (
     NotFoundException,
     PermissionException,
     ConflictException,
-    AuthenticationException
+    AuthenticationException,
+    RateLimitException,
+    ServiceUnavailableException
 )
 
 from handlers.middleware import (
@@ -29,6 +31,8 @@ __all__ = [
     "PermissionException",
     "ConflictException",
     "AuthenticationException",
+    "RateLimitException",
+    "ServiceUnavailableException",
     # Handlers
     "exception_handler",
     "eventplanner_exception_handler",
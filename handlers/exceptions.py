@@ -11,8 +11,8 @@ class EventPlannerException(Exception):
 
 class DatabaseException(EventPlannerException):
     """Raised when database operations fail"""
-    def __init__(self, message: str = "Database operation failed"):
-        super().__init__(message, status_code=500)
+    def __init__(self, message: str = "Database operation failed", status_code: int = 500):
+        super().__init__(message, status_code=status_code)
 
 
 class DatabaseConnectionException(DatabaseException):
@@ -54,3 +54,16 @@ class AuthenticationException(EventPlannerException):
     def __init__(self, message: str = "Authentication failed"):
         super().__init__(message, status_code=401)
 
+
+class RateLimitException(EventPlannerException):
+    """Raised when a client exceeds its request budget"""
+    def __init__(self, message: str = "Too many requests, please retry later", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, status_code=429)
+
+
+class ServiceUnavailableException(EventPlannerException):
+    """Raised when a worker pool is saturated and the request should be retried later"""
+    def __init__(self, message: str = "Service is busy, please retry shortly"):
+        super().__init__(message, status_code=503)
+
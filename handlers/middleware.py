@@ -5,7 +5,7 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from handlers.exceptions import EventPlannerException
+from handlers.exceptions import EventPlannerException, RateLimitException
 from mysql.connector import Error as MySQLError
 
 # Configure logging
@@ -34,12 +34,17 @@ async def eventplanner_exception_handler(request: Request, exc: EventPlannerExce
     """Handler for custom EventPlanner exceptions"""
     logger.warning(f"EventPlanner exception: {type(exc).__name__}: {exc.message}")
     
+    headers = None
+    if isinstance(exc, RateLimitException):
+        headers = {"Retry-After": str(exc.retry_after)}
+
     return JSONResponse(
         status_code=exc.status_code,
         content={
             "error": type(exc).__name__,
             "message": exc.message
-        }
+        },
+        headers=headers
     )
 
 
@@ -1,12 +1,22 @@
 """FastAPI application entry point"""
+import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from mysql.connector import Error as MySQLError
 from database import init_db
+from config import BCRYPT_AUTOTUNE, BCRYPT_ROUNDS, BCRYPT_TARGET_VERIFY_MS
+from utils import calibrate_bcrypt_rounds, configure_bcrypt_rounds
+from executors import shutdown_executors
+from services.user_import_service import shutdown_hash_pool
+from security import set_revocation_check
+from token_revocation import is_token_revoked
+from bloom import get_registered_email_filter
+from models.user_repository import UserRepository
 from routes import auth, health
 from routes import events
+from routes import admin
 from handlers.exceptions import EventPlannerException
 from handlers.middleware import (
     exception_handler,
@@ -16,9 +26,6 @@ from handlers.middleware import (
     mysql_exception_handler
 )
 
-# Initialize database
-init_db()
-
 # Create FastAPI app
 app = FastAPI(
     title="EventPlanner Phase 0 API",
@@ -48,6 +55,37 @@ app.add_middleware(
 app.include_router(auth.router)
 app.include_router(health.router)
 app.include_router(events.router)
+app.include_router(admin.router)
+
+# Startup work lives in this hook, not at import time: the spawned password
+# hashing processes of user imports import this module again
+@app.on_event("startup")
+def startup():
+    init_db()
+
+    # Calibrate the password hashing cost for this host (an explicit BCRYPT_ROUNDS wins)
+    if BCRYPT_AUTOTUNE and not BCRYPT_ROUNDS:
+        rounds, timings = calibrate_bcrypt_rounds(BCRYPT_TARGET_VERIFY_MS)
+        configure_bcrypt_rounds(rounds)
+        logging.getLogger(__name__).info(
+            f"bcrypt cost set to {rounds} rounds ({timings[rounds]:.0f} ms per verification)"
+        )
+
+    # Load registered emails so most new-address signups skip the existence query
+    email_filter = get_registered_email_filter()
+    if email_filter is not None:
+        loaded = email_filter.rebuild(UserRepository.iter_emails())
+        logging.getLogger(__name__).info(f"Registered email filter built with {loaded} emails")
+
+    # Reject logged-out tokens before their expiry
+    set_revocation_check(is_token_revoked)
+
+@app.on_event("shutdown")
+def shutdown():
+    # Queued attendance updates are written before the db pool goes away
+    events.event_service.close()
+    shutdown_hash_pool()
+    shutdown_executors()
 
 if __name__ == "__main__":
     import uvicorn
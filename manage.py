@@ -0,0 +1,206 @@
+"""Maintenance commands
+
+Usage:
+    python manage.py rebuild-feed [--user-id ID]
+    python manage.py reconcile-rsvp-counts [--event-id ID] [--fix]
+    python manage.py calibrate-bcrypt [--target-ms MS]
+    python manage.py purge-refresh-tokens
+    python manage.py import-users FILE [--format csv|json]
+    python manage.py import-events FILE --organizer-id ID [--format csv|ics]
+    python manage.py purge-deleted-events
+    python manage.py archive-events [--before YYYY-MM-DD] [--batch-size N]
+    python manage.py add-event-partitions [--ahead-months N]
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+
+from database import init_db
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_feed(args: argparse.Namespace) -> int:
+    """Backfill or repair user_event_feed from events and event_attendees"""
+    from models.feed_repository import MysqlUserEventFeedRepository
+
+    result = MysqlUserEventFeedRepository().rebuild(user_id=args.user_id)
+    print(f"Feed rebuilt: {result['removed']} stale rows removed, {result['affected']} rows affected by upsert")
+    return 0
+
+
+def reconcile_rsvp_counts(args: argparse.Namespace) -> int:
+    """Recompute RSVP counters from event_attendees and report (or repair) drift"""
+    from models.rsvp_count_repository import MysqlRsvpCountRepository, STATUS_COLUMNS
+
+    drifted = MysqlRsvpCountRepository().reconcile(fix=args.fix, event_id=args.event_id)
+    for row in drifted:
+        changes = ", ".join(
+            f"{status}: {row[f'stored_{status}']} -> {row[f'actual_{status}']}"
+            for status in STATUS_COLUMNS
+            if row[f"stored_{status}"] != row[f"actual_{status}"]
+        )
+        print(f"event {row['event_id']}: {changes}")
+    action = "repaired" if args.fix else "found"
+    print(f"{len(drifted)} events with drifted RSVP counts {action}")
+    return 1 if drifted and not args.fix else 0
+
+
+def calibrate_bcrypt(args: argparse.Namespace) -> int:
+    """Measure bcrypt on this host and recommend a BCRYPT_ROUNDS value"""
+    from utils import calibrate_bcrypt_rounds
+
+    rounds, timings = calibrate_bcrypt_rounds(args.target_ms, min_rounds=args.min_rounds, max_rounds=args.max_rounds)
+    for cost, elapsed in timings.items():
+        print(f"rounds={cost:<3} verify={elapsed:8.1f} ms")
+    print(f"Recommended: BCRYPT_ROUNDS={rounds} (target {args.target_ms:.0f} ms)")
+    return 0
+
+
+def purge_refresh_tokens(args: argparse.Namespace) -> int:
+    """Delete expired refresh tokens"""
+    from models.refresh_token_repository import MysqlRefreshTokenRepository
+
+    removed = MysqlRefreshTokenRepository().purge_expired()
+    print(f"{removed} expired refresh tokens removed")
+    return 0
+
+
+def import_users(args: argparse.Namespace) -> int:
+    """Bulk-create users from a CSV or JSON file"""
+    from services.user_import_service import UserImportService, parse_user_import
+
+    fmt = args.format or args.file.rsplit(".", 1)[-1].lower()
+    with open(args.file, "rb") as f:
+        rows = parse_user_import(f.read(), fmt)
+    result = UserImportService(batch_size=args.batch_size).import_users(rows)
+    for row in result["results"]:
+        if row["status"] != "created":
+            print(f"row {row['row']} ({row['email']}): {row['status']} - {row['message']}")
+    print(
+        f"{result['total']} rows: {result['created']} created, {result['conflict']} conflicts, "
+        f"{result['invalid']} invalid, {result['error']} failed"
+    )
+    return 1 if result["error"] else 0
+
+
+def import_events(args: argparse.Namespace) -> int:
+    """Bulk-create events from a CSV or iCalendar file"""
+    from services.event_import_service import EventImportService, iter_event_rows
+
+    fmt = args.format or args.file.rsplit(".", 1)[-1].lower()
+    with open(args.file, encoding="utf-8-sig", newline="") as f:
+        result = EventImportService(batch_size=args.batch_size).import_events(args.organizer_id, iter_event_rows(f, fmt))
+    for row in result["results"]:
+        if row["status"] != "created":
+            print(f"row {row['row']} ({row['title']}): {row['status']} - {row['message']}")
+    print(f"{result['total']} rows: {result['created']} created, {result['invalid']} invalid, {result['error']} failed")
+    if result["truncated"]:
+        print("Import stopped early: the file has more rows than EVENT_IMPORT_MAX_ROWS")
+    return 1 if result["error"] or result["truncated"] else 0
+
+
+def purge_deleted_events(args: argparse.Namespace) -> int:
+    """Finish the purges of deleted events that were left pending, interrupted or failed"""
+    from services.event_purge_service import EventPurgeService
+
+    results = EventPurgeService(chunk_size=args.chunk_size).resume_unfinished()
+    failed = [r for r in results if r["status"] == "failed"]
+    for result in failed:
+        print(f"event {result['event_id']}: {result['error']}")
+    print(f"{len(results) - len(failed)} deleted events purged, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+def archive_events(args: argparse.Namespace) -> int:
+    """Move events that ended before the archive horizon to the archive tables"""
+    from services.event_archive_service import EventArchiveService
+
+    result = EventArchiveService().archive_past_events(before=args.before, batch_size=args.batch_size)
+    print(f"Events ending before {result['cutoff']}: {result['archived']} archived, {result['failed']} failed")
+    return 1 if result["failed"] else 0
+
+
+def add_event_partitions(args: argparse.Namespace) -> int:
+    """Create the archive tables' date partitions ahead of time"""
+    from models.partition_repository import MysqlPartitionRepository
+    from partitions import PARTITIONED_TABLES
+    from config import EVENT_PARTITION_MONTHS
+
+    repo = MysqlPartitionRepository()
+    for table in PARTITIONED_TABLES:
+        added = repo.add_partitions_ahead(table, date.today(), EVENT_PARTITION_MONTHS, args.ahead_months)
+        print(f"{table}: {', '.join(added) if added else 'no partitions needed'}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="EventPlanner maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    feed = subparsers.add_parser("rebuild-feed", help="Rebuild the per-user event feed")
+    feed.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's feed")
+    feed.set_defaults(func=rebuild_feed)
+
+    rsvp = subparsers.add_parser("reconcile-rsvp-counts", help="Check RSVP counters against attendee rows")
+    rsvp.add_argument("--event-id", type=int, default=None, help="Only check this event")
+    rsvp.add_argument("--fix", action="store_true", help="Overwrite drifted counters with recomputed values")
+    rsvp.set_defaults(func=reconcile_rsvp_counts)
+
+    from config import BCRYPT_TARGET_VERIFY_MS, BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS
+    bcrypt = subparsers.add_parser("calibrate-bcrypt", help="Pick the bcrypt cost for a target verify latency")
+    bcrypt.add_argument("--target-ms", type=float, default=BCRYPT_TARGET_VERIFY_MS, help="Target verification time")
+    bcrypt.add_argument("--min-rounds", type=int, default=BCRYPT_MIN_ROUNDS)
+    bcrypt.add_argument("--max-rounds", type=int, default=BCRYPT_MAX_ROUNDS)
+    bcrypt.set_defaults(func=calibrate_bcrypt, needs_db=False)
+
+    refresh = subparsers.add_parser("purge-refresh-tokens", help="Delete expired refresh tokens")
+    refresh.set_defaults(func=purge_refresh_tokens)
+
+    from config import USER_IMPORT_BATCH_SIZE
+    users = subparsers.add_parser("import-users", help="Bulk-create users from CSV (name,email,password) or JSON")
+    users.add_argument("file", help="Path to the .csv or .json file")
+    users.add_argument("--format", choices=["csv", "json"], default=None, help="Defaults to the file extension")
+    users.add_argument("--batch-size", type=int, default=USER_IMPORT_BATCH_SIZE, help="Rows per INSERT transaction")
+    users.set_defaults(func=import_users)
+
+    from config import EVENT_IMPORT_BATCH_SIZE
+    events = subparsers.add_parser("import-events", help="Bulk-create events from CSV (title,date,time,location) or .ics")
+    events.add_argument("file", help="Path to the .csv or .ics file")
+    events.add_argument("--organizer-id", type=int, required=True, help="User who will organize the imported events")
+    events.add_argument("--format", choices=["csv", "ics"], default=None, help="Defaults to the file extension")
+    events.add_argument("--batch-size", type=int, default=EVENT_IMPORT_BATCH_SIZE, help="Events per INSERT transaction")
+    events.set_defaults(func=import_events)
+
+    from config import EVENT_PURGE_CHUNK_SIZE
+    purge = subparsers.add_parser("purge-deleted-events", help="Finish unfinished purges of deleted events")
+    purge.add_argument("--chunk-size", type=int, default=EVENT_PURGE_CHUNK_SIZE, help="Rows deleted per transaction")
+    purge.set_defaults(func=purge_deleted_events)
+
+    from config import EVENT_ARCHIVE_AFTER_DAYS, EVENT_ARCHIVE_BATCH_SIZE
+    archive = subparsers.add_parser("archive-events", help="Move past events to the archive tables")
+    archive.add_argument("--before", type=date.fromisoformat, default=None,
+                         help=f"Archive events ending before this date (default: {EVENT_ARCHIVE_AFTER_DAYS} days ago)")
+    archive.add_argument("--batch-size", type=int, default=EVENT_ARCHIVE_BATCH_SIZE, help="Events per transaction")
+    archive.set_defaults(func=archive_events)
+
+    from config import EVENT_PARTITION_AHEAD_MONTHS
+    partitions = subparsers.add_parser("add-event-partitions", help="Add date partitions to the archive tables ahead of time")
+    partitions.add_argument("--ahead-months", type=int, default=EVENT_PARTITION_AHEAD_MONTHS,
+                            help="Months past the current period the partitions must cover")
+    partitions.set_defaults(func=add_event_partitions)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = build_parser().parse_args(argv)
+    if getattr(args, "needs_db", True):
+        init_db()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""In-process metrics registry
+
+Components register a callable returning a dict of counters; the health
+router exposes a snapshot of all of them.
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_lock = threading.Lock()
+
+
+def register(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Register (or replace) a metrics provider under `name`"""
+    with _lock:
+        _providers[name] = provider
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Collect the current values of every registered provider"""
+    with _lock:
+        providers = dict(_providers)
+    result = {}
+    for name, provider in sorted(providers.items()):
+        try:
+            result[name] = provider()
+        except Exception as e:
+            logger.warning(f"Metrics provider {name} failed: {str(e)}")
+            result[name] = {"error": str(e)}
+    return result
@@ -0,0 +1,26 @@
+-- Create user_event_feed table (denormalized per-user event listing)
+CREATE TABLE IF NOT EXISTS user_event_feed (
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    role ENUM('organizer','attendee') NOT NULL,
+    attendance_status ENUM('pending', 'going', 'maybe', 'not_going') DEFAULT 'pending',
+    event_date DATE NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, event_id),
+    KEY idx_feed_user_date (user_id, event_date, event_id),
+    KEY idx_feed_event (event_id),
+    CONSTRAINT fk_feed_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+    CONSTRAINT fk_feed_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+-- Backfill from existing attendees
+INSERT INTO user_event_feed (user_id, event_id, role, attendance_status, event_date, title)
+SELECT ea.user_id, ea.event_id, ea.role, ea.attendance_status, e.date, e.title
+FROM event_attendees ea
+INNER JOIN events e ON e.id = ea.event_id
+ON DUPLICATE KEY UPDATE
+    role = VALUES(role),
+    attendance_status = VALUES(attendance_status),
+    event_date = VALUES(event_date),
+    title = VALUES(title);
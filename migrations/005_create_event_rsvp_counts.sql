@@ -0,0 +1,26 @@
+-- Create event_rsvp_counts table (denormalized attendance counters)
+CREATE TABLE IF NOT EXISTS event_rsvp_counts (
+    event_id INT PRIMARY KEY,
+    pending_count INT NOT NULL DEFAULT 0,
+    going_count INT NOT NULL DEFAULT 0,
+    maybe_count INT NOT NULL DEFAULT 0,
+    not_going_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT fk_rsvp_counts_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+-- Backfill from existing attendees
+INSERT INTO event_rsvp_counts (event_id, pending_count, going_count, maybe_count, not_going_count)
+SELECT
+    event_id,
+    SUM(attendance_status = 'pending'),
+    SUM(attendance_status = 'going'),
+    SUM(attendance_status = 'maybe'),
+    SUM(attendance_status = 'not_going')
+FROM event_attendees
+GROUP BY event_id
+ON DUPLICATE KEY UPDATE
+    pending_count = VALUES(pending_count),
+    going_count = VALUES(going_count),
+    maybe_count = VALUES(maybe_count),
+    not_going_count = VALUES(not_going_count);
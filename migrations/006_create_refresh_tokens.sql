@@ -0,0 +1,15 @@
+-- Create refresh_tokens table (SHA-256 digests only, rotated on every use)
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    token_hash CHAR(64) NOT NULL,
+    family_id CHAR(32) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    revoked_at DATETIME NULL,
+    replaced_by BIGINT NULL,
+    UNIQUE KEY uq_refresh_token_hash (token_hash),
+    KEY idx_refresh_family (family_id),
+    KEY idx_refresh_expires (expires_at),
+    CONSTRAINT fk_refresh_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
@@ -0,0 +1,3 @@
+-- Covering index for the login credential lookup
+-- (InnoDB secondary indexes also store the primary key, so id comes for free)
+ALTER TABLE users ADD INDEX idx_users_credentials (email, name, password);
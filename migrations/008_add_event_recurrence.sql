@@ -0,0 +1,18 @@
+-- Recurring events: the series row stores the rule, `date` is its first occurrence
+ALTER TABLE events
+    ADD COLUMN recurrence_freq ENUM('weekly', 'monthly') NULL AFTER description,
+    ADD COLUMN recurrence_interval SMALLINT NOT NULL DEFAULT 1 AFTER recurrence_freq,
+    ADD COLUMN recurrence_until DATE NULL AFTER recurrence_interval,
+    ADD COLUMN recurrence_count INT NULL AFTER recurrence_until;
+
+-- Sparse per-occurrence attendance: a row only where an occurrence differs from the series status
+CREATE TABLE IF NOT EXISTS event_occurrence_overrides (
+    event_id INT NOT NULL,
+    occurrence_date DATE NOT NULL,
+    user_id INT NOT NULL,
+    attendance_status ENUM('pending', 'going', 'maybe', 'not_going') NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (event_id, occurrence_date, user_id),
+    CONSTRAINT fk_overrides_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+    CONSTRAINT fk_overrides_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
@@ -0,0 +1,17 @@
+-- Soft delete: deleted events are hidden from every read immediately
+ALTER TABLE events ADD COLUMN deleted_at DATETIME NULL AFTER updated_at;
+
+-- Progress of the chunked background purge of a deleted event's attendees and feed rows.
+-- No foreign key: the row outlives the event so progress stays readable after the purge.
+CREATE TABLE IF NOT EXISTS event_purge_jobs (
+    event_id INT PRIMARY KEY,
+    organizer_user_id INT NOT NULL,
+    status ENUM('pending', 'running', 'done', 'failed') NOT NULL DEFAULT 'pending',
+    total_rows INT NOT NULL DEFAULT 0,
+    purged_rows INT NOT NULL DEFAULT 0,
+    error VARCHAR(255) NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    finished_at DATETIME NULL,
+    KEY idx_purge_status (status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
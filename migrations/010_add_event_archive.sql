@@ -0,0 +1,46 @@
+-- Archive tier: archived events (with their RSVP counts frozen) and their attendee and
+-- occurrence override rows. Same ids as the live tables and no foreign keys: rows are
+-- moved here in the transaction that deletes them from the live tables.
+CREATE TABLE IF NOT EXISTS events_archive (
+    id INT PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    date DATE NOT NULL,
+    time TIME NOT NULL,
+    location VARCHAR(255) NOT NULL,
+    description TEXT,
+    recurrence_freq ENUM('weekly', 'monthly') NULL,
+    recurrence_interval SMALLINT NOT NULL DEFAULT 1,
+    recurrence_until DATE NULL,
+    recurrence_count INT NULL,
+    organizer_user_id INT NOT NULL,
+    pending_count INT NOT NULL DEFAULT 0,
+    going_count INT NOT NULL DEFAULT 0,
+    maybe_count INT NOT NULL DEFAULT 0,
+    not_going_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,
+    archived_at DATETIME NOT NULL,
+    KEY idx_events_archive_organizer (organizer_user_id, date),
+    KEY idx_events_archive_date (date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+CREATE TABLE IF NOT EXISTS event_attendees_archive (
+    id INT PRIMARY KEY,
+    event_id INT NOT NULL,
+    user_id INT NOT NULL,
+    role ENUM('organizer','attendee') NOT NULL,
+    attendance_status ENUM('pending', 'going', 'maybe', 'not_going') DEFAULT 'pending',
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,
+    UNIQUE KEY uq_attendees_archive_event_user (event_id, user_id),
+    KEY idx_attendees_archive_user_role (user_id, role)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+CREATE TABLE IF NOT EXISTS event_occurrence_overrides_archive (
+    event_id INT NOT NULL,
+    occurrence_date DATE NOT NULL,
+    user_id INT NOT NULL,
+    attendance_status ENUM('pending', 'going', 'maybe', 'not_going') NOT NULL,
+    updated_at TIMESTAMP NULL,
+    PRIMARY KEY (event_id, occurrence_date, user_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
@@ -0,0 +1,12 @@
+-- Latest date an archived event has an occurrence on (single row, id = 1).
+-- Searches and lists whose date range ends before it skip the archive tables.
+CREATE TABLE IF NOT EXISTS event_archive_state (
+    id TINYINT PRIMARY KEY,
+    archived_through DATE NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+-- Events archived before this table existed
+INSERT INTO event_archive_state (id, archived_through)
+SELECT 1, '9999-12-31' FROM events_archive LIMIT 1
+ON DUPLICATE KEY UPDATE archived_through = VALUES(archived_through);
@@ -0,0 +1,33 @@
+-- Partition the archive tables by date (RANGE COLUMNS, one partition per quarter).
+-- Every primary/unique key of a partitioned table must contain the partitioning
+-- column, so the keys are widened and attendee rows get their event's date.
+-- The live events tables stay unpartitioned: partitioned InnoDB tables cannot
+-- have or be referenced by foreign keys, which the live tables rely on.
+ALTER TABLE events_archive DROP PRIMARY KEY, ADD PRIMARY KEY (id, date);
+
+ALTER TABLE event_attendees_archive
+    ADD COLUMN event_date DATE NOT NULL DEFAULT '1970-01-01' AFTER event_id;
+
+UPDATE event_attendees_archive a
+INNER JOIN events_archive e ON e.id = a.event_id
+SET a.event_date = e.date;
+
+ALTER TABLE event_attendees_archive
+    DROP PRIMARY KEY, ADD PRIMARY KEY (id, event_date),
+    DROP INDEX uq_attendees_archive_event_user,
+    ADD UNIQUE KEY uq_attendees_archive_event_user (event_id, user_id, event_date);
+
+-- Rows before EVENT_PARTITION_START share p_history; p_future catches the rest
+-- until `python manage.py add-event-partitions` splits the quarters off it
+ALTER TABLE events_archive PARTITION BY RANGE COLUMNS(date) (
+    PARTITION p_history VALUES LESS THAN ('2020-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+ALTER TABLE event_attendees_archive PARTITION BY RANGE COLUMNS(event_date) (
+    PARTITION p_history VALUES LESS THAN ('2020-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+ALTER TABLE event_occurrence_overrides_archive PARTITION BY RANGE COLUMNS(occurrence_date) (
+    PARTITION p_history VALUES LESS THAN ('2020-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
@@ -0,0 +1,252 @@
+import mysql.connector
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import date
+import logging
+from database import get_db_connection, close_db
+from config import DB_CONFIG
+from handlers.exceptions import DatabaseException
+from models.event_repository import build_search_query, convert_timedelta_to_time
+from models.rsvp_count_repository import STATUS_COLUMNS
+from recurrence import last_occurrence
+
+logger = logging.getLogger(__name__)
+
+# Columns copied as-is from events into events_archive
+ARCHIVED_EVENT_COLUMNS = (
+    "id", "title", "date", "time", "location", "description",
+    "recurrence_freq", "recurrence_interval", "recurrence_until", "recurrence_count",
+    "organizer_user_id", "created_at", "updated_at"
+)
+ARCHIVED_ATTENDEE_COLUMNS = ("id", "event_id", "user_id", "role", "attendance_status", "created_at", "updated_at")
+ARCHIVED_OVERRIDE_COLUMNS = ("event_id", "occurrence_date", "user_id", "attendance_status", "updated_at")
+
+
+class MysqlEventArchiveRepository:
+    """Moves events, with their attendee and override rows, to the archive tables.
+
+    Archived rows keep their ids. The RSVP counters are frozen into
+    events_archive, so archived events read like live ones without a join.
+    event_archive_state holds the latest date any archived event occurs on;
+    reads whose range starts after it do not touch the archive. The archive
+    tables are partitioned by date (see partitions.py); queries here bound
+    the date columns so MySQL reads only the partitions in range.
+    """
+
+    def get_archived_through(self) -> Optional[date]:
+        """Latest occurrence date in the archive, None while it is empty"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute("SELECT archived_through FROM event_archive_state WHERE id = 1")
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting archive state: {err}")
+            raise DatabaseException(f"Failed to retrieve archive state: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def find_archivable(self, cutoff: date, after_id: int, limit: int) -> Tuple[List[int], int]:
+        """Next ids, in id order after `after_id`, of live events whose last occurrence is before `cutoff`.
+
+        Returns the ids and the last id scanned, to continue from. Series
+        bounded only by a count are checked here against their computed end.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT id, date, recurrence_freq, recurrence_interval, recurrence_until, recurrence_count
+                FROM events
+                WHERE id > %s AND date < %s AND deleted_at IS NULL
+                  AND (recurrence_freq IS NULL OR recurrence_until < %s OR recurrence_count IS NOT NULL)
+                ORDER BY id
+                LIMIT %s
+                """,
+                (after_id, cutoff, cutoff, limit)
+            )
+            rows = cursor.fetchall() or []
+            ids = [row["id"] for row in rows if (last_occurrence(row) or date.max) < cutoff]
+            return ids, (rows[-1]["id"] if rows else after_id)
+        except mysql.connector.Error as err:
+            logger.error(f"Database error finding archivable events: {err}")
+            raise DatabaseException(f"Failed to find events to archive: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def archive_events(self, event_ids: List[int], conn) -> int:
+        """Copy live events and their rows to the archive and delete them, in the caller's transaction.
+
+        The caller should hold the event rows locked (get_event_owners with
+        for_update) so no attendee is added between the copy and the delete.
+        Returns the number of events archived.
+        """
+        if not event_ids:
+            return 0
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(event_ids))
+            ids = tuple(event_ids)
+
+            cursor.execute(
+                f"""
+                SELECT date, recurrence_freq, recurrence_interval, recurrence_until, recurrence_count
+                FROM events WHERE id IN ({placeholders}) AND deleted_at IS NULL
+                """,
+                ids
+            )
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall() or []]
+            if not rows:
+                return 0
+            # A series without an end reaches every future range
+            archived_through = max(last_occurrence(row) or date.max for row in rows)
+
+            counters = ", ".join(STATUS_COLUMNS.values())
+            cursor.execute(
+                f"""
+                INSERT INTO events_archive ({", ".join(ARCHIVED_EVENT_COLUMNS)}, {counters}, archived_at)
+                SELECT {", ".join(f"e.{column}" for column in ARCHIVED_EVENT_COLUMNS)},
+                       {", ".join(f"COALESCE(c.{column}, 0)" for column in STATUS_COLUMNS.values())},
+                       UTC_TIMESTAMP()
+                FROM events e
+                LEFT JOIN event_rsvp_counts c ON c.event_id = e.id
+                WHERE e.id IN ({placeholders}) AND e.deleted_at IS NULL
+                """,
+                ids
+            )
+            archived = cursor.rowcount
+
+            # Attendee rows take the event's date, their partitioning column in the archive
+            cursor.execute(
+                f"""
+                INSERT INTO event_attendees_archive ({", ".join(ARCHIVED_ATTENDEE_COLUMNS)}, event_date)
+                SELECT {", ".join(f"a.{column}" for column in ARCHIVED_ATTENDEE_COLUMNS)}, e.date
+                FROM event_attendees a
+                INNER JOIN events e ON e.id = a.event_id
+                WHERE a.event_id IN ({placeholders})
+                """,
+                ids
+            )
+            override_columns = ", ".join(ARCHIVED_OVERRIDE_COLUMNS)
+            cursor.execute(
+                f"""
+                INSERT INTO event_occurrence_overrides_archive ({override_columns})
+                SELECT {override_columns} FROM event_occurrence_overrides WHERE event_id IN ({placeholders})
+                """,
+                ids
+            )
+            # Attendee, override, feed and counter rows go with the events (ON DELETE CASCADE)
+            cursor.execute(
+                f"DELETE FROM events WHERE id IN ({placeholders}) AND deleted_at IS NULL",
+                ids
+            )
+            cursor.execute(
+                """
+                INSERT INTO event_archive_state (id, archived_through) VALUES (1, %s)
+                ON DUPLICATE KEY UPDATE archived_through = GREATEST(archived_through, VALUES(archived_through))
+                """,
+                (archived_through,)
+            )
+            logger.info(f"{archived} events archived")
+            return archived
+        except mysql.connector.Error as err:
+            logger.error(f"Database error archiving events: {err}")
+            raise DatabaseException(f"Failed to archive events: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def search_events(self, user_id: int, keyword: Optional[str] = None,
+                      start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      role: Optional[str] = None, location: Optional[str] = None,
+                      attendance_status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Same search as MysqlEventRepository.search_events, over the archive; events come with their attendees"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            query, params = build_search_query(
+                user_id, keyword, start_date, end_date, role, location, attendance_status, archive=True
+            )
+            cursor.execute(query, tuple(params))
+            events = list(cursor.fetchall() or [])
+            if not events:
+                return []
+
+            # Attendees of every matched event in one query, bounded by date to prune partitions
+            placeholders = ", ".join(["%s"] * len(events))
+            event_dates = [event["date"] for event in events]
+            cursor.execute(
+                f"""
+                SELECT event_id, user_id, role, attendance_status
+                FROM event_attendees_archive
+                WHERE event_id IN ({placeholders}) AND event_date BETWEEN %s AND %s
+                ORDER BY created_at ASC
+                """,
+                (*(event["id"] for event in events), min(event_dates), max(event_dates))
+            )
+            attendees: Dict[int, List[Dict[str, Any]]] = {}
+            for row in cursor.fetchall() or []:
+                attendees.setdefault(row["event_id"], []).append(
+                    {"user_id": row["user_id"], "role": row["role"], "attendance_status": row["attendance_status"] or "pending"}
+                )
+            for event in events:
+                event["time"] = convert_timedelta_to_time(event["time"])
+                event["attendees"] = attendees.get(event["id"], [])
+            return events
+        except mysql.connector.Error as err:
+            logger.error(f"Database error searching archived events: {err}")
+            raise DatabaseException(f"Failed to search archived events: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def get_occurrence_overrides(self, event_ids: List[int], start_date: Optional[date],
+                                 end_date: date) -> Dict[Tuple[int, date], Dict[int, str]]:
+        """Per-occurrence statuses of archived series, shaped like the live get_occurrence_overrides"""
+        if not event_ids:
+            return {}
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(event_ids))
+            query = (
+                "SELECT event_id, occurrence_date, user_id, attendance_status FROM event_occurrence_overrides_archive "
+                f"WHERE event_id IN ({placeholders}) AND occurrence_date <= %s"
+            )
+            params = [*event_ids, end_date]
+            if start_date:
+                query += " AND occurrence_date >= %s"
+                params.append(start_date)
+            cursor.execute(query, tuple(params))
+            overrides: Dict[Tuple[int, date], Dict[int, str]] = {}
+            for event_id, occurrence_date, user_id, status in cursor.fetchall() or []:
+                overrides.setdefault((event_id, occurrence_date), {})[user_id] = status
+            return overrides
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting archived occurrence overrides: {err}")
+            raise DatabaseException(f"Failed to retrieve occurrence attendance: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
@@ -1,10 +1,11 @@
 import mysql.connector
-from typing import List, Dict, Any
-from datetime import time as time_type, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import date, time as time_type, timedelta
 import logging
 from database import get_db_connection, close_db
 from config import DB_CONFIG
 from handlers.exceptions import DatabaseException
+from models.rsvp_count_repository import RSVP_COUNT_SELECT
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +79,37 @@ class MysqlEventAttendeeRepository:
                 cursor.close()
             close_db(conn)
 
+    def get_attendees_version(self, event_id: int) -> Dict[str, Any]:
+        """Get a cheap change validator for an event's attendee list"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(*) AS attendee_count,
+                    MAX(updated_at) AS attendees_updated_at,
+                    BIT_XOR(CRC32(CONCAT_WS(':', id, attendance_status))) AS checksum
+                FROM event_attendees
+                WHERE event_id = %s
+                """,
+                (event_id,)
+            )
+            return cursor.fetchone() or {}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting attendees version: {err}")
+            raise DatabaseException(f"Failed to retrieve attendees version: {err.msg}")
+        except Exception as e:
+            logger.error(f"Unexpected error getting attendees version: {str(e)}")
+            raise DatabaseException("Failed to retrieve attendees version")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
     def is_user_organizer(self, event_id: int, user_id: int) -> bool:
         """Check if user is organizer with proper error handling"""
         conn = None
@@ -126,6 +158,210 @@ class MysqlEventAttendeeRepository:
                 cursor.close()
             close_db(conn)
 
+    def get_attendee_user_ids(self, event_id: int, user_ids: List[int], conn, for_update: bool = False) -> Set[int]:
+        """Which of `user_ids` already attend the event, optionally locking those index ranges"""
+        if not user_ids:
+            return set()
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            query = f"SELECT user_id FROM event_attendees WHERE event_id = %s AND user_id IN ({placeholders})"
+            if for_update:
+                query += " FOR UPDATE"
+            cursor.execute(query, (event_id, *user_ids))
+            return {row[0] for row in cursor.fetchall() or []}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error checking attendees: {err}")
+            raise DatabaseException(f"Failed to check attendees: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def add_attendees_batch(self, event_id: int, user_ids: List[int], role: str, conn) -> int:
+        """Insert many attendees with one multi-row INSERT IGNORE; returns the rows inserted"""
+        if not user_ids:
+            return 0
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            values = ", ".join(["(%s, %s, %s)"] * len(user_ids))
+            params = [value for user_id in user_ids for value in (event_id, user_id, role)]
+            cursor.execute(
+                f"INSERT IGNORE INTO event_attendees (event_id, user_id, role) VALUES {values}",
+                tuple(params)
+            )
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            logger.error(f"Database error adding attendees: {err}")
+            raise DatabaseException(f"Failed to add attendees: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def add_organizer_rows(self, event_ids: List[int], user_id: int, conn) -> None:
+        """Insert the organizer attendee row of many newly created events"""
+        if not event_ids:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.executemany(
+                "INSERT INTO event_attendees (event_id, user_id, role) VALUES (%s, %s, 'organizer')",
+                [(event_id, user_id) for event_id in event_ids]
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error adding organizers: {err}")
+            raise DatabaseException(f"Failed to add organizers: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def get_attendance_status(self, event_id: int, user_id: int, conn, for_update: bool = False) -> Optional[str]:
+        """Get an attendee's current status (None if not an attendee), optionally locking the row"""
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            query = "SELECT attendance_status FROM event_attendees WHERE event_id = %s AND user_id = %s"
+            if for_update:
+                query += " FOR UPDATE"
+            cursor.execute(query, (event_id, user_id))
+            row = cursor.fetchone()
+            return (row[0] or "pending") if row else None
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting attendance status: {err}")
+            raise DatabaseException(f"Failed to retrieve attendance status: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def get_occurrence_overrides(self, event_ids: List[int], start_date: Optional[date],
+                                 end_date: date) -> Dict[Tuple[int, date], Dict[int, str]]:
+        """Per-occurrence statuses of recurring events in a date window, as {(event_id, date): {user_id: status}}"""
+        if not event_ids:
+            return {}
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(event_ids))
+            query = (
+                "SELECT event_id, occurrence_date, user_id, attendance_status FROM event_occurrence_overrides "
+                f"WHERE event_id IN ({placeholders}) AND occurrence_date <= %s"
+            )
+            params = [*event_ids, end_date]
+            if start_date:
+                query += " AND occurrence_date >= %s"
+                params.append(start_date)
+            cursor.execute(query, tuple(params))
+            overrides: Dict[Tuple[int, date], Dict[int, str]] = {}
+            for event_id, occurrence_date, user_id, status in cursor.fetchall() or []:
+                overrides.setdefault((event_id, occurrence_date), {})[user_id] = status
+            return overrides
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting occurrence overrides: {err}")
+            raise DatabaseException(f"Failed to retrieve occurrence attendance: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def set_occurrence_status(self, event_id: int, occurrence_date: date, user_id: int,
+                              status: Optional[str], conn=None) -> None:
+        """Store one occurrence's status for an attendee; None removes the override"""
+        local_conn = conn or get_db_connection()
+        cursor = None
+        try:
+            cursor = local_conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            if status is None:
+                cursor.execute(
+                    "DELETE FROM event_occurrence_overrides WHERE event_id = %s AND occurrence_date = %s AND user_id = %s",
+                    (event_id, occurrence_date, user_id)
+                )
+            else:
+                cursor.execute(
+                    """
+                    INSERT INTO event_occurrence_overrides (event_id, occurrence_date, user_id, attendance_status)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE attendance_status = VALUES(attendance_status)
+                    """,
+                    (event_id, occurrence_date, user_id, status)
+                )
+            if conn is None:
+                local_conn.commit()
+        except mysql.connector.Error as err:
+            if local_conn and conn is None:
+                local_conn.rollback()
+            logger.error(f"Database error setting occurrence status: {err}")
+            raise DatabaseException(f"Failed to update occurrence attendance: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            if conn is None:
+                close_db(local_conn)
+
+    def count_event_rows(self, event_id: int) -> int:
+        """Attendee and occurrence override rows of an event (the work left for a purge)"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM event_attendees WHERE event_id = %s)
+                    + (SELECT COUNT(*) FROM event_occurrence_overrides WHERE event_id = %s)
+                """,
+                (event_id, event_id)
+            )
+            row = cursor.fetchone()
+            return int(row[0] or 0) if row else 0
+        except mysql.connector.Error as err:
+            logger.error(f"Database error counting event rows: {err}")
+            raise DatabaseException(f"Failed to count event rows: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def delete_event_rows_chunk(self, event_id: int, limit: int) -> int:
+        """Delete and commit up to `limit` override, then attendee, rows of an event; returns the rows removed.
+
+        Each call is its own short transaction, so purging a large event
+        never holds many row locks or a long undo log at once.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute("DELETE FROM event_occurrence_overrides WHERE event_id = %s LIMIT %s", (event_id, limit))
+            removed = cursor.rowcount
+            if removed < limit:
+                cursor.execute("DELETE FROM event_attendees WHERE event_id = %s LIMIT %s", (event_id, limit - removed))
+                removed += cursor.rowcount
+            conn.commit()
+            return removed
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error purging event rows: {err}")
+            raise DatabaseException(f"Failed to purge event rows: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
     def get_invited_events_for_user(self, user_id: int) -> List[Dict[str, Any]]:
         """Get invited events for user with proper error handling"""
         conn = None
@@ -135,11 +371,12 @@ class MysqlEventAttendeeRepository:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(f"USE {DB_CONFIG['database']}")
             cursor.execute(
-                """
-                SELECT e.*
+                f"""
+                SELECT e.*, {RSVP_COUNT_SELECT}
                 FROM events e
                 INNER JOIN event_attendees ea ON ea.event_id = e.id
-                WHERE ea.user_id = %s AND ea.role = 'attendee'
+                LEFT JOIN event_rsvp_counts c ON c.event_id = e.id
+                WHERE ea.user_id = %s AND ea.role = 'attendee' AND e.deleted_at IS NULL
                 ORDER BY e.created_at DESC
                 """,
                 (user_id,)
@@ -161,37 +398,134 @@ class MysqlEventAttendeeRepository:
                 cursor.close()
             close_db(conn)
 
-    def update_attendance_status(self, event_id: int, user_id: int, status: str) -> bool:
-        """Update attendance status for an attendee with proper error handling"""
+    def get_invited_events_version(self, user_id: int) -> Dict[str, Any]:
+        """Get a cheap change validator for a user's invited event list"""
         conn = None
         cursor = None
         try:
             conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(DISTINCT e.id) AS event_count,
+                    COUNT(ea.id) AS attendee_count,
+                    MAX(e.updated_at) AS events_updated_at,
+                    MAX(ea.updated_at) AS attendees_updated_at,
+                    BIT_XOR(CRC32(CONCAT_WS(':', ea.id, ea.attendance_status))) AS checksum,
+                    (
+                        SELECT CONCAT_WS(
+                            ':', COUNT(*), MAX(o.updated_at),
+                            BIT_XOR(CRC32(CONCAT_WS(':', o.event_id, o.occurrence_date, o.user_id, o.attendance_status)))
+                        )
+                        FROM event_occurrence_overrides o
+                        INNER JOIN event_attendees om ON om.event_id = o.event_id
+                        INNER JOIN events oe ON oe.id = o.event_id
+                        WHERE om.user_id = %s AND om.role = 'attendee' AND oe.deleted_at IS NULL
+                    ) AS overrides
+                FROM event_attendees mine
+                INNER JOIN events e ON e.id = mine.event_id
+                LEFT JOIN event_attendees ea ON ea.event_id = e.id
+                WHERE mine.user_id = %s AND mine.role = 'attendee' AND e.deleted_at IS NULL
+                """,
+                (user_id, user_id)
+            )
+            return cursor.fetchone() or {}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting invited events version: {err}")
+            raise DatabaseException(f"Failed to retrieve invited events version: {err.msg}")
+        except Exception as e:
+            logger.error(f"Unexpected error getting invited events version: {str(e)}")
+            raise DatabaseException("Failed to retrieve invited events version")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def get_attendance_statuses(self, event_id: int, user_ids: List[int], conn, for_update: bool = False) -> Dict[int, str]:
+        """Current status of each of `user_ids` that attends the event, optionally locking the rows"""
+        if not user_ids:
+            return {}
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            query = (
+                "SELECT user_id, attendance_status FROM event_attendees "
+                f"WHERE event_id = %s AND user_id IN ({placeholders})"
+            )
+            if for_update:
+                query += " FOR UPDATE"
+            cursor.execute(query, (event_id, *user_ids))
+            return {row[0]: row[1] or "pending" for row in cursor.fetchall() or []}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting attendance statuses: {err}")
+            raise DatabaseException(f"Failed to retrieve attendance statuses: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def update_attendance_statuses(self, event_id: int, statuses: Dict[int, str], conn) -> int:
+        """Set many attendees' statuses with one UPDATE ... CASE; returns the rows changed"""
+        if not statuses:
+            return 0
+        cursor = None
+        try:
             cursor = conn.cursor()
             cursor.execute(f"USE {DB_CONFIG['database']}")
+            cases = " ".join(["WHEN %s THEN %s"] * len(statuses))
+            placeholders = ", ".join(["%s"] * len(statuses))
+            params = [value for user_id, status in statuses.items() for value in (user_id, status)]
+            cursor.execute(
+                f"""
+                UPDATE event_attendees
+                SET attendance_status = CASE user_id {cases} END
+                WHERE event_id = %s AND user_id IN ({placeholders})
+                """,
+                (*params, event_id, *statuses.keys())
+            )
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            logger.error(f"Database error updating attendance statuses: {err}")
+            raise DatabaseException(f"Failed to update attendance statuses: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def update_attendance_status(self, event_id: int, user_id: int, status: str, conn=None) -> bool:
+        """Update attendance status for an attendee with proper error handling"""
+        local_conn = conn or get_db_connection()
+        cursor = None
+        try:
+            cursor = local_conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
             cursor.execute(
                 "UPDATE event_attendees SET attendance_status = %s WHERE event_id = %s AND user_id = %s",
                 (status, event_id, user_id)
             )
-            conn.commit()
+            if conn is None:
+                local_conn.commit()
             success = cursor.rowcount > 0
             if success:
                 logger.info(f"Attendance status updated for user {user_id} in event {event_id}")
             return success
         except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
+            if local_conn and conn is None:
+                local_conn.rollback()
             logger.error(f"Database error updating attendance status: {err}")
             raise DatabaseException(f"Failed to update attendance status: {err.msg}")
         except Exception as e:
-            if conn:
-                conn.rollback()
+            if local_conn and conn is None:
+                local_conn.rollback()
             logger.error(f"Unexpected error updating attendance status: {str(e)}")
             raise DatabaseException("Failed to update attendance status")
         finally:
             if cursor:
                 cursor.close()
-            close_db(conn)
+            if conn is None:
+                close_db(local_conn)
 
     def get_my_invitations(self, organizer_id: int) -> List[Dict[str, Any]]:
         """Get all people the organizer has invited across all their events with their status"""
@@ -215,7 +549,7 @@ class MysqlEventAttendeeRepository:
                 FROM events e
                 INNER JOIN event_attendees ea ON ea.event_id = e.id
                 INNER JOIN users u ON u.id = ea.user_id
-                WHERE e.organizer_user_id = %s AND ea.role = 'attendee'
+                WHERE e.organizer_user_id = %s AND ea.role = 'attendee' AND e.deleted_at IS NULL
                 ORDER BY e.date DESC, ea.created_at DESC
                 """,
                 (organizer_id,)
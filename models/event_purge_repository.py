@@ -0,0 +1,145 @@
+import mysql.connector
+from typing import Optional, Dict, Any, List
+import logging
+from database import get_db_connection, close_db
+from config import DB_CONFIG
+from handlers.exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+class MysqlEventPurgeRepository:
+    """Progress rows of the background purges of deleted events.
+
+    A row is written in the same transaction that marks the event deleted
+    and has no foreign key to events, so it survives the final delete of
+    the event row and the organizer can still read how the purge ended.
+    """
+
+    def create_job(self, event_id: int, organizer_user_id: int, conn) -> None:
+        """Record a pending purge for an event that has just been marked deleted"""
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                INSERT INTO event_purge_jobs (event_id, organizer_user_id, status)
+                VALUES (%s, %s, 'pending')
+                ON DUPLICATE KEY UPDATE status = 'pending', error = NULL, finished_at = NULL
+                """,
+                (event_id, organizer_user_id)
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error creating purge job: {err}")
+            raise DatabaseException(f"Failed to schedule event purge: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def create_jobs(self, event_ids: List[int], organizer_user_id: int, conn) -> None:
+        """Record pending purges for many events deleted in the caller's transaction"""
+        if not event_ids:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            values = ", ".join(["(%s, %s, 'pending')"] * len(event_ids))
+            params = [value for event_id in event_ids for value in (event_id, organizer_user_id)]
+            cursor.execute(
+                f"""
+                INSERT INTO event_purge_jobs (event_id, organizer_user_id, status)
+                VALUES {values}
+                ON DUPLICATE KEY UPDATE status = 'pending', error = NULL, finished_at = NULL
+                """,
+                tuple(params)
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error creating purge jobs: {err}")
+            raise DatabaseException(f"Failed to schedule event purges: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def get_job(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """Current progress of an event's purge"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT event_id, organizer_user_id, status, total_rows, purged_rows, error,
+                       created_at, updated_at, finished_at
+                FROM event_purge_jobs
+                WHERE event_id = %s
+                """,
+                (event_id,)
+            )
+            return cursor.fetchone()
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting purge job: {err}")
+            raise DatabaseException(f"Failed to retrieve event purge: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def update_progress(self, event_id: int, status: str, total_rows: Optional[int] = None,
+                        purged_rows: Optional[int] = None, error: Optional[str] = None) -> None:
+        """Set the status of a purge, and its counters when given; finished statuses are timestamped"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                UPDATE event_purge_jobs
+                SET status = %s,
+                    total_rows = COALESCE(%s, total_rows),
+                    purged_rows = COALESCE(%s, purged_rows),
+                    error = %s,
+                    finished_at = IF(%s IN ('done', 'failed'), UTC_TIMESTAMP(), NULL)
+                WHERE event_id = %s
+                """,
+                (status, total_rows, purged_rows, error[:255] if error else None, status, event_id)
+            )
+            conn.commit()
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error updating purge job: {err}")
+            raise DatabaseException(f"Failed to update event purge: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def list_unfinished(self) -> List[Dict[str, Any]]:
+        """Purges that were never started or were interrupted (by a restart or a failure)"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT event_id, organizer_user_id, status, total_rows, purged_rows
+                FROM event_purge_jobs
+                WHERE status IN ('pending', 'running', 'failed')
+                ORDER BY created_at
+                """
+            )
+            return list(cursor.fetchall() or [])
+        except mysql.connector.Error as err:
+            logger.error(f"Database error listing purge jobs: {err}")
+            raise DatabaseException(f"Failed to list event purges: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
@@ -1,10 +1,11 @@
 import mysql.connector
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import date, time as time_type, timedelta
 import logging
 from database import get_db_connection, close_db
 from config import DB_CONFIG
 from handlers.exceptions import DatabaseException
+from models.rsvp_count_repository import RSVP_COUNT_SELECT
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,95 @@ def convert_timedelta_to_time(td):
         return time_type(hours, minutes, seconds)
     return td
 
+def build_search_query(user_id: int, keyword: Optional[str], start_date: Optional[date], end_date: Optional[date],
+                       role: Optional[str], location: Optional[str], attendance_status: Optional[str],
+                       archive: bool = False) -> Tuple[str, List[Any]]:
+    """Dynamic search SQL over the live tables, or over the archive tables with `archive`"""
+    if archive:
+        # Archived rows carry their frozen RSVP counters
+        query = """
+            SELECT DISTINCT e.*
+            FROM events_archive e
+            INNER JOIN event_attendees_archive ea ON e.id = ea.event_id
+            WHERE ea.user_id = %s
+        """
+    else:
+        query = f"""
+            SELECT DISTINCT e.*, {RSVP_COUNT_SELECT}
+            FROM events e
+            INNER JOIN event_attendees ea ON e.id = ea.event_id
+            LEFT JOIN event_rsvp_counts c ON c.event_id = e.id
+            WHERE ea.user_id = %s AND e.deleted_at IS NULL
+        """
+    params: List[Any] = [user_id]
+
+    # Filter by role (organizer or attendee)
+    if role:
+        query += " AND ea.role = %s"
+        params.append(role)
+
+    # Filter by attendance status (a series may match through per-occurrence
+    # overrides, so the service filters its occurrences after expansion)
+    if attendance_status:
+        query += " AND (ea.attendance_status = %s OR e.recurrence_freq IS NOT NULL)"
+        params.append(attendance_status)
+
+    # Filter by keyword (search in title and description)
+    if keyword:
+        query += " AND (e.title LIKE %s OR e.description LIKE %s)"
+        keyword_pattern = f"%{keyword}%"
+        params.extend([keyword_pattern, keyword_pattern])
+
+    # Filter by location
+    if location:
+        query += " AND e.location LIKE %s"
+        params.append(f"%{location}%")
+
+    if archive:
+        return _archive_date_range(query, params, start_date, end_date)
+
+    # Filter by date range; a series matches while it may have an occurrence
+    # in the range and is expanded by the service
+    if start_date:
+        query += " AND (e.date >= %s OR (e.recurrence_freq IS NOT NULL AND (e.recurrence_until IS NULL OR e.recurrence_until >= %s)))"
+        params.extend([start_date, start_date])
+
+    if end_date:
+        query += " AND e.date <= %s"
+        params.append(end_date)
+
+    query += " ORDER BY e.date DESC, e.created_at DESC"
+    return query, params
+
+
+def _archive_date_range(query: str, params: List[Any], start_date: Optional[date],
+                        end_date: Optional[date]) -> Tuple[str, List[Any]]:
+    """Date range of an archive search, written so MySQL prunes the date partitions.
+
+    Both tables are bounded on their own partitioning column (ea.event_date
+    repeats e.date). The lower bound cannot sit in an OR with the series
+    condition, which would make every partition a candidate, so one-off
+    events and series are searched in two branches of a UNION ALL; only
+    the one-off branch is bounded from below.
+    """
+    if end_date:
+        query += " AND e.date <= %s AND ea.event_date <= %s"
+        params = [*params, end_date, end_date]
+    if not start_date:
+        return query + " ORDER BY e.date DESC, e.created_at DESC", params
+
+    one_off = query + " AND e.recurrence_freq IS NULL AND e.date >= %s AND ea.event_date >= %s"
+    series = query + " AND e.recurrence_freq IS NOT NULL AND (e.recurrence_until IS NULL OR e.recurrence_until >= %s)"
+    return (
+        f"({one_off}) UNION ALL ({series}) ORDER BY date DESC, created_at DESC",
+        [*params, start_date, start_date, *params, start_date]
+    )
+
 class MysqlEventRepository:
-    def create_event(self, organizer_user_id: int, title: str, date_value: date, time_value: time_type, location: str, description: Optional[str], conn=None) -> Dict[str, Any]:
-        """Create event with proper error handling"""
+    def create_event(self, organizer_user_id: int, title: str, date_value: date, time_value: time_type, location: str, description: Optional[str], conn=None,
+                     recurrence: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create event (or a recurring series when `recurrence` is given) with proper error handling"""
+        recurrence = recurrence or {}
         local_conn = conn or get_db_connection()
         cursor = None
         try:
@@ -28,10 +115,12 @@ class MysqlEventRepository:
             cursor.execute(f"USE {DB_CONFIG['database']}")
             cursor.execute(
                 '''
-                INSERT INTO events (title, date, time, location, description, organizer_user_id)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                INSERT INTO events (title, date, time, location, description, organizer_user_id,
+                                    recurrence_freq, recurrence_interval, recurrence_until, recurrence_count)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ''',
-                (title, date_value, time_value, location, description, organizer_user_id)
+                (title, date_value, time_value, location, description, organizer_user_id,
+                 recurrence.get("freq"), recurrence.get("interval") or 1, recurrence.get("until"), recurrence.get("count"))
             )
             if conn is None:
                 local_conn.commit()
@@ -44,7 +133,11 @@ class MysqlEventRepository:
                 "time": time_value,
                 "location": location,
                 "description": description,
-                "organizer_user_id": organizer_user_id
+                "organizer_user_id": organizer_user_id,
+                "recurrence_freq": recurrence.get("freq"),
+                "recurrence_interval": recurrence.get("interval") or 1,
+                "recurrence_until": recurrence.get("until"),
+                "recurrence_count": recurrence.get("count")
             }
         except mysql.connector.Error as err:
             if local_conn and conn is None:
@@ -62,6 +155,46 @@ class MysqlEventRepository:
             if conn is None:
                 close_db(local_conn)
 
+    def create_events_batch(self, organizer_user_id: int, events: List[Dict[str, Any]], conn) -> List[int]:
+        """Insert many events of one organizer with executemany; returns their ids in input order.
+
+        The caller's transaction must have been started with a consistent
+        snapshot: the ids are read back from that snapshot, which holds this
+        transaction's own rows but none committed by others since it began, so
+        the read is exact even when auto-increment values are interleaved.
+        """
+        if not events:
+            return []
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.executemany(
+                '''
+                INSERT INTO events (title, date, time, location, description, organizer_user_id)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ''',
+                [
+                    (event["title"], event["date"], event["time"], event["location"], event["description"], organizer_user_id)
+                    for event in events
+                ]
+            )
+            first_id = cursor.lastrowid
+            cursor.execute(
+                "SELECT id FROM events WHERE organizer_user_id = %s AND id >= %s ORDER BY id LIMIT %s",
+                (organizer_user_id, first_id, len(events))
+            )
+            event_ids = [row[0] for row in cursor.fetchall() or []]
+            if len(event_ids) != len(events):
+                raise DatabaseException("Batch insert returned an unexpected number of events")
+            return event_ids
+        except mysql.connector.Error as err:
+            logger.error(f"Database error creating events: {err}")
+            raise DatabaseException(f"Failed to create events: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
     def get_event_by_id(self, event_id: int) -> Optional[Dict[str, Any]]:
         """Get event by ID with proper error handling"""
         conn = None
@@ -70,7 +203,15 @@ class MysqlEventRepository:
             conn = get_db_connection()
             cursor = conn.cursor(dictionary=True)
             cursor.execute(f"USE {DB_CONFIG['database']}")
-            cursor.execute("SELECT * FROM events WHERE id = %s", (event_id,))
+            cursor.execute(
+                f"""
+                SELECT e.*, {RSVP_COUNT_SELECT}
+                FROM events e
+                LEFT JOIN event_rsvp_counts c ON c.event_id = e.id
+                WHERE e.id = %s AND e.deleted_at IS NULL
+                """,
+                (event_id,)
+            )
             event = cursor.fetchone()
             if event and 'time' in event:
                 event['time'] = convert_timedelta_to_time(event['time'])
@@ -94,7 +235,16 @@ class MysqlEventRepository:
             conn = get_db_connection()
             cursor = conn.cursor(dictionary=True)
             cursor.execute(f"USE {DB_CONFIG['database']}")
-            cursor.execute("SELECT * FROM events WHERE organizer_user_id = %s ORDER BY created_at DESC", (user_id,))
+            cursor.execute(
+                f"""
+                SELECT e.*, {RSVP_COUNT_SELECT}
+                FROM events e
+                LEFT JOIN event_rsvp_counts c ON c.event_id = e.id
+                WHERE e.organizer_user_id = %s AND e.deleted_at IS NULL
+                ORDER BY e.created_at DESC
+                """,
+                (user_id,)
+            )
             events = cursor.fetchall() or []
             # Convert timedelta to time for each event
             for event in events:
@@ -112,6 +262,132 @@ class MysqlEventRepository:
                 cursor.close()
             close_db(conn)
 
+    def get_organized_events_version(self, user_id: int) -> Dict[str, Any]:
+        """Get a cheap change validator for an organizer's event list"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(DISTINCT e.id) AS event_count,
+                    COUNT(ea.id) AS attendee_count,
+                    MAX(e.updated_at) AS events_updated_at,
+                    MAX(ea.updated_at) AS attendees_updated_at,
+                    BIT_XOR(CRC32(CONCAT_WS(':', ea.id, ea.attendance_status))) AS checksum,
+                    (
+                        SELECT CONCAT_WS(
+                            ':', COUNT(*), MAX(o.updated_at),
+                            BIT_XOR(CRC32(CONCAT_WS(':', o.event_id, o.occurrence_date, o.user_id, o.attendance_status)))
+                        )
+                        FROM event_occurrence_overrides o
+                        INNER JOIN events oe ON oe.id = o.event_id
+                        WHERE oe.organizer_user_id = %s AND oe.deleted_at IS NULL
+                    ) AS overrides
+                FROM events e
+                LEFT JOIN event_attendees ea ON ea.event_id = e.id
+                WHERE e.organizer_user_id = %s AND e.deleted_at IS NULL
+                """,
+                (user_id, user_id)
+            )
+            return cursor.fetchone() or {}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting organized events version: {err}")
+            raise DatabaseException(f"Failed to retrieve events version: {err.msg}")
+        except Exception as e:
+            logger.error(f"Unexpected error getting organized events version: {str(e)}")
+            raise DatabaseException("Failed to retrieve events version")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def get_event_owners(self, event_ids: List[int], conn, for_update: bool = False) -> Dict[int, Dict[str, Any]]:
+        """Organizer, date, recurrence rule and attendee row count of each live event in `event_ids`, in one query.
+
+        With `for_update` the event rows stay locked until the caller's
+        transaction ends, so no attendee can be added to them meanwhile.
+        """
+        if not event_ids:
+            return {}
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(event_ids))
+            query = f"""
+                SELECT e.id, e.organizer_user_id, e.date, e.recurrence_freq, e.recurrence_interval,
+                       e.recurrence_until, e.recurrence_count,
+                       (SELECT COUNT(*) FROM event_attendees ea WHERE ea.event_id = e.id) AS attendee_count
+                FROM events e
+                WHERE e.id IN ({placeholders}) AND e.deleted_at IS NULL
+            """
+            if for_update:
+                query += " FOR UPDATE"
+            cursor.execute(query, tuple(event_ids))
+            return {row["id"]: row for row in cursor.fetchall() or []}
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting event owners: {err}")
+            raise DatabaseException(f"Failed to retrieve events: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def soft_delete_events(self, event_ids: List[int], conn) -> int:
+        """Mark many events deleted with one UPDATE; returns the rows changed"""
+        if not event_ids:
+            return 0
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(event_ids))
+            cursor.execute(
+                f"UPDATE events SET deleted_at = UTC_TIMESTAMP() WHERE id IN ({placeholders}) AND deleted_at IS NULL",
+                tuple(event_ids)
+            )
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            logger.error(f"Database error marking events deleted: {err}")
+            raise DatabaseException(f"Failed to delete events: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def soft_delete_event(self, event_id: int, conn=None) -> bool:
+        """Mark an event deleted so every read hides it; its rows are purged later"""
+        local_conn = conn or get_db_connection()
+        cursor = None
+        try:
+            cursor = local_conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                "UPDATE events SET deleted_at = UTC_TIMESTAMP() WHERE id = %s AND deleted_at IS NULL",
+                (event_id,)
+            )
+            if conn is None:
+                local_conn.commit()
+            logger.info(f"Event marked deleted: {event_id}")
+            return cursor.rowcount > 0
+        except mysql.connector.Error as err:
+            if local_conn and conn is None:
+                local_conn.rollback()
+            logger.error(f"Database error marking event deleted: {err}")
+            raise DatabaseException(f"Failed to delete event: {err.msg}")
+        except Exception as e:
+            if local_conn and conn is None:
+                local_conn.rollback()
+            logger.error(f"Unexpected error marking event deleted: {str(e)}")
+            raise DatabaseException("Failed to delete event")
+        finally:
+            if cursor:
+                cursor.close()
+            if conn is None:
+                close_db(local_conn)
+
     def delete_event(self, event_id: int, conn=None) -> None:
         """Delete event with proper error handling"""
         local_conn = conn or get_db_connection()
@@ -154,47 +430,7 @@ class MysqlEventRepository:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(f"USE {DB_CONFIG['database']}")
             
-            # Build dynamic query
-            query = """
-                SELECT DISTINCT e.* 
-                FROM events e
-                INNER JOIN event_attendees ea ON e.id = ea.event_id
-                WHERE ea.user_id = %s
-            """
-            params = [user_id]
-            
-            # Filter by role (organizer or attendee)
-            if role:
-                query += " AND ea.role = %s"
-                params.append(role)
-            
-            # Filter by attendance status
-            if attendance_status:
-                query += " AND ea.attendance_status = %s"
-                params.append(attendance_status)
-            
-            # Filter by keyword (search in title and description)
-            if keyword:
-                query += " AND (e.title LIKE %s OR e.description LIKE %s)"
-                keyword_pattern = f"%{keyword}%"
-                params.extend([keyword_pattern, keyword_pattern])
-            
-            # Filter by date range
-            if start_date:
-                query += " AND e.date >= %s"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND e.date <= %s"
-                params.append(end_date)
-            
-            # Filter by location
-            if location:
-                query += " AND e.location LIKE %s"
-                params.append(f"%{location}%")
-            
-            query += " ORDER BY e.date DESC, e.created_at DESC"
-            
+            query, params = build_search_query(user_id, keyword, start_date, end_date, role, location, attendance_status)
             cursor.execute(query, tuple(params))
             events = cursor.fetchall() or []
             
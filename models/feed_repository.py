@@ -0,0 +1,259 @@
+import mysql.connector
+from typing import Optional, Dict, Any, List
+from datetime import date
+import logging
+from database import get_db_connection, close_db
+from config import DB_CONFIG
+from handlers.exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+class MysqlUserEventFeedRepository:
+    """Denormalized (user_id, event_id) listing kept in sync with event_attendees.
+
+    Write methods take the caller's connection so the feed row changes in the
+    same transaction as the attendee row it mirrors.
+    """
+
+    def add_entry(self, event_id: int, user_id: int, role: str, event_date: date, title: str, conn) -> None:
+        """Add a feed row for a new attendee"""
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                INSERT INTO user_event_feed (user_id, event_id, role, event_date, title)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE role = VALUES(role), event_date = VALUES(event_date), title = VALUES(title)
+                """,
+                (user_id, event_id, role, event_date, title)
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error adding feed entry: {err}")
+            raise DatabaseException(f"Failed to add feed entry: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def add_entries(self, event_id: int, user_ids: List[int], role: str, event_date: date, title: str, conn) -> None:
+        """Add feed rows for many new attendees of one event"""
+        if not user_ids:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.executemany(
+                """
+                INSERT INTO user_event_feed (user_id, event_id, role, event_date, title)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE role = VALUES(role), event_date = VALUES(event_date), title = VALUES(title)
+                """,
+                [(user_id, event_id, role, event_date, title) for user_id in user_ids]
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error adding feed entries: {err}")
+            raise DatabaseException(f"Failed to add feed entries: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def add_user_entries(self, user_id: int, role: str, events: List[Dict[str, Any]], conn) -> None:
+        """Add feed rows for one user across many events ({"id", "date", "title"} each)"""
+        if not events:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.executemany(
+                """
+                INSERT INTO user_event_feed (user_id, event_id, role, event_date, title)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE role = VALUES(role), event_date = VALUES(event_date), title = VALUES(title)
+                """,
+                [(user_id, event["id"], role, event["date"], event["title"]) for event in events]
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error adding feed entries: {err}")
+            raise DatabaseException(f"Failed to add feed entries: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def update_status(self, event_id: int, user_id: int, status: str, conn) -> None:
+        """Mirror an attendance status change"""
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                "UPDATE user_event_feed SET attendance_status = %s WHERE user_id = %s AND event_id = %s",
+                (status, user_id, event_id)
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error updating feed entry: {err}")
+            raise DatabaseException(f"Failed to update feed entry: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def update_statuses(self, event_id: int, statuses: Dict[int, str], conn) -> None:
+        """Mirror many attendance status changes of one event"""
+        if not statuses:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.executemany(
+                "UPDATE user_event_feed SET attendance_status = %s WHERE user_id = %s AND event_id = %s",
+                [(status, user_id, event_id) for user_id, status in statuses.items()]
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error updating feed entries: {err}")
+            raise DatabaseException(f"Failed to update feed entries: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def delete_event_entries(self, event_id: int, conn) -> None:
+        """Remove every feed row of an event"""
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute("DELETE FROM user_event_feed WHERE event_id = %s", (event_id,))
+        except mysql.connector.Error as err:
+            logger.error(f"Database error deleting feed entries: {err}")
+            raise DatabaseException(f"Failed to delete feed entries: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def delete_event_entries_chunk(self, event_id: int, limit: int) -> int:
+        """Delete and commit up to `limit` feed rows of an event; returns the rows removed"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute("DELETE FROM user_event_feed WHERE event_id = %s LIMIT %s", (event_id, limit))
+            conn.commit()
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error purging feed entries: {err}")
+            raise DatabaseException(f"Failed to purge feed entries: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def get_feed(self, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                 role: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Read a user's events from a single range of idx_feed_user_date"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+
+            # Rows of a deleted event remain until its purge finishes; the
+            # primary-key join on events hides them
+            query = """
+                SELECT f.event_id, f.title, f.event_date, f.role, f.attendance_status
+                FROM user_event_feed f
+                INNER JOIN events e ON e.id = f.event_id AND e.deleted_at IS NULL
+                WHERE f.user_id = %s
+            """
+            params = [user_id]
+
+            if start_date:
+                query += " AND f.event_date >= %s"
+                params.append(start_date)
+
+            if end_date:
+                query += " AND f.event_date <= %s"
+                params.append(end_date)
+
+            if role:
+                query += " AND f.role = %s"
+                params.append(role)
+
+            query += " ORDER BY f.event_date DESC, f.event_id DESC LIMIT %s"
+            params.append(limit)
+
+            cursor.execute(query, tuple(params))
+            return list(cursor.fetchall() or [])
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting feed: {err}")
+            raise DatabaseException(f"Failed to retrieve feed: {err.msg}")
+        except Exception as e:
+            logger.error(f"Unexpected error getting feed: {str(e)}")
+            raise DatabaseException("Failed to retrieve feed")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def rebuild(self, user_id: Optional[int] = None) -> Dict[str, int]:
+        """Recompute the feed from events and event_attendees (backfill/repair)"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+
+            user_filter = " AND f.user_id = %s" if user_id else ""
+            cursor.execute(
+                f"""
+                DELETE f FROM user_event_feed f
+                LEFT JOIN event_attendees ea ON ea.event_id = f.event_id AND ea.user_id = f.user_id
+                WHERE ea.id IS NULL{user_filter}
+                """,
+                (user_id,) if user_id else ()
+            )
+            removed = cursor.rowcount
+
+            user_filter = " WHERE ea.user_id = %s" if user_id else ""
+            cursor.execute(
+                f"""
+                INSERT INTO user_event_feed (user_id, event_id, role, attendance_status, event_date, title)
+                SELECT ea.user_id, ea.event_id, ea.role, ea.attendance_status, e.date, e.title
+                FROM event_attendees ea
+                INNER JOIN events e ON e.id = ea.event_id AND e.deleted_at IS NULL{user_filter}
+                ON DUPLICATE KEY UPDATE
+                    role = VALUES(role),
+                    attendance_status = VALUES(attendance_status),
+                    event_date = VALUES(event_date),
+                    title = VALUES(title)
+                """,
+                (user_id,) if user_id else ()
+            )
+            # ON DUPLICATE KEY UPDATE reports 1 per insert and 2 per changed row
+            affected = cursor.rowcount
+
+            conn.commit()
+            logger.info(f"Feed rebuilt: {removed} stale rows removed, {affected} rows affected by upsert")
+            return {"removed": removed, "affected": affected}
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error rebuilding feed: {err}")
+            raise DatabaseException(f"Failed to rebuild feed: {err.msg}")
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error rebuilding feed: {str(e)}")
+            raise DatabaseException("Failed to rebuild feed")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
@@ -0,0 +1,84 @@
+import mysql.connector
+from typing import Dict, Any, List
+from datetime import date
+import logging
+from database import get_db_connection, close_db
+from config import DB_CONFIG
+from handlers.exceptions import DatabaseException
+from partitions import FUTURE_PARTITION, bounds_to_add, parse_bound, partition_definitions, partition_name
+
+logger = logging.getLogger(__name__)
+
+
+class MysqlPartitionRepository:
+    """Reads and extends the date partitions of the archive tables"""
+
+    def list_partitions(self, table: str) -> List[Dict[str, Any]]:
+        """Partitions of `table` in order with their upper bound (None for MAXVALUE); empty when not partitioned"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+                FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+                ORDER BY PARTITION_ORDINAL_POSITION
+                """,
+                (DB_CONFIG['database'], table)
+            )
+            return [
+                {"name": name, "bound": parse_bound(description), "rows": rows or 0}
+                for name, description, rows in cursor.fetchall() or []
+            ]
+        except mysql.connector.Error as err:
+            logger.error(f"Database error listing partitions of {table}: {err}")
+            raise DatabaseException(f"Failed to list partitions of {table}: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    def add_partitions_ahead(self, table: str, today: date, months: int, ahead_months: int) -> List[str]:
+        """Split partitions off p_future so `table` has ranges `ahead_months` past the current period.
+
+        p_future is expected to be empty (nothing is archived with a future
+        date), so the REORGANIZE only rewrites its definition. Returns the
+        names of the partitions added.
+        """
+        partitions = self.list_partitions(table)
+        if not partitions or partitions[-1]["name"] != FUTURE_PARTITION:
+            logger.warning(f"{table} is not partitioned with a {FUTURE_PARTITION} partition, skipped")
+            return []
+        last_bound = max(partition["bound"] for partition in partitions[:-1])
+        bounds = bounds_to_add(last_bound, today, months, ahead_months)
+        if not bounds:
+            return []
+        if partitions[-1]["rows"]:
+            logger.warning(f"{FUTURE_PARTITION} of {table} holds about {partitions[-1]['rows']} rows; they are moved by the split")
+
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                f"ALTER TABLE `{table}` REORGANIZE PARTITION {FUTURE_PARTITION} INTO ("
+                + ", ".join(partition_definitions(last_bound, bounds, months)) + ")"
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error adding partitions to {table}: {err}")
+            raise DatabaseException(f"Failed to add partitions to {table}: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+        starts = [last_bound, *bounds[:-1]]
+        added = [partition_name(start, months) for start in starts]
+        logger.info(f"Partitions added to {table}: {', '.join(added)}")
+        return added
@@ -0,0 +1,130 @@
+import mysql.connector
+from typing import Optional, Dict, Any
+from datetime import datetime
+import logging
+from database import get_db_connection, close_db
+from config import DB_CONFIG
+from handlers.exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+class MysqlRefreshTokenRepository:
+    """Refresh tokens, stored only as SHA-256 digests.
+
+    Each login starts a family; every rotation adds a row to it and marks the
+    previous one as replaced, so a replayed token can revoke the whole family.
+    """
+
+    def create(self, user_id: int, token_hash: str, family_id: str, expires_at: datetime, conn=None) -> int:
+        """Store a new refresh token digest"""
+        local_conn = conn or get_db_connection()
+        cursor = None
+        try:
+            cursor = local_conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                """
+                INSERT INTO refresh_tokens (user_id, token_hash, family_id, expires_at)
+                VALUES (%s, %s, %s, %s)
+                """,
+                (user_id, token_hash, family_id, expires_at)
+            )
+            if conn is None:
+                local_conn.commit()
+            return cursor.lastrowid
+        except mysql.connector.Error as err:
+            if local_conn and conn is None:
+                local_conn.rollback()
+            logger.error(f"Database error storing refresh token: {err}")
+            raise DatabaseException(f"Failed to store refresh token: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            if conn is None:
+                close_db(local_conn)
+
+    def get_by_hash(self, token_hash: str, conn, for_update: bool = False) -> Optional[Dict[str, Any]]:
+        """Look up a token by digest, optionally locking it for rotation"""
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                f"""
+                SELECT id, user_id, family_id, expires_at, revoked_at
+                FROM refresh_tokens
+                WHERE token_hash = %s
+                {"FOR UPDATE" if for_update else ""}
+                """,
+                (token_hash,)
+            )
+            return cursor.fetchone()
+        except mysql.connector.Error as err:
+            logger.error(f"Database error fetching refresh token: {err}")
+            raise DatabaseException(f"Failed to fetch refresh token: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def mark_replaced(self, token_id: int, replaced_by: int, conn) -> None:
+        """Retire a token that has just been rotated"""
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                "UPDATE refresh_tokens SET revoked_at = UTC_TIMESTAMP(), replaced_by = %s WHERE id = %s",
+                (replaced_by, token_id)
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error rotating refresh token: {err}")
+            raise DatabaseException(f"Failed to rotate refresh token: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def revoke_family(self, family_id: str, conn=None) -> int:
+        """Revoke every live token issued from the same login"""
+        local_conn = conn or get_db_connection()
+        cursor = None
+        try:
+            cursor = local_conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                "UPDATE refresh_tokens SET revoked_at = UTC_TIMESTAMP() WHERE family_id = %s AND revoked_at IS NULL",
+                (family_id,)
+            )
+            if conn is None:
+                local_conn.commit()
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            if local_conn and conn is None:
+                local_conn.rollback()
+            logger.error(f"Database error revoking refresh tokens: {err}")
+            raise DatabaseException(f"Failed to revoke refresh tokens: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            if conn is None:
+                close_db(local_conn)
+
+    def purge_expired(self) -> int:
+        """Delete tokens past their expiry; they can no longer be used or replayed"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute("DELETE FROM refresh_tokens WHERE expires_at < UTC_TIMESTAMP()")
+            conn.commit()
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error purging refresh tokens: {err}")
+            raise DatabaseException(f"Failed to purge refresh tokens: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
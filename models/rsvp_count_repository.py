@@ -0,0 +1,202 @@
+import mysql.connector
+from typing import Optional, Dict, Any, List
+import logging
+from database import get_db_connection, close_db
+from config import DB_CONFIG
+from handlers.exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLUMNS = {
+    "pending": "pending_count",
+    "going": "going_count",
+    "maybe": "maybe_count",
+    "not_going": "not_going_count",
+}
+
+# Counter columns as they are selected alongside event rows
+RSVP_COUNT_SELECT = ", ".join(f"COALESCE(c.{column}, 0) AS {column}" for column in STATUS_COLUMNS.values())
+
+
+class MysqlRsvpCountRepository:
+    """Per-event attendance counters kept in step with event_attendees.
+
+    Write methods take the caller's connection so counters change in the same
+    transaction as the attendee rows they describe.
+    """
+
+    def increment(self, event_id: int, status: str, conn, amount: int = 1) -> None:
+        """Add `amount` attendees with `status` to an event's counters"""
+        column = STATUS_COLUMNS[status]
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                f"""
+                INSERT INTO event_rsvp_counts (event_id, {column}) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE {column} = {column} + VALUES({column})
+                """,
+                (event_id, amount)
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error incrementing RSVP count: {err}")
+            raise DatabaseException(f"Failed to update RSVP counts: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def initialize(self, event_ids: List[int], conn) -> None:
+        """Create the counters of newly created events, each with its organizer pending"""
+        if not event_ids:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.executemany(
+                "INSERT INTO event_rsvp_counts (event_id, pending_count) VALUES (%s, 1)",
+                [(event_id,) for event_id in event_ids]
+            )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error creating RSVP counts: {err}")
+            raise DatabaseException(f"Failed to create RSVP counts: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def apply_transition(self, event_id: int, old_status: str, new_status: str, conn) -> None:
+        """Move one attendee from `old_status` to `new_status`"""
+        if old_status == new_status:
+            return
+        old_column = STATUS_COLUMNS[old_status]
+        new_column = STATUS_COLUMNS[new_status]
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute(
+                f"""
+                UPDATE event_rsvp_counts
+                SET {old_column} = GREATEST({old_column} - 1, 0), {new_column} = {new_column} + 1
+                WHERE event_id = %s
+                """,
+                (event_id,)
+            )
+            if cursor.rowcount == 0:
+                # No counter row yet (event predates the counters); start from this change
+                cursor.execute(
+                    f"INSERT IGNORE INTO event_rsvp_counts (event_id, {new_column}) VALUES (%s, 1)",
+                    (event_id,)
+                )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error applying RSVP transition: {err}")
+            raise DatabaseException(f"Failed to update RSVP counts: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def apply_deltas(self, event_id: int, deltas: Dict[str, int], conn) -> None:
+        """Apply net per-status changes (e.g. {"pending": -3, "going": 3}) in one statement"""
+        deltas = {status: delta for status, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            assignments = ", ".join(
+                f"{STATUS_COLUMNS[status]} = GREATEST({STATUS_COLUMNS[status]} + %s, 0)" for status in deltas
+            )
+            cursor.execute(
+                f"UPDATE event_rsvp_counts SET {assignments} WHERE event_id = %s",
+                (*deltas.values(), event_id)
+            )
+            if cursor.rowcount == 0:
+                # No counter row yet (event predates the counters); start from these changes
+                gains = {STATUS_COLUMNS[status]: delta for status, delta in deltas.items() if delta > 0}
+                if gains:
+                    cursor.execute(
+                        f"INSERT IGNORE INTO event_rsvp_counts (event_id, {', '.join(gains)}) "
+                        f"VALUES (%s, {', '.join(['%s'] * len(gains))})",
+                        (event_id, *gains.values())
+                    )
+        except mysql.connector.Error as err:
+            logger.error(f"Database error applying RSVP deltas: {err}")
+            raise DatabaseException(f"Failed to update RSVP counts: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+
+    def reconcile(self, fix: bool = False, event_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recompute counters from event_attendees and return the events that drifted.
+
+        With `fix`, drifted counters are overwritten with the recomputed values.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+
+            event_filter = " AND e.id = %s" if event_id else ""
+            actual_columns = ", ".join(
+                f"SUM(attendance_status = '{status}') AS {status}" for status in STATUS_COLUMNS
+            )
+            comparisons = " OR ".join(
+                f"COALESCE(a.{status}, 0) <> COALESCE(c.{column}, -1)" for status, column in STATUS_COLUMNS.items()
+            )
+            cursor.execute(
+                f"""
+                SELECT
+                    e.id AS event_id,
+                    {", ".join(f"COALESCE(a.{status}, 0) AS actual_{status}" for status in STATUS_COLUMNS)},
+                    {", ".join(f"c.{column} AS stored_{status}" for status, column in STATUS_COLUMNS.items())}
+                FROM events e
+                LEFT JOIN (
+                    SELECT event_id, {actual_columns}
+                    FROM event_attendees
+                    GROUP BY event_id
+                ) a ON a.event_id = e.id
+                LEFT JOIN event_rsvp_counts c ON c.event_id = e.id
+                WHERE e.deleted_at IS NULL AND ({comparisons}){event_filter}
+                """,
+                (event_id,) if event_id else ()
+            )
+            drifted = list(cursor.fetchall() or [])
+
+            if fix and drifted:
+                ids = [row["event_id"] for row in drifted]
+                placeholders = ", ".join(["%s"] * len(ids))
+                cursor.execute(
+                    f"""
+                    INSERT INTO event_rsvp_counts (event_id, {", ".join(STATUS_COLUMNS.values())})
+                    SELECT e.id, {", ".join(f"COALESCE(SUM(ea.attendance_status = '{status}'), 0)" for status in STATUS_COLUMNS)}
+                    FROM events e
+                    LEFT JOIN event_attendees ea ON ea.event_id = e.id
+                    WHERE e.id IN ({placeholders})
+                    GROUP BY e.id
+                    ON DUPLICATE KEY UPDATE
+                        {", ".join(f"{column} = VALUES({column})" for column in STATUS_COLUMNS.values())}
+                    """,
+                    tuple(ids)
+                )
+                conn.commit()
+                logger.info(f"RSVP counts repaired for {len(ids)} events")
+
+            return drifted
+        except mysql.connector.Error as err:
+            if conn and fix:
+                conn.rollback()
+            logger.error(f"Database error reconciling RSVP counts: {err}")
+            raise DatabaseException(f"Failed to reconcile RSVP counts: {err.msg}")
+        except Exception as e:
+            if conn and fix:
+                conn.rollback()
+            logger.error(f"Unexpected error reconciling RSVP counts: {str(e)}")
+            raise DatabaseException("Failed to reconcile RSVP counts")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
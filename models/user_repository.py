@@ -1,7 +1,7 @@
 import mysql.connector
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Set
 import logging
-from database import get_db_connection, close_db
+from database import get_db_connection, close_db, get_connection_pool
 from config import DB_CONFIG
 from handlers.exceptions import DatabaseException, ConflictException
 
@@ -75,6 +75,29 @@ class UserRepository:
                 cursor.close()
             close_db(conn)
     
+    # Served entirely from idx_users_credentials, no clustered-index row read.
+    # The connector only re-prepares when handed a different string object, so always pass this one.
+    CREDENTIALS_QUERY = (
+        'SELECT id, name, email, password FROM users FORCE INDEX (idx_users_credentials) WHERE email = %s'
+    )
+
+    @staticmethod
+    def get_credentials_by_email(email: str) -> Optional[Dict[str, Any]]:
+        """Login lookup: only the credential columns, over a pooled connection and a prepared statement"""
+        try:
+            with get_connection_pool().connection() as pooled:
+                cursor = pooled.prepared(UserRepository.CREDENTIALS_QUERY)
+                cursor.execute(UserRepository.CREDENTIALS_QUERY, (email,))
+                rows = cursor.fetchall()
+            if not rows:
+                return None
+            user_id, name, user_email, password = rows[0]
+            return {'id': user_id, 'name': name, 'email': user_email, 'password': password}
+        
+        except mysql.connector.Error as err:
+            logger.error(f"Database error getting credentials: {err}")
+            raise DatabaseException(f"Failed to retrieve user: {err.msg}")
+    
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID with proper error handling"""
@@ -100,10 +123,219 @@ class UserRepository:
                 cursor.close()
             close_db(conn)
     
+    @staticmethod
+    def update_password(user_id: int, hashed_password: str, expected_hash: Optional[str] = None) -> bool:
+        """Replace a user's password hash, optionally only if it still equals `expected_hash`"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            if expected_hash is None:
+                cursor.execute('UPDATE users SET password = %s WHERE id = %s', (hashed_password, user_id))
+            else:
+                cursor.execute(
+                    'UPDATE users SET password = %s WHERE id = %s AND password = %s',
+                    (hashed_password, user_id, expected_hash)
+                )
+            conn.commit()
+            return cursor.rowcount > 0
+        
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error updating password: {err}")
+            raise DatabaseException(f"Failed to update password: {err.msg}")
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error updating password: {str(e)}")
+            raise DatabaseException("Failed to update password")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+    
+    @staticmethod
+    def get_existing_emails(emails: Iterable[str]) -> Set[str]:
+        """Return which of `emails` are already registered (lowercased)"""
+        emails = list(emails)
+        if not emails:
+            return set()
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(emails))
+            cursor.execute(f'SELECT email FROM users WHERE email IN ({placeholders})', tuple(emails))
+            return {row[0].lower() for row in cursor.fetchall() or []}
+        
+        except mysql.connector.Error as err:
+            logger.error(f"Database error checking existing emails: {err}")
+            raise DatabaseException(f"Failed to check emails: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+    
+    @staticmethod
+    def get_user_ids_by_emails(emails: Iterable[str]) -> Dict[str, int]:
+        """Resolve normalized emails to user ids with one lookup on the unique email index"""
+        emails = list(emails)
+        if not emails:
+            return {}
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(emails))
+            cursor.execute(f'SELECT email, id FROM users WHERE email IN ({placeholders})', tuple(emails))
+            return {row[0].lower(): row[1] for row in cursor.fetchall() or []}
+        
+        except mysql.connector.Error as err:
+            logger.error(f"Database error resolving emails: {err}")
+            raise DatabaseException(f"Failed to resolve emails: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+    
+    @staticmethod
+    def get_existing_user_ids(user_ids: Iterable[int], conn=None, lock: bool = False) -> Set[int]:
+        """Return which of `user_ids` exist; with `lock` (inside the caller's transaction)
+        they are share-locked so they cannot be deleted before the transaction ends"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        local_conn = conn or get_db_connection()
+        cursor = None
+        try:
+            cursor = local_conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            query = f'SELECT id FROM users WHERE id IN ({placeholders})'
+            if lock:
+                query += ' LOCK IN SHARE MODE'
+            cursor.execute(query, tuple(user_ids))
+            return {row[0] for row in cursor.fetchall() or []}
+        
+        except mysql.connector.Error as err:
+            logger.error(f"Database error checking user ids: {err}")
+            raise DatabaseException(f"Failed to check users: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            if conn is None:
+                close_db(local_conn)
+    
+    @staticmethod
+    def create_users_batch(users: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Insert a batch of users in one transaction, skipping emails already registered.
+
+        The emails are locked with SELECT ... FOR UPDATE first, so a concurrent
+        signup cannot claim one between the check and the multi-row INSERT.
+        Returns {"created": {email: user_id}, "conflicts": [email, ...]}.
+        """
+        if not users:
+            return {"created": {}, "conflicts": []}
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            emails = [user['email'] for user in users]
+            placeholders = ", ".join(["%s"] * len(emails))
+            cursor.execute(
+                f'SELECT email FROM users WHERE email IN ({placeholders}) FOR UPDATE',
+                tuple(emails)
+            )
+            existing = {row[0].lower() for row in cursor.fetchall() or []}
+            new_users = [user for user in users if user['email'] not in existing]
+
+            created = {}
+            if new_users:
+                cursor.executemany(
+                    'INSERT INTO users (name, email, password) VALUES (%s, %s, %s)',
+                    [(user['name'], user['email'], user['password']) for user in new_users]
+                )
+                # Auto-increment ids of a multi-row insert are not guaranteed consecutive
+                new_placeholders = ", ".join(["%s"] * len(new_users))
+                cursor.execute(
+                    f'SELECT id, email FROM users WHERE email IN ({new_placeholders})',
+                    tuple(user['email'] for user in new_users)
+                )
+                created = {email.lower(): user_id for user_id, email in cursor.fetchall() or []}
+            conn.commit()
+
+            logger.info(f"Batch import created {len(created)} users, skipped {len(existing)} existing")
+            return {"created": created, "conflicts": [email for email in emails if email in existing]}
+        
+        except mysql.connector.Error as err:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database error importing users: {err}")
+            raise DatabaseException(f"Failed to import users: {err.msg}")
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error importing users: {str(e)}")
+            raise DatabaseException("Failed to import users")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+    
     @staticmethod
     def user_exists(email: str) -> bool:
-        user = UserRepository.get_user_by_email(email)
-        return user is not None
+        """Existence check answered from the unique email index, without reading the row"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute('SELECT 1 FROM users WHERE email = %s LIMIT 1', (email,))
+            return cursor.fetchone() is not None
+        
+        except mysql.connector.Error as err:
+            logger.error(f"Database error checking user existence: {err}")
+            raise DatabaseException(f"Failed to check user: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
+
+    @staticmethod
+    def iter_emails(batch_size: int = 10000) -> Iterator[str]:
+        """Stream every registered email (used to build the signup Bloom filter)"""
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"USE {DB_CONFIG['database']}")
+            cursor.execute('SELECT email FROM users')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+        
+        except mysql.connector.Error as err:
+            logger.error(f"Database error reading emails: {err}")
+            raise DatabaseException(f"Failed to read emails: {err.msg}")
+        finally:
+            if cursor:
+                cursor.close()
+            close_db(conn)
 
     @staticmethod
     def get_all_users() -> List[Dict[str, Any]]:
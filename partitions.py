@@ -0,0 +1,79 @@
+"""Date-range partition layout of the event archive tables
+
+The archive tables are partitioned by RANGE COLUMNS on their date column.
+Each partition covers EVENT_PARTITION_MONTHS months (1 or 3) and is named
+after its first month (p2031m01) or quarter (p2031q1). `p_history` holds
+everything before EVENT_PARTITION_START and `p_future` (MAXVALUE) catches
+rows past the last boundary, so an insert never fails for lack of a
+partition. `manage.py add-event-partitions` splits new partitions off
+`p_future` ahead of time, while it is still empty and the split is cheap.
+"""
+from datetime import date
+from typing import List, Optional
+
+HISTORY_PARTITION = "p_history"
+FUTURE_PARTITION = "p_future"
+
+# Table -> partitioning column
+PARTITIONED_TABLES = {
+    "events_archive": "date",
+    "event_attendees_archive": "event_date",
+    "event_occurrence_overrides_archive": "occurrence_date",
+}
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month of `day`"""
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def period_start(day: date, months: int) -> date:
+    """First day of the partition period (month or quarter) containing `day`"""
+    return date(day.year, (day.month - 1) // months * months + 1, 1)
+
+
+def partition_name(start: date, months: int) -> str:
+    """Name of the partition whose range starts on `start`"""
+    if months == 3:
+        return f"p{start.year}q{(start.month - 1) // 3 + 1}"
+    return f"p{start.year}m{start.month:02d}"
+
+
+def bounds_to_add(last_bound: date, today: date, months: int, ahead_months: int) -> List[date]:
+    """Upper bounds of the partitions missing after `last_bound` so that the
+    partitions cover at least `ahead_months` past the current period"""
+    target = add_months(period_start(today, months), months + ahead_months)
+    bounds = []
+    bound = last_bound
+    while bound < target:
+        bound = add_months(bound, months)
+        bounds.append(bound)
+    return bounds
+
+
+def partition_definitions(last_bound: date, bounds: List[date], months: int) -> List[str]:
+    """PARTITION clauses for new bounds, followed by the MAXVALUE catch-all"""
+    clauses = []
+    start = last_bound
+    for bound in bounds:
+        clauses.append(f"PARTITION {partition_name(start, months)} VALUES LESS THAN ('{bound.isoformat()}')")
+        start = bound
+    clauses.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return clauses
+
+
+def initial_partitioning(column: str, start: date, months: int, today: date, ahead_months: int) -> str:
+    """PARTITION BY clause of a freshly partitioned archive table, with the
+    periods from `start` to `ahead_months` past `today` already created"""
+    start = period_start(start, months)
+    clauses = [f"PARTITION {HISTORY_PARTITION} VALUES LESS THAN ('{start.isoformat()}')"]
+    clauses += partition_definitions(start, bounds_to_add(start, today, months, ahead_months), months)
+    return f"PARTITION BY RANGE COLUMNS({column}) ({', '.join(clauses)})"
+
+
+def parse_bound(description: Optional[str]) -> Optional[date]:
+    """Boundary date from information_schema PARTITION_DESCRIPTION ('2031-01-01' or MAXVALUE)"""
+    if not description or description.upper() == "MAXVALUE":
+        return None
+    return date.fromisoformat(description.strip("'"))
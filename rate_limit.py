@@ -0,0 +1,228 @@
+"""Token-bucket rate limiting
+
+Each key (an email address, a client IP) owns a bucket of `capacity` tokens
+refilled continuously at `refill_per_second`. An attempt takes one token;
+an empty bucket rejects with the time until the next token is available.
+
+Buckets are stored as (tokens, last_update) and refilled lazily when
+touched, so every check is O(1). The in-memory limiter keeps at most
+`max_keys` buckets in LRU order: dropping a bucket only forgets a client's
+debt, and the per-IP bucket still bounds anyone spraying new keys.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import metrics
+from config import (
+    LOGIN_RATE_LIMIT_ENABLED,
+    LOGIN_RATE_LIMIT_BACKEND,
+    LOGIN_RATE_LIMIT_REDIS_URL,
+    LOGIN_EMAIL_BURST,
+    LOGIN_EMAIL_PER_MINUTE,
+    LOGIN_IP_BURST,
+    LOGIN_IP_PER_MINUTE,
+    LOGIN_RATE_LIMIT_MAX_KEYS,
+    CACHE_KEY_PREFIX
+)
+from executors import run_in
+from handlers.exceptions import RateLimitException
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+def _refill(tokens: float, updated_at: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+class TokenBucketLimiter:
+    """Base limiter; `consume` returns (allowed, seconds until a retry can succeed)"""
+
+    # Backends doing network I/O are called from the db pool instead of the event loop
+    blocking = False
+
+    def __init__(self, capacity: int, refill_per_second: float):
+        if capacity < 1 or refill_per_second <= 0:
+            raise ValueError("Token bucket needs capacity >= 1 and a positive refill rate")
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    def consume(self, key: str, cost: int = 1) -> Tuple[bool, float]:
+        raise NotImplementedError
+
+    def _retry_after(self, tokens: float, cost: int) -> float:
+        return (cost - tokens) / self.refill_per_second
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemoryTokenBucketLimiter(TokenBucketLimiter):
+    """Per-process buckets in an LRU-bounded OrderedDict"""
+
+    def __init__(self, capacity: int, refill_per_second: float, max_keys: int = LOGIN_RATE_LIMIT_MAX_KEYS):
+        super().__init__(capacity, refill_per_second)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+        self._evicted = 0
+
+    def consume(self, key: str, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = float(self.capacity)
+            else:
+                tokens = _refill(bucket[0], bucket[1], now, self.capacity, self.refill_per_second)
+                self._buckets.move_to_end(key)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+                self._allowed += 1
+            else:
+                self._rejected += 1
+            self._buckets[key] = (tokens, now)
+
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self._evicted += 1
+        return allowed, 0.0 if allowed else self._retry_after(tokens, cost)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+                "evicted": self._evicted,
+            }
+
+
+class RedisTokenBucketLimiter(TokenBucketLimiter):
+    """Buckets shared by all workers, updated with an optimistic WATCH/MULTI transaction"""
+
+    blocking = True
+
+    def __init__(self, capacity: int, refill_per_second: float, url: str = LOGIN_RATE_LIMIT_REDIS_URL,
+                 client=None, prefix: str = CACHE_KEY_PREFIX + "ratelimit:"):
+        super().__init__(capacity, refill_per_second)
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The 'redis' package is required for the redis rate limit backend")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        # A bucket left alone this long is full again, so Redis can drop it
+        self._idle_ttl_ms = int(math.ceil(capacity / refill_per_second * 1000))
+
+    def consume(self, key: str, cost: int = 1) -> Tuple[bool, float]:
+        redis_key = self.prefix + key
+        outcome = {}
+
+        def update(pipe) -> None:
+            now = time.time()
+            stored_tokens, stored_at = pipe.hmget(redis_key, "tokens", "ts")
+            if stored_tokens is None:
+                tokens = float(self.capacity)
+            else:
+                tokens = _refill(float(stored_tokens), float(stored_at), now, self.capacity, self.refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            pipe.multi()
+            pipe.hset(redis_key, mapping={"tokens": tokens, "ts": now})
+            pipe.pexpire(redis_key, self._idle_ttl_ms)
+            outcome["allowed"] = allowed
+            outcome["tokens"] = tokens
+
+        self.client.transaction(update, redis_key)
+        allowed = outcome["allowed"]
+        return allowed, 0.0 if allowed else self._retry_after(outcome["tokens"], cost)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+def create_limiter(capacity: int, refill_per_second: float,
+                   backend: str = LOGIN_RATE_LIMIT_BACKEND) -> TokenBucketLimiter:
+    """Build a limiter on the configured backend"""
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return InMemoryTokenBucketLimiter(capacity, refill_per_second)
+    if backend == "redis":
+        return RedisTokenBucketLimiter(capacity, refill_per_second)
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+class LoginThrottle:
+    """Per-IP and per-email budgets for login attempts.
+
+    Checked before the user lookup and bcrypt verification, so a burst of
+    guesses costs one dictionary (or Redis) update each instead of a hash.
+    """
+
+    def __init__(self, email_limiter: TokenBucketLimiter, ip_limiter: TokenBucketLimiter):
+        self.email_limiter = email_limiter
+        self.ip_limiter = ip_limiter
+
+    def check(self, email: str, client_ip: Optional[str]) -> None:
+        """Take one token from each bucket, raising RateLimitException (429) when empty"""
+        # IP first: a client spraying addresses should not drain other users' email buckets
+        if client_ip:
+            allowed, retry_after = self.ip_limiter.consume(f"ip:{client_ip}")
+            if not allowed:
+                self._reject(f"IP {client_ip}", retry_after)
+        allowed, retry_after = self.email_limiter.consume(f"email:{email.strip().lower()}")
+        if not allowed:
+            self._reject("email", retry_after)
+
+    async def check_async(self, email: str, client_ip: Optional[str]) -> None:
+        """`check` from a handler; shared backends run in the db pool to keep the loop free"""
+        if self.email_limiter.blocking or self.ip_limiter.blocking:
+            await run_in("db", self.check, email, client_ip)
+        else:
+            self.check(email, client_ip)
+
+    def _reject(self, scope: str, retry_after: float) -> None:
+        logger.warning(f"Login attempts throttled by {scope}")
+        raise RateLimitException(
+            "Too many login attempts, please retry later",
+            retry_after=max(1, int(math.ceil(retry_after)))
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"email": self.email_limiter.stats(), "ip": self.ip_limiter.stats()}
+
+
+_login_throttle: Optional[LoginThrottle] = None
+_login_throttle_lock = threading.Lock()
+
+
+def get_login_throttle() -> Optional[LoginThrottle]:
+    """Return the process-wide login throttle, or None when disabled"""
+    global _login_throttle
+    if not LOGIN_RATE_LIMIT_ENABLED:
+        return None
+    if _login_throttle is None:
+        with _login_throttle_lock:
+            if _login_throttle is None:
+                _login_throttle = LoginThrottle(
+                    email_limiter=create_limiter(LOGIN_EMAIL_BURST, LOGIN_EMAIL_PER_MINUTE / 60),
+                    ip_limiter=create_limiter(LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60),
+                )
+                metrics.register("rate_limit.login", _login_throttle.stats)
+    return _login_throttle
@@ -0,0 +1,148 @@
+"""Lazy expansion of recurring events
+
+A series is one events row carrying a rule (weekly or monthly, every
+`interval` periods, bounded by an until date and/or a count) whose `date` is
+the first occurrence. Occurrences are never stored: they are computed on
+read, only inside the requested date window. The index of the first
+occurrence in the window is computed directly, so a series that started
+years ago costs nothing for the occurrences before the window.
+
+Monthly series falling on a day a month does not have (the 31st, Feb 29)
+are moved to that month's last day, so every period has exactly one
+occurrence and the count bound is exact.
+"""
+import heapq
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+RECURRENCE_FREQUENCIES = ("weekly", "monthly")
+
+
+def _months_between(start: date, later: date) -> int:
+    return (later.year - start.year) * 12 + later.month - start.month
+
+
+def nth_occurrence(start: date, freq: str, interval: int, index: int) -> date:
+    """Date of occurrence `index` (0 is the series start)"""
+    if freq == "weekly":
+        return start + timedelta(weeks=interval * index)
+    month_index = start.month - 1 + interval * index
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(start.day, monthrange(year, month)[1]))
+
+
+def iter_occurrences(
+    start: date,
+    freq: Optional[str],
+    interval: int = 1,
+    until: Optional[date] = None,
+    count: Optional[int] = None,
+    window_start: Optional[date] = None,
+    window_end: Optional[date] = None,
+    descending: bool = False
+) -> Iterator[date]:
+    """Yield the occurrence dates that fall inside [window_start, window_end].
+
+    A one-off event (`freq` None) yields its own date when it is in the
+    window. A series must be bounded by `until`, `count` or `window_end`.
+    """
+    low = max(start, window_start) if window_start else start
+    if freq is None:
+        if low <= start and (window_end is None or start <= window_end):
+            yield start
+        return
+    if freq not in RECURRENCE_FREQUENCIES:
+        raise ValueError(f"Unknown recurrence frequency: {freq}")
+
+    bounds = [d for d in (until, window_end) if d is not None]
+    if not bounds and count is None:
+        raise ValueError("Expanding an unbounded series needs a window end")
+    high = min(bounds) if bounds else None
+
+    if freq == "weekly":
+        step = 7 * interval
+        first = -(-(low - start).days // step)
+        last = (high - start).days // step if high else None
+    else:
+        # Day clamping can move an occurrence before `low`; the date check below drops it
+        first = _months_between(start, low) // interval
+        last = _months_between(start, high) // interval if high else None
+    if count is not None:
+        last = count - 1 if last is None else min(last, count - 1)
+    if last < first:
+        return
+
+    indexes = range(last, first - 1, -1) if descending else range(first, last + 1)
+    for index in indexes:
+        occurrence = nth_occurrence(start, freq, interval, index)
+        if occurrence >= low and (high is None or occurrence <= high):
+            yield occurrence
+
+
+def _event_occurrences(event: Dict[str, Any], window_start: Optional[date],
+                       window_end: Optional[date]) -> Iterator[Dict[str, Any]]:
+    for occurrence in iter_occurrences(
+        event["date"],
+        event.get("recurrence_freq"),
+        event.get("recurrence_interval") or 1,
+        until=event.get("recurrence_until"),
+        count=event.get("recurrence_count"),
+        window_start=window_start,
+        window_end=window_end,
+        descending=True
+    ):
+        yield {**event, "date": occurrence, "occurrence_date": occurrence}
+
+
+def expand_events(
+    events: Iterable[Dict[str, Any]],
+    window_start: Optional[date],
+    window_end: Optional[date],
+    horizon: Optional[date] = None,
+    limit: Optional[int] = None,
+    series_limit: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Merge one-off events and series occurrences in the window, newest date first.
+
+    One-off events keep their row; each occurrence is a copy of its series
+    row with `date` and `occurrence_date` set to the occurrence. Without a
+    `window_end`, series are expanded up to `horizon`. Each series yields at
+    most its newest `series_limit` occurrences; one-off events are never
+    capped by it. The series are merged lazily by heapq.merge, so only the
+    first `limit` results are generated.
+    """
+    series_end = window_end or horizon
+    one_off: List[Dict[str, Any]] = []
+    streams = []
+    for event in events:
+        if event.get("recurrence_freq"):
+            streams.append(islice(_event_occurrences(event, window_start, series_end), series_limit))
+        elif (window_start is None or event["date"] >= window_start) and (window_end is None or event["date"] <= window_end):
+            one_off.append(event)
+    one_off.sort(key=lambda e: e["date"], reverse=True)
+    merged = heapq.merge(one_off, *streams, key=lambda e: e["date"], reverse=True)
+    return islice(merged, limit) if limit is not None else merged
+
+
+def last_occurrence(event: Dict[str, Any]) -> Optional[date]:
+    """Date of the final occurrence, or None for a series without an end"""
+    if not event.get("recurrence_freq"):
+        return event["date"]
+    if event.get("recurrence_until") is None and event.get("recurrence_count") is None:
+        return None
+    final = iter_occurrences(
+        event["date"],
+        event["recurrence_freq"],
+        event.get("recurrence_interval") or 1,
+        until=event.get("recurrence_until"),
+        count=event.get("recurrence_count"),
+        descending=True
+    )
+    return next(final, event["date"])
+
+
+def is_occurrence(event: Dict[str, Any], occurrence_date: date) -> bool:
+    """Whether a series has an occurrence on `occurrence_date`"""
+    return any(_event_occurrences(event, occurrence_date, occurrence_date))
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, status, Query, Depends, UploadFile, File
+from typing import Optional
+from dto.schemas import UserImportResponse, ErrorResponse
+from services.user_import_service import UserImportService, parse_user_import, IMPORT_FORMATS
+from security import require_admin
+from handlers.exceptions import EventPlannerException
+from executors import run_in
+
+user_import_service = UserImportService()
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+@router.post(
+    "/users/import",
+    response_model=UserImportResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Unreadable file or too many rows"},
+        401: {"model": ErrorResponse, "description": "Invalid admin key"},
+        403: {"model": ErrorResponse, "description": "Admin API disabled"},
+        500: {"model": ErrorResponse, "description": "Server error"},
+        503: {"model": ErrorResponse, "description": "Too many imports running"}
+    }
+)
+async def import_users(
+    file: UploadFile = File(..., description="CSV with a name,email,password header, or a JSON array"),
+    format: Optional[str] = Query(None, description="'csv' or 'json'; defaults to the file extension")
+):
+    """Create many users at once; duplicates and invalid rows are reported per row"""
+    try:
+        fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+        if fmt not in IMPORT_FORMATS and file.content_type:
+            fmt = "json" if "json" in file.content_type else "csv" if "csv" in file.content_type else fmt
+        rows = parse_user_import(await file.read(), fmt)
+        # Hashing thousands of passwords takes a while; runs on the bounded import pool
+        result = await run_in("import", user_import_service.import_users, rows)
+        return UserImportResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
@@ -1,11 +1,19 @@
-from fastapi import APIRouter, HTTPException, status, Query
-from typing import List
-from dto.schemas import SignUpRequest, LoginRequest, UserResponse, LoginResponse, ErrorResponse, UserInfo
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response, Request
+from typing import List, Optional
+from dto.schemas import SignUpRequest, LoginRequest, UserResponse, LoginResponse, ErrorResponse, UserInfo, TokenRefreshRequest, TokenResponse, LogoutRequest
 from services.auth_service import AuthService
+from services.token_service import TokenService
 from models.user_repository import UserRepository
-from security import create_access_token
+from security import create_access_token, get_current_token, VerifiedToken
+from token_revocation import get_revocation_store
+from handlers.exceptions import EventPlannerException
+from executors import run_in
+from rate_limit import get_login_throttle
+from config import LOGIN_RATE_LIMIT_TRUST_FORWARDED
 
 auth_service = AuthService(UserRepository())
+token_service = TokenService()
+login_throttle = get_login_throttle()
 user_repository = UserRepository()
 router = APIRouter(tags=["Authentication"])
 
@@ -16,12 +24,13 @@ router = APIRouter(tags=["Authentication"])
     responses={
         400: {"model": ErrorResponse, "description": "Invalid input"},
         409: {"model": ErrorResponse, "description": "Email already registered"},
-        500: {"model": ErrorResponse, "description": "Server error"}
+        500: {"model": ErrorResponse, "description": "Server error"},
+        503: {"model": ErrorResponse, "description": "Password hashing pool saturated"}
     }
 )
 async def signup(request: SignUpRequest):
     try:
-        user = auth_service.signup(request.name, request.email, request.password)
+        user = await auth_service.signup(request.name, request.email, request.password)
         return UserResponse(
             user_id=user['user_id'],
             name=user['name'],
@@ -29,6 +38,10 @@ async def signup(request: SignUpRequest):
             message="User registered successfully"
         )
     
+    except EventPlannerException:
+        # Handled by the registered exception handler (401/409/503, ...)
+        raise
+
     except ValueError as e:
         if "already registered" in str(e):
             raise HTTPException(
@@ -46,27 +59,44 @@ async def signup(request: SignUpRequest):
             detail=str(e)
         )
 
+def _client_ip(http_request: Request) -> Optional[str]:
+    if LOGIN_RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = http_request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return http_request.client.host if http_request.client else None
+
 @router.post(
     "/login",
     response_model=LoginResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid input"},
         401: {"model": ErrorResponse, "description": "Invalid credentials"},
-        500: {"model": ErrorResponse, "description": "Server error"}
+        429: {"model": ErrorResponse, "description": "Too many login attempts for this email or IP"},
+        500: {"model": ErrorResponse, "description": "Server error"},
+        503: {"model": ErrorResponse, "description": "Password hashing pool saturated"}
     }
 )
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, http_request: Request):
     try:
-        user = auth_service.login(request.email, request.password)
+        # Throttle before the user lookup and bcrypt verification
+        if login_throttle is not None:
+            await login_throttle.check_async(request.email, _client_ip(http_request))
+        user = await auth_service.login(request.email, request.password)
         token = create_access_token(user_id=user['user_id'])
+        refresh_token = await run_in("db", token_service.issue_refresh_token, user['user_id'])
         return LoginResponse(
             user_id=user['user_id'],
             name=user['name'],
             email=user['email'],
             token=token,
+            refresh_token=refresh_token,
             message="Login successful"
         )
     
+    except EventPlannerException:
+        raise
+
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -79,6 +109,44 @@ async def login(request: LoginRequest):
             detail=str(e)
         )
 
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        401: {"model": ErrorResponse, "description": "Missing, invalid, expired or already revoked token"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    }
+)
+async def logout(body: Optional[LogoutRequest] = None, token: VerifiedToken = Depends(get_current_token)):
+    """Revoke the bearer token used for this request, and optionally its refresh token"""
+    # The refresh token is checked first: one belonging to another user rejects the whole logout
+    if body and body.refresh_token:
+        await run_in("db", token_service.revoke_refresh_token, body.refresh_token, token.user_id)
+    if token.jti:
+        await run_in("db", get_revocation_store().revoke, token.jti, token.exp)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.post(
+    "/token/refresh",
+    response_model=TokenResponse,
+    responses={
+        401: {"model": ErrorResponse, "description": "Refresh token invalid, expired or already used"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    }
+)
+async def refresh_token(request: TokenRefreshRequest):
+    """Issue a new access token and rotate the refresh token, without a password check"""
+    try:
+        result = await run_in("db", token_service.refresh, request.refresh_token)
+        return TokenResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
 @router.get(
     "/users",
     response_model=List[UserInfo],
@@ -89,7 +157,7 @@ async def login(request: LoginRequest):
 async def get_all_users():
     """Get all registered users"""
     try:
-        users = user_repository.get_all_users()
+        users = await run_in("db", user_repository.get_all_users)
         return [
             UserInfo(
                 id=user['id'],
@@ -99,6 +167,8 @@ async def get_all_users():
             for user in users
         ]
     
+    except EventPlannerException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -116,7 +186,7 @@ async def get_all_users():
 async def get_current_user(user_id: int = Query(..., description="Current logged-in user's ID")):
     """Get the currently logged-in user's information"""
     try:
-        user = user_repository.get_user_by_id(user_id)
+        user = await run_in("db", user_repository.get_user_by_id, user_id)
         
         if not user:
             raise HTTPException(
@@ -130,7 +200,7 @@ async def get_current_user(user_id: int = Query(..., description="Current logged
             email=user['email']
         )
     
-    except HTTPException:
+    except (HTTPException, EventPlannerException):
         raise
     except Exception as e:
         raise HTTPException(
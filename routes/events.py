@@ -1,81 +1,181 @@
-from fastapi import APIRouter, HTTPException, status, Response, Query
+from fastapi import APIRouter, HTTPException, status, Response, Query, Header, UploadFile, File
 from typing import List, Optional
 from datetime import date as Date
-from dto.schemas import EventCreateRequest, EventResponse, InviteRequest, Attendee, AttendanceStatusUpdate, InvitationInfo
+import io
+from dto.schemas import EventCreateRequest, EventResponse, InviteRequest, BulkInviteRequest, BulkInviteResponse, Attendee, AttendanceStatusUpdate, BulkAttendanceUpdateRequest, BulkAttendanceResponse, EventImportResponse, RecurrenceRule, OccurrenceAttendanceResponse, EventDeletionStatus, BulkEventIdsRequest, BulkEventResponse, InvitationInfo, FeedItem, RsvpCounts
 from services.event_service import EventService
+from services.event_import_service import EventImportService, iter_event_rows, EVENT_IMPORT_FORMATS
+from services.event_archive_service import EventArchiveService
+from cache import get_cache
+from executors import run_in
+from config import ATTENDANCE_WRITE_BEHIND_ENABLED
+from handlers.exceptions import EventPlannerException
 
 router = APIRouter(prefix="/events", tags=["Events"])
-event_service = EventService()
+event_service = EventService(cache=get_cache(), write_behind=ATTENDANCE_WRITE_BEHIND_ENABLED)
+event_import_service = EventImportService(cache=get_cache())
+event_archive_service = EventArchiveService(cache=get_cache())
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against the current ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+def _event_response(e) -> EventResponse:
+    attendees = [Attendee(user_id=a["user_id"], role=a["role"], attendance_status=a.get("attendance_status", "pending")) for a in e.get("attendees", [])]
+    return EventResponse(
+        id=e["id"],
+        title=e["title"],
+        date=e["date"],
+        time=e["time"],
+        location=e["location"],
+        description=e.get("description"),
+        organizer_user_id=e["organizer_user_id"],
+        attendees=attendees,
+        rsvp_counts=RsvpCounts(
+            pending=e.get("pending_count") or 0,
+            going=e.get("going_count") or 0,
+            maybe=e.get("maybe_count") or 0,
+            not_going=e.get("not_going_count") or 0
+        ),
+        recurrence=RecurrenceRule(
+            freq=e["recurrence_freq"],
+            interval=e.get("recurrence_interval") or 1,
+            until=e.get("recurrence_until"),
+            count=e.get("recurrence_count")
+        ) if e.get("recurrence_freq") else None,
+        occurrence_date=e.get("occurrence_date")
+    )
 
 @router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
-def create_event(request: EventCreateRequest, user_id: int = Query(..., description="User ID of the event creator")):
+async def create_event(request: EventCreateRequest, user_id: int = Query(..., description="User ID of the event creator")):
     try:
-        event = event_service.create_event(
+        event = await run_in("db", event_service.create_event,
             user_id=user_id,
             title=request.title,
             date_value=request.date,
             time_value=request.time,
             location=request.location,
-            description=request.description
-        )
-        # Coerce attendees to response model shape
-        attendees = [Attendee(user_id=a["user_id"], role=a["role"], attendance_status=a.get("attendance_status", "pending")) for a in event.get("attendees", [])]
-        return EventResponse(
-            id=event["id"],
-            title=event["title"],
-            date=event["date"],
-            time=event["time"],
-            location=event["location"],
-            description=event.get("description"),
-            organizer_user_id=event["organizer_user_id"],
-            attendees=attendees
+            description=request.description,
+            recurrence_freq=request.recurrence.freq if request.recurrence else None,
+            recurrence_interval=request.recurrence.interval if request.recurrence else None,
+            recurrence_until=request.recurrence.until if request.recurrence else None,
+            recurrence_count=request.recurrence.count if request.recurrence else None
         )
+        return _event_response(event)
+    except EventPlannerException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.post("/import", response_model=EventImportResponse)
+async def import_events(
+    user_id: int = Query(..., description="User ID of the organizer of the imported events"),
+    file: UploadFile = File(..., description="CSV with a title,date,time,location[,description] header, or an .ics calendar"),
+    format: Optional[str] = Query(None, description="'csv' or 'ics'; defaults to the file extension")
+):
+    """Create many events at once from a CSV or iCalendar file; invalid rows are reported per row"""
+    try:
+        fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+        if fmt not in EVENT_IMPORT_FORMATS and file.content_type:
+            fmt = "ics" if "calendar" in file.content_type else "csv" if "csv" in file.content_type else fmt
+        # Decoded and parsed line by line while the batches are written, never read whole
+        lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        result = await run_in("import", event_import_service.import_events, user_id, iter_event_rows(lines, fmt))
+        return EventImportResponse(**result)
+    except EventPlannerException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/organized", response_model=List[EventResponse])
-def get_organized_events(user_id: int = Query(..., description="User ID to get organized events for")):
-    events = event_service.get_organized_events(user_id)
-    response: List[EventResponse] = []
-    for e in events:
-        attendees = [Attendee(user_id=a["user_id"], role=a["role"], attendance_status=a.get("attendance_status", "pending")) for a in e.get("attendees", [])]
-        response.append(EventResponse(
-            id=e["id"],
-            title=e["title"],
-            date=e["date"],
-            time=e["time"],
-            location=e["location"],
-            description=e.get("description"),
-            organizer_user_id=e["organizer_user_id"],
-            attendees=attendees
-        ))
-    return response
+async def get_organized_events(
+    response: Response,
+    user_id: int = Query(..., description="User ID to get organized events for"),
+    start_date: Optional[Date] = Query(None, description="Only events on or after this date; expands recurring series"),
+    end_date: Optional[Date] = Query(None, description="Only events on or before this date; expands recurring series"),
+    if_none_match: Optional[str] = Header(None)
+):
+    etag = await run_in("db", event_service.get_organized_events_etag, user_id, start_date, end_date)
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    events = await run_in("db", event_service.get_organized_events, user_id, start_date, end_date, etag)
+    return [_event_response(e) for e in events]
 
 @router.get("/invited", response_model=List[EventResponse])
-def get_invited_events(user_id: int = Query(..., description="User ID to get invited events for")):
-    events = event_service.get_invited_events(user_id)
-    response: List[EventResponse] = []
-    for e in events:
-        attendees = [Attendee(user_id=a["user_id"], role=a["role"], attendance_status=a.get("attendance_status", "pending")) for a in e.get("attendees", [])]
-        response.append(EventResponse(
-            id=e["id"],
-            title=e["title"],
-            date=e["date"],
-            time=e["time"],
-            location=e["location"],
-            description=e.get("description"),
-            organizer_user_id=e["organizer_user_id"],
-            attendees=attendees
-        ))
-    return response
+async def get_invited_events(
+    response: Response,
+    user_id: int = Query(..., description="User ID to get invited events for"),
+    start_date: Optional[Date] = Query(None, description="Only events on or after this date; expands recurring series"),
+    end_date: Optional[Date] = Query(None, description="Only events on or before this date; expands recurring series"),
+    if_none_match: Optional[str] = Header(None)
+):
+    etag = await run_in("db", event_service.get_invited_events_etag, user_id, start_date, end_date)
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    events = await run_in("db", event_service.get_invited_events, user_id, start_date, end_date, etag)
+    return [_event_response(e) for e in events]
+
+@router.get("/feed", response_model=List[FeedItem])
+async def get_user_feed(
+    user_id: int = Query(..., description="User ID to get the event feed for"),
+    start_date: Optional[Date] = Query(None, description="Only events on or after this date (YYYY-MM-DD)"),
+    end_date: Optional[Date] = Query(None, description="Only events on or before this date (YYYY-MM-DD)"),
+    role: Optional[str] = Query(None, description="Filter by role: 'organizer' or 'attendee'"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of events to return")
+):
+    """All events the user organizes or is invited to, newest date first"""
+    try:
+        items = await run_in("db", event_service.get_user_feed,
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            role=role,
+            limit=limit
+        )
+        return [
+            FeedItem(
+                event_id=item["event_id"],
+                title=item["title"],
+                date=item["event_date"],
+                role=item["role"],
+                attendance_status=item.get("attendance_status") or "pending"
+            )
+            for item in items
+        ]
+    except EventPlannerException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.post("/{event_id}/invite", status_code=status.HTTP_201_CREATED)
-def invite_user(event_id: int, body: InviteRequest, inviter_id: int = Query(..., description="User ID of the inviter")):
+async def invite_user(event_id: int, body: InviteRequest, inviter_id: int = Query(..., description="User ID of the inviter")):
     try:
-        result = event_service.invite_user(event_id=event_id, inviter_id=inviter_id, invited_user_id=body.userId)
+        result = await run_in("db", event_service.invite_user, event_id=event_id, inviter_id=inviter_id, invited_user_id=body.userId)
         return result
+    except EventPlannerException:
+        raise
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except ValueError as e:
@@ -83,11 +183,24 @@ def invite_user(event_id: int, body: InviteRequest, inviter_id: int = Query(...,
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+@router.post("/{event_id}/invite/bulk", response_model=BulkInviteResponse)
+async def invite_users_bulk(event_id: int, body: BulkInviteRequest, inviter_id: int = Query(..., description="User ID of the inviter")):
+    """Invite many users at once, by id and/or email; each one gets its own outcome instead of failing the request"""
+    try:
+        result = await run_in("db", event_service.invite_users_bulk, event_id=event_id, inviter_id=inviter_id, user_ids=body.user_ids, emails=body.emails)
+        return BulkInviteResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event(event_id: int, user_id: int = Query(..., description="User ID of the event owner")):
+async def delete_event(event_id: int, user_id: int = Query(..., description="User ID of the event owner")):
     try:
-        event_service.delete_event(event_id=event_id, user_id=user_id)
+        await run_in("db", event_service.delete_event, event_id=event_id, user_id=user_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
+    except EventPlannerException:
+        raise
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except ValueError as e:
@@ -96,12 +209,58 @@ def delete_event(event_id: int, user_id: int = Query(..., description="User ID o
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+@router.post("/bulk-delete", response_model=BulkEventResponse)
+async def delete_events_bulk(body: BulkEventIdsRequest, user_id: int = Query(..., description="User ID of the events' owner")):
+    """Delete many events at once; ids that are unknown or owned by someone else are reported, not fatal"""
+    try:
+        result = await run_in("db", event_service.delete_events_bulk, organizer_id=user_id, event_ids=body.event_ids)
+        return BulkEventResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.post("/bulk-archive", response_model=BulkEventResponse)
+async def archive_events_bulk(body: BulkEventIdsRequest, response: Response, user_id: int = Query(..., description="User ID of the events' owner")):
+    """Move many past events to the archive; large sets are archived by a background job (202)"""
+    try:
+        result = await run_in("db", event_archive_service.archive_events_bulk, organizer_id=user_id, event_ids=body.event_ids)
+        if result["scheduled"]:
+            response.status_code = status.HTTP_202_ACCEPTED
+        return BulkEventResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.get("/{event_id}/deletion", response_model=EventDeletionStatus)
+async def get_event_deletion(event_id: int, user_id: int = Query(..., description="User ID of the event owner")):
+    """Progress of the background purge of a deleted event"""
+    try:
+        result = await run_in("db", event_service.purge_service.get_deletion_status, event_id=event_id, user_id=user_id)
+        return EventDeletionStatus(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
 @router.get("/{event_id}/attendees", response_model=List[Attendee])
-def get_event_attendees(event_id: int, user_id: int = Query(..., description="User ID (typically organizer)")):
+async def get_event_attendees(
+    event_id: int,
+    response: Response,
+    user_id: int = Query(..., description="User ID (typically organizer)"),
+    if_none_match: Optional[str] = Header(None)
+):
     """Get list of all attendees and their statuses for a specific event"""
     try:
-        attendees = event_service.get_event_attendees(event_id=event_id, requesting_user_id=user_id)
+        etag = await run_in("db", event_service.get_event_attendees_etag, event_id=event_id, requesting_user_id=user_id)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
+        attendees = await run_in("db", event_service.get_event_attendees, event_id=event_id, requesting_user_id=user_id, as_of=etag)
         return [Attendee(user_id=a["user_id"], role=a["role"], attendance_status=a.get("attendance_status", "pending")) for a in attendees]
+    except EventPlannerException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except PermissionError as e:
@@ -110,18 +269,53 @@ def get_event_attendees(event_id: int, user_id: int = Query(..., description="Us
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.put("/{event_id}/attendance", status_code=status.HTTP_200_OK)
-def update_attendance_status(event_id: int, body: AttendanceStatusUpdate, user_id: int = Query(..., description="User ID of the attendee")):
-    """Update attendance status for an event (Going, Maybe, Not Going)"""
+async def update_attendance_status(event_id: int, body: AttendanceStatusUpdate, user_id: int = Query(..., description="User ID of the attendee")):
+    """Update attendance status for an event (Going, Maybe, Not Going)
+
+    With attendance write-behind enabled the response has "queued": true and
+    reads show the new status after the next flush, within
+    ATTENDANCE_WRITE_BEHIND_INTERVAL_MS.
+    """
     try:
-        result = event_service.update_attendance_status(event_id=event_id, user_id=user_id, status=body.status)
+        result = await run_in("db", event_service.update_attendance_status, event_id=event_id, user_id=user_id, status=body.status)
         return result
+    except EventPlannerException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+@router.put("/{event_id}/attendance/bulk", response_model=BulkAttendanceResponse)
+async def update_attendance_statuses_bulk(event_id: int, body: BulkAttendanceUpdateRequest, user_id: int = Query(..., description="User ID of the organizer")):
+    """Set many attendees' statuses in one transaction; each user gets its own outcome"""
+    try:
+        result = await run_in(
+            "db", event_service.update_attendance_statuses_bulk,
+            event_id=event_id, organizer_id=user_id, updates=[{"user_id": item.user_id, "status": item.status} for item in body.updates]
+        )
+        return BulkAttendanceResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.put("/{event_id}/occurrences/{occurrence_date}/attendance", response_model=OccurrenceAttendanceResponse)
+async def update_occurrence_attendance(event_id: int, occurrence_date: Date, body: AttendanceStatusUpdate, user_id: int = Query(..., description="User ID of the attendee")):
+    """Update attendance for a single occurrence of a recurring event"""
+    try:
+        result = await run_in(
+            "db", event_service.update_occurrence_attendance,
+            event_id=event_id, occurrence_date=occurrence_date, user_id=user_id, status=body.status
+        )
+        return OccurrenceAttendanceResponse(**result)
+    except EventPlannerException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
 @router.get("/search", response_model=List[EventResponse])
-def search_events(
+async def search_events(
     user_id: int = Query(..., description="User ID performing the search"),
     keyword: Optional[str] = Query(None, description="Search keyword for event title or description"),
     start_date: Optional[Date] = Query(None, description="Start date for date range filter (YYYY-MM-DD)"),
@@ -133,13 +327,13 @@ def search_events(
     """
     Advanced search for events with multiple filter options:
     - keyword: Search in event title and description
-    - start_date/end_date: Filter by date range
+    - start_date/end_date: Filter by date range; recurring series are returned as their occurrences in the range
     - role: Filter by user's role (organizer or attendee)
     - location: Filter by event location
     - attendance_status: Filter by user's attendance status
     """
     try:
-        events = event_service.search_events(
+        events = await run_in("db", event_service.search_events,
             user_id=user_id,
             keyword=keyword,
             start_date=start_date,
@@ -149,30 +343,19 @@ def search_events(
             attendance_status=attendance_status
         )
         
-        response: List[EventResponse] = []
-        for e in events:
-            attendees = [Attendee(user_id=a["user_id"], role=a["role"], attendance_status=a.get("attendance_status", "pending")) for a in e.get("attendees", [])]
-            response.append(EventResponse(
-                id=e["id"],
-                title=e["title"],
-                date=e["date"],
-                time=e["time"],
-                location=e["location"],
-                description=e.get("description"),
-                organizer_user_id=e["organizer_user_id"],
-                attendees=attendees
-            ))
-        return response
+        return [_event_response(e) for e in events]
+    except EventPlannerException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/invitations/sent", response_model=List[InvitationInfo])
-def get_my_invitations(user_id: int = Query(..., description="Organizer's user ID")):
+async def get_my_invitations(user_id: int = Query(..., description="Organizer's user ID")):
     """Get all people you have invited and their attendance status"""
     try:
-        invitations = event_service.get_my_invitations(organizer_id=user_id)
+        invitations = await run_in("db", event_service.get_my_invitations, organizer_id=user_id)
         return [
             InvitationInfo(
                 event_id=inv["event_id"],
@@ -185,6 +368,8 @@ def get_my_invitations(user_id: int = Query(..., description="Organizer's user I
             )
             for inv in invitations
         ]
+    except EventPlannerException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -1,8 +1,16 @@
+from typing import Any, Dict
 from fastapi import APIRouter
 from dto.schemas import HealthResponse
+import metrics
 
 router = APIRouter(tags=["Health"])
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     return HealthResponse(status="ok")
+
+
+@router.get("/metrics")
+async def get_metrics() -> Dict[str, Dict[str, Any]]:
+    """In-process counters (request coalescing, executors, ...) for this worker"""
+    return metrics.snapshot()
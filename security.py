@@ -1,12 +1,122 @@
+import secrets
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, NamedTuple, Optional
 from jose import jwt, JWTError
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from config import JWT_SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+import metrics
+from config import (
+    JWT_SECRET_KEY,
+    JWT_ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    TOKEN_CACHE_ENABLED,
+    TOKEN_CACHE_MAX_ENTRIES,
+    ADMIN_API_KEY
+)
 
 security_scheme = HTTPBearer(auto_error=True)
 
+
+class VerifiedToken(NamedTuple):
+    user_id: int
+    exp: float
+    jti: Optional[str] = None
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of tokens whose signature and claims were already checked.
+
+    Entries are only served until the token's own `exp`; expired entries are
+    dropped when looked up and swept before the LRU evicts live ones.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES, sweep_interval: float = 30.0):
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._entries: "OrderedDict[str, VerifiedToken]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def get(self, token: str) -> Optional[VerifiedToken]:
+        with self._lock:
+            verified = self._entries.get(token)
+            if verified is None:
+                self._misses += 1
+                return None
+            if verified.exp <= time.time():
+                del self._entries[token]
+                self._expired += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return verified
+
+    def put(self, token: str, verified: VerifiedToken) -> None:
+        with self._lock:
+            self._entries[token] = verified
+            self._entries.move_to_end(token)
+            if len(self._entries) > self.max_entries:
+                self._sweep_expired()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+
+    def _sweep_expired(self) -> None:
+        # Full scan, so rate-limited; callers hold the lock
+        now = time.time()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        expired = [token for token, verified in self._entries.items() if verified.exp <= now]
+        for token in expired:
+            del self._entries[token]
+        self._expired += len(expired)
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+                "expired": self._expired,
+                "evicted": self._evicted,
+            }
+
+
+token_cache: Optional[VerifiedTokenCache] = VerifiedTokenCache() if TOKEN_CACHE_ENABLED else None
+if token_cache is not None:
+    metrics.register("token_cache", token_cache.stats)
+
+# Optional hook returning True for tokens that must be rejected despite a valid signature
+_revocation_check: Optional[Callable[[VerifiedToken], bool]] = None
+
+
+def set_revocation_check(check: Optional[Callable[[VerifiedToken], bool]]) -> None:
+    """Install the revocation hook consulted on every request, cached or not"""
+    global _revocation_check
+    _revocation_check = check
+
+
 def create_access_token(user_id: int, expires_minutes: Optional[int] = None) -> str:
     expire_delta = timedelta(minutes=expires_minutes or ACCESS_TOKEN_EXPIRE_MINUTES)
     now = datetime.utcnow()
@@ -14,12 +124,14 @@ def create_access_token(user_id: int, expires_minutes: Optional[int] = None) ->
         "sub": str(user_id),
         "iat": int(now.timestamp()),
         "exp": int((now + expire_delta).timestamp()),
+        # Unique id so a single token can be revoked (logout) before it expires
+        "jti": uuid.uuid4().hex,
     }
     token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return token
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)) -> int:
-    token = credentials.credentials
+def verify_access_token(token: str) -> VerifiedToken:
+    """Decode and verify a token, raising 401 when it is invalid or expired"""
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         subject = payload.get("sub")
@@ -28,11 +140,46 @@ def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(secu
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload",
             )
-        return int(subject)
+        return VerifiedToken(
+            user_id=int(subject),
+            exp=float(payload.get("exp") or 0),
+            jti=payload.get("jti"),
+        )
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
+def get_current_token(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)) -> VerifiedToken:
+    token = credentials.credentials
+    verified = token_cache.get(token) if token_cache is not None else None
+    if verified is None:
+        verified = verify_access_token(token)
+        # Tokens without an exp claim are never cached: nothing would bound their lifetime
+        if token_cache is not None and verified.exp:
+            token_cache.put(token, verified)
+    if _revocation_check is not None and _revocation_check(verified):
+        if token_cache is not None:
+            token_cache.discard(token)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+    return verified
+
+def get_current_user_id(verified: VerifiedToken = Depends(get_current_token)) -> int:
+    return verified.user_id
 
+def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Guard for admin endpoints: the X-Admin-Key header must match ADMIN_API_KEY"""
+    if not ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled",
+        )
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin key",
+        )
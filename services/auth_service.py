@@ -1,49 +1,73 @@
 from typing import Dict, Any
+from concurrent.futures import Future
 import logging
 from models.user_repository import UserRepository
-from utils import hash_password, verify_password
-from handlers.exceptions import AuthenticationException, NotFoundException, ValidationException
+from utils import (
+    hash_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    get_bcrypt_rounds
+)
+from handlers.exceptions import AuthenticationException, NotFoundException, ValidationException, ServiceUnavailableException, ConflictException
 from validators import validate_email, validate_password, validate_name
+from executors import run_in, get_executor, get_auth_executor
+from bloom import RegisteredEmailFilter, get_registered_email_filter
 
 logger = logging.getLogger(__name__)
 
 class AuthService:
     
-    def __init__(self, user_repository: UserRepository = None):
+    def __init__(self, user_repository: UserRepository = None, email_filter: RegisteredEmailFilter = None):
         self.user_repository = user_repository or UserRepository()
+        self.email_filter = email_filter or get_registered_email_filter()
     
-    def signup(self, name: str, email: str, password: str) -> Dict[str, Any]:
+    async def signup(self, name: str, email: str, password: str) -> Dict[str, Any]:
         """Sign up a new user with validation"""
         # Validate inputs
         name = validate_name(name)
         email = validate_email(email)
         validate_password(password)
+
+        # Reject duplicates before paying for a bcrypt hash; the unique key still decides races
+        if await self._email_registered(email):
+            raise ConflictException('Email already registered')
         
-        # Hash password
-        hashed_password = hash_password(password)
+        # Hash password in the auth pool (bcrypt would otherwise block the event loop)
+        hashed_password = await hash_password_async(password)
         
         try:
-            user = self.user_repository.create_user(name, email, hashed_password)
+            user = await run_in("db", self.user_repository.create_user, name, email, hashed_password)
+            if self.email_filter is not None:
+                self.email_filter.add(email)
             logger.info(f"User signed up successfully: {user['user_id']}")
             return user
         except Exception as e:
             logger.error(f"Error during signup: {str(e)}")
             raise
     
-    def login(self, email: str, password: str) -> Dict[str, Any]:
+    async def _email_registered(self, email: str) -> bool:
+        if self.email_filter is not None and not self.email_filter.might_contain(email):
+            return False
+        return await run_in("db", self.user_repository.user_exists, email)
+
+    async def login(self, email: str, password: str) -> Dict[str, Any]:
         """Login user with validation"""
         # Validate inputs
         email = validate_email(email)
         if not password or not isinstance(password, str):
             raise ValidationException("Password is required")
         
-        user = self.user_repository.get_user_by_email(email)
+        user = await run_in("db", self.user_repository.get_credentials_by_email, email)
         
         if not user:
             raise AuthenticationException('Invalid email or password')
         
-        if not verify_password(password, user['password']):
+        if not await verify_password_async(password, user['password']):
             raise AuthenticationException('Invalid email or password')
+
+        if password_needs_rehash(user['password']):
+            self._schedule_rehash(user['id'], password, user['password'])
         
         logger.info(f"User logged in successfully: {user['id']}")
         return {
@@ -51,3 +75,36 @@ class AuthService:
             'name': user['name'],
             'email': user['email']
         }
+
+    def _schedule_rehash(self, user_id: int, password: str, old_hash: str) -> None:
+        """Upgrade a stale hash off the request path so the login response is not delayed.
+
+        bcrypt runs in the bounded auth pool, like every other hash; only the
+        UPDATE goes to the background pool. When either pool is saturated the
+        rehash is skipped and retried at a later login.
+        """
+        try:
+            # Pass the cost explicitly: process-pool workers do not share the configured rounds
+            hashing = get_auth_executor().submit(hash_password, password, get_bcrypt_rounds())
+        except ServiceUnavailableException:
+            logger.warning(f"Auth pool busy, skipping password rehash for user {user_id}")
+            return
+        hashing.add_done_callback(lambda done: self._store_rehash(user_id, done, old_hash))
+
+    def _store_rehash(self, user_id: int, hashing: Future, old_hash: str) -> None:
+        error = "cancelled" if hashing.cancelled() else hashing.exception()
+        if error is not None:
+            logger.error(f"Error rehashing password for user {user_id}: {str(error)}")
+            return
+        try:
+            get_executor("background").submit(self._update_password_hash, user_id, hashing.result(), old_hash)
+        except ServiceUnavailableException:
+            logger.warning(f"Background pool busy, skipping password rehash for user {user_id}")
+
+    def _update_password_hash(self, user_id: int, new_hash: str, old_hash: str) -> None:
+        try:
+            # Only replace the hash we verified, never a password changed meanwhile
+            if self.user_repository.update_password(user_id, new_hash, expected_hash=old_hash):
+                logger.info(f"Password hash upgraded for user {user_id}")
+        except Exception as e:
+            logger.error(f"Error rehashing password for user {user_id}: {str(e)}")
@@ -0,0 +1,184 @@
+from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
+import logging
+
+from database import get_db_connection, close_db
+from models.event_repository import MysqlEventRepository
+from models.event_archive_repository import MysqlEventArchiveRepository
+from cache import CacheBackend, NullCache
+from executors import get_executor
+from handlers.exceptions import ValidationException, DatabaseException, ServiceUnavailableException
+from validators import validate_user_id, validate_event_ids
+from recurrence import last_occurrence
+from config import BULK_EVENT_MAX_ITEMS, EVENT_ARCHIVE_SYNC_MAX_ROWS, EVENT_ARCHIVE_AFTER_DAYS, EVENT_ARCHIVE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def is_past(event: Dict[str, Any], before: date) -> bool:
+    """Whether every occurrence of an event is before `before` (never for a series without an end)"""
+    return (last_occurrence(event) or date.max) < before
+
+
+def chunk_by_rows(event_ids: List[int], row_counts: Dict[int, int], max_rows: int) -> List[List[int]]:
+    """Group events so each group moves at most `max_rows` attendee rows (a larger event is a group of its own)"""
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_rows = 0
+    for event_id in event_ids:
+        rows = row_counts.get(event_id, 0)
+        if current and current_rows + rows > max_rows:
+            chunks.append(current)
+            current, current_rows = [], 0
+        current.append(event_id)
+        current_rows += rows
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class EventArchiveService:
+    def __init__(
+        self,
+        event_repo: MysqlEventRepository = None,
+        archive_repo: MysqlEventArchiveRepository = None,
+        cache: CacheBackend = None,
+        sync_max_rows: int = EVENT_ARCHIVE_SYNC_MAX_ROWS
+    ):
+        self.event_repo = event_repo or MysqlEventRepository()
+        self.archive_repo = archive_repo or MysqlEventArchiveRepository()
+        self.cache = cache or NullCache()
+        self.sync_max_rows = max(1, sync_max_rows)
+
+    def archive_events_bulk(self, organizer_id: int, event_ids: List[int]) -> Dict[str, Any]:
+        """Move many of an organizer's past events to the archive tables.
+
+        Ownership of every id is checked with one locking query. Only events
+        whose last occurrence is before today are archived; the others are
+        reported as "not_past". When the archived events have at most
+        `sync_max_rows` attendee rows they are archived in that same
+        transaction; otherwise the transaction is
+        released and the events are archived by a background job, in groups
+        of at most `sync_max_rows` rows, each group in its own transaction.
+        """
+        organizer_id = validate_user_id(organizer_id)
+        event_ids = validate_event_ids(event_ids, BULK_EVENT_MAX_ITEMS)
+
+        today = date.today()
+        conn = None
+        scheduled = False
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            owners = self.event_repo.get_event_owners(event_ids, conn=conn, for_update=True)
+            owned = [event_id for event_id in event_ids
+                     if event_id in owners and owners[event_id]["organizer_user_id"] == organizer_id
+                     and is_past(owners[event_id], today)]
+            row_counts = {event_id: owners[event_id]["attendee_count"] or 0 for event_id in owned}
+            if sum(row_counts.values()) <= self.sync_max_rows:
+                self.archive_repo.archive_events(owned, conn=conn)
+                conn.commit()
+            else:
+                conn.rollback()
+                get_executor("background").submit(
+                    self._archive_chunks, organizer_id, chunk_by_rows(owned, row_counts, self.sync_max_rows), today
+                )
+                scheduled = True
+        except (ValidationException, DatabaseException, ServiceUnavailableException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error archiving events: {str(e)}")
+            raise DatabaseException("Failed to archive events")
+        finally:
+            close_db(conn)
+
+        if owned and not scheduled:
+            self._invalidate(organizer_id, owned)
+        logger.info(f"{len(owned)} events {'scheduled for archiving' if scheduled else 'archived'} by user {organizer_id}")
+        done_status = "scheduled" if scheduled else "archived"
+        return {
+            "action": "archive",
+            "processed_count": len(owned),
+            "scheduled": scheduled,
+            "results": [
+                {"event_id": event_id, "status": self._outcome(event_id, owners, organizer_id, today, done_status)}
+                for event_id in event_ids
+            ]
+        }
+
+    def archive_past_events(self, before: Optional[date] = None, batch_size: int = EVENT_ARCHIVE_BATCH_SIZE) -> Dict[str, Any]:
+        """Archive every event whose last occurrence is before `before`.
+
+        `before` defaults to EVENT_ARCHIVE_AFTER_DAYS ago. Events are found
+        by walking the primary key without locks and archived `batch_size`
+        at a time, each batch in its own short transaction; a failed batch
+        is logged and the walk continues. Series without an end are never
+        archived.
+        """
+        cutoff = before or date.today() - timedelta(days=EVENT_ARCHIVE_AFTER_DAYS)
+        batch_size = max(1, batch_size)
+        archived = failed = 0
+        after_id = 0
+        while True:
+            event_ids, last_id = self.archive_repo.find_archivable(cutoff, after_id, batch_size)
+            if event_ids:
+                try:
+                    archived += self._archive_group(event_ids, cutoff)
+                except Exception as e:
+                    failed += len(event_ids)
+                    logger.error(f"Archiving events {event_ids[0]}..{event_ids[-1]} failed: {str(e)}")
+            if last_id == after_id:
+                break
+            after_id = last_id
+        logger.info(f"Archive job before {cutoff}: {archived} events archived, {failed} failed")
+        return {"cutoff": cutoff, "archived": archived, "failed": failed}
+
+    def _archive_chunks(self, organizer_id: int, chunks: List[List[int]], before: date) -> None:
+        """Background part of a large bulk archive; a failed group is logged and the rest continue"""
+        for chunk in chunks:
+            try:
+                self._archive_group(chunk, before, organizer_id=organizer_id)
+            except Exception as e:
+                logger.error(f"Archiving events {chunk} failed: {str(e)}")
+
+    def _archive_group(self, event_ids: List[int], before: date, organizer_id: Optional[int] = None) -> int:
+        """Lock and archive a group of events that ended before `before` in one transaction, only `organizer_id`'s when given"""
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            # Checked again under the lock: events may have been deleted or rescheduled since they were picked
+            owners = self.event_repo.get_event_owners(event_ids, conn=conn, for_update=True)
+            owned = [event_id for event_id in event_ids if event_id in owners
+                     and (organizer_id is None or owners[event_id]["organizer_user_id"] == organizer_id)
+                     and is_past(owners[event_id], before)]
+            archived = self.archive_repo.archive_events(owned, conn=conn)
+            conn.commit()
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            close_db(conn)
+        self.cache.invalidate_tags(
+            *(f"event:{event_id}" for event_id in owned),
+            *{f"user:{owners[event_id]['organizer_user_id']}" for event_id in owned}
+        )
+        return archived
+
+    def _invalidate(self, organizer_id: int, event_ids: List[int]) -> None:
+        self.cache.invalidate_tags(*(f"event:{event_id}" for event_id in event_ids), f"user:{organizer_id}")
+
+    @staticmethod
+    def _outcome(event_id: int, owners: Dict[int, Dict[str, Any]], organizer_id: int, today: date, done_status: str) -> str:
+        if event_id not in owners:
+            return "not_found"
+        if owners[event_id]["organizer_user_id"] != organizer_id:
+            return "forbidden"
+        if not is_past(owners[event_id], today):
+            return "not_past"
+        return done_status
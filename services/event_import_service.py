@@ -0,0 +1,230 @@
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+from datetime import date, time as time_type, datetime
+import csv
+import logging
+
+from database import get_db_connection, close_db
+from models.event_repository import MysqlEventRepository
+from models.event_attendee_repository import MysqlEventAttendeeRepository
+from models.feed_repository import MysqlUserEventFeedRepository
+from models.rsvp_count_repository import MysqlRsvpCountRepository
+from models.user_repository import UserRepository
+from cache import CacheBackend, NullCache
+from handlers.exceptions import ValidationException, DatabaseException, NotFoundException
+from validators import (
+    validate_user_id,
+    validate_title,
+    validate_location,
+    validate_description,
+    validate_date,
+    validate_time
+)
+from config import EVENT_IMPORT_BATCH_SIZE, EVENT_IMPORT_MAX_ROWS
+
+logger = logging.getLogger(__name__)
+
+EVENT_IMPORT_FORMATS = ("csv", "ics")
+
+# iCalendar text escapes (RFC 5545 3.3.11)
+_ICS_UNESCAPES = {"n": "\n", "N": "\n", ",": ",", ";": ";", "\\": "\\"}
+
+
+def _unescape_ics(value: str) -> str:
+    out = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            out.append(_ICS_UNESCAPES.get(escaped, escaped))
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def _unfold_ics(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded content lines (continuations start with a space or tab)"""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _parse_ics_datetime(value: str) -> Dict[str, str]:
+    """DTSTART value as ISO date and time strings; all-day events start at midnight"""
+    value = value.strip().rstrip("Z")
+    try:
+        if "T" in value:
+            parsed = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+            return {"date": parsed.date().isoformat(), "time": parsed.time().isoformat()}
+        return {"date": datetime.strptime(value[:8], "%Y%m%d").date().isoformat(), "time": "00:00:00"}
+    except ValueError:
+        return {"date": value, "time": ""}
+
+
+def iter_event_rows(lines: Iterable[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Stream raw event records from a CSV (header: title,date,time,location[,description]) or .ics file.
+
+    Rows are yielded as strings and validated later, so a bad record is
+    reported on its own instead of failing the whole file.
+    """
+    fmt = (fmt or "").lower()
+    if fmt not in EVENT_IMPORT_FORMATS:
+        raise ValidationException(f"Unsupported import format '{fmt}', expected csv or ics")
+
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        missing = {"title", "date", "time", "location"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValidationException(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+        yield from reader
+        return
+
+    event = None
+    for line in _unfold_ics(lines):
+        name, _, value = line.partition(":")
+        # Property parameters (DTSTART;TZID=...:...) are not needed; times are taken as written
+        name = name.split(";", 1)[0].upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {"title": None, "date": None, "time": None, "location": None, "description": None}
+        elif name == "END" and value.upper() == "VEVENT" and event is not None:
+            yield event
+            event = None
+        elif event is not None:
+            if name == "SUMMARY":
+                event["title"] = _unescape_ics(value)
+            elif name == "DTSTART":
+                event.update(_parse_ics_datetime(value))
+            elif name == "LOCATION":
+                event["location"] = _unescape_ics(value)
+            elif name == "DESCRIPTION":
+                event["description"] = _unescape_ics(value)
+
+
+def parse_event_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert and validate one raw record with the same rules as POST /events"""
+    raw_date, raw_time = row.get("date"), row.get("time")
+    try:
+        event_date = raw_date if isinstance(raw_date, date) else date.fromisoformat((raw_date or "").strip())
+    except ValueError:
+        raise ValidationException("Event date must be a valid date (YYYY-MM-DD)")
+    try:
+        event_time = raw_time if isinstance(raw_time, time_type) else time_type.fromisoformat((raw_time or "").strip())
+    except ValueError:
+        raise ValidationException("Event time must be a valid time (HH:MM[:SS])")
+    return {
+        "title": validate_title(row.get("title")),
+        "date": validate_date(event_date),
+        "time": validate_time(event_time),
+        "location": validate_location(row.get("location")),
+        "description": validate_description(row.get("description") or None)
+    }
+
+
+class EventImportService:
+    def __init__(
+        self,
+        event_repo: MysqlEventRepository = None,
+        attendee_repo: MysqlEventAttendeeRepository = None,
+        feed_repo: MysqlUserEventFeedRepository = None,
+        rsvp_count_repo: MysqlRsvpCountRepository = None,
+        cache: CacheBackend = None,
+        batch_size: int = EVENT_IMPORT_BATCH_SIZE
+    ):
+        self.event_repo = event_repo or MysqlEventRepository()
+        self.attendee_repo = attendee_repo or MysqlEventAttendeeRepository()
+        self.feed_repo = feed_repo or MysqlUserEventFeedRepository()
+        self.rsvp_count_repo = rsvp_count_repo or MysqlRsvpCountRepository()
+        self.user_repo = UserRepository()
+        self.cache = cache or NullCache()
+        self.batch_size = max(1, batch_size)
+
+    def import_events(self, organizer_id: int, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create an event, organized by `organizer_id`, for every valid record.
+
+        Records are consumed as they are read and written in batches of
+        `batch_size`, each batch in one transaction. Invalid records are
+        reported and skipped; a failed batch is reported for its rows and
+        does not stop the rest of the import. Records past
+        EVENT_IMPORT_MAX_ROWS are not read and the result is marked truncated.
+        """
+        organizer_id = validate_user_id(organizer_id)
+        if not self.user_repo.get_user_by_id(organizer_id):
+            raise NotFoundException("User", str(organizer_id))
+
+        results: List[Dict[str, Any]] = []
+        batch: List[Dict[str, Any]] = []
+        truncated = False
+        for index, row in enumerate(rows):
+            if index >= EVENT_IMPORT_MAX_ROWS:
+                # Earlier batches are already committed, so stop here rather than fail
+                truncated = True
+                logger.warning(f"Event import for organizer {organizer_id} stopped at {EVENT_IMPORT_MAX_ROWS} rows")
+                break
+            try:
+                event = parse_event_row(row)
+            except ValidationException as e:
+                results.append(self._result(index, row.get("title"), "invalid", message=e.message))
+                continue
+            event["index"] = index
+            batch.append(event)
+            results.append(None)
+            if len(batch) >= self.batch_size:
+                self._write_batch(organizer_id, batch, results)
+                batch = []
+        if batch:
+            self._write_batch(organizer_id, batch, results)
+
+        if any(result["status"] == "created" for result in results):
+            self.cache.invalidate_tags(f"user:{organizer_id}")
+
+        summary = {status: 0 for status in ("created", "invalid", "error")}
+        for result in results:
+            summary[result["status"]] += 1
+        logger.info(f"Event import for organizer {organizer_id} finished: {summary}")
+        return {"total": len(results), **summary, "truncated": truncated, "results": results}
+
+    def _write_batch(self, organizer_id: int, batch: List[Dict[str, Any]], results: List[Optional[Dict[str, Any]]]) -> None:
+        """Insert events, organizer rows, feed rows and counters of one batch in one transaction"""
+        conn = None
+        try:
+            conn = get_db_connection()
+            # The new ids are read back from this snapshot, see create_events_batch
+            conn.start_transaction(consistent_snapshot=True)
+            event_ids = self.event_repo.create_events_batch(organizer_id, batch, conn=conn)
+            for event, event_id in zip(batch, event_ids):
+                event["id"] = event_id
+            self.attendee_repo.add_organizer_rows(event_ids, organizer_id, conn=conn)
+            self.feed_repo.add_user_entries(organizer_id, "organizer", batch, conn=conn)
+            self.rsvp_count_repo.initialize(event_ids, conn=conn)
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            message = e.message if isinstance(e, DatabaseException) else "Failed to create events"
+            logger.error(f"Event import batch of {len(batch)} rows failed: {str(e)}")
+            for event in batch:
+                results[event["index"]] = self._result(event["index"], event["title"], "error", message=message)
+            return
+        finally:
+            close_db(conn)
+
+        for event in batch:
+            results[event["index"]] = self._result(event["index"], event["title"], "created", event_id=event["id"])
+
+    @staticmethod
+    def _result(index: int, title: Any, status: str, event_id: Optional[int] = None,
+                message: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "row": index + 1,
+            "title": title if isinstance(title, str) else None,
+            "status": status,
+            "event_id": event_id,
+            "message": message
+        }
@@ -0,0 +1,136 @@
+from typing import Dict, Any, List
+import threading
+import time
+import logging
+
+from models.event_repository import MysqlEventRepository
+from models.event_attendee_repository import MysqlEventAttendeeRepository
+from models.feed_repository import MysqlUserEventFeedRepository
+from models.event_purge_repository import MysqlEventPurgeRepository
+from executors import get_executor
+from handlers.exceptions import NotFoundException, PermissionException, ServiceUnavailableException
+from validators import validate_event_id, validate_user_id
+from config import EVENT_PURGE_CHUNK_SIZE, EVENT_PURGE_PAUSE_MS
+
+logger = logging.getLogger(__name__)
+
+
+class EventPurgeService:
+    """Removes the rows of soft-deleted events in the background.
+
+    Deleting an event only marks it deleted, which hides it from every read
+    at once. The attendee, occurrence override and feed rows are then
+    deleted here in chunks of `chunk_size`, each committed on its own with
+    a pause in between, so a large event never holds locks or a long undo
+    log and replicas keep up. The event row itself goes last. Progress is
+    stored in event_purge_jobs after every chunk; an interrupted purge is
+    picked up again by `python manage.py purge-deleted-events`.
+    """
+
+    def __init__(
+        self,
+        event_repo: MysqlEventRepository = None,
+        attendee_repo: MysqlEventAttendeeRepository = None,
+        feed_repo: MysqlUserEventFeedRepository = None,
+        purge_repo: MysqlEventPurgeRepository = None,
+        chunk_size: int = EVENT_PURGE_CHUNK_SIZE,
+        pause_ms: int = EVENT_PURGE_PAUSE_MS
+    ):
+        self.event_repo = event_repo or MysqlEventRepository()
+        self.attendee_repo = attendee_repo or MysqlEventAttendeeRepository()
+        self.feed_repo = feed_repo or MysqlUserEventFeedRepository()
+        self.purge_repo = purge_repo or MysqlEventPurgeRepository()
+        self.chunk_size = max(1, chunk_size)
+        self.pause_seconds = max(0, pause_ms) / 1000
+        self._stopping = threading.Event()
+
+    def close(self) -> None:
+        """Make running purges stop after their current chunk; they resume from the job table"""
+        self._stopping.set()
+
+    def record_job(self, event_id: int, organizer_id: int, conn) -> None:
+        """Record the pending purge of an event deleted in the caller's transaction"""
+        self.purge_repo.create_job(event_id, organizer_id, conn=conn)
+
+    def record_jobs(self, event_ids: List[int], organizer_id: int, conn) -> None:
+        """Record pending purges for many events deleted in the caller's transaction"""
+        self.purge_repo.create_jobs(event_ids, organizer_id, conn=conn)
+
+    def schedule(self, event_id: int) -> None:
+        """Start the purge of a deleted event on the background pool"""
+        self.schedule_many([event_id])
+
+    def schedule_many(self, event_ids: List[int]) -> None:
+        """Purge several deleted events one after another in a single background task"""
+        try:
+            get_executor("background").submit(self._purge_all, list(event_ids))
+        except ServiceUnavailableException:
+            # The job rows stay pending and are picked up by purge-deleted-events
+            logger.warning(f"Background pool busy, purge of events {list(event_ids)} left pending")
+
+    def _purge_all(self, event_ids: List[int]) -> None:
+        for event_id in event_ids:
+            if self._stopping.is_set():
+                return
+            self.purge_event(event_id)
+
+    def purge_event(self, event_id: int, already_purged: int = 0) -> Dict[str, Any]:
+        """Delete the rows of a deleted event chunk by chunk, recording progress; returns the final job state"""
+        try:
+            purged = already_purged
+            total = purged + self.attendee_repo.count_event_rows(event_id)
+            self.purge_repo.update_progress(event_id, "running", total_rows=total, purged_rows=purged)
+            while True:
+                if self._stopping.is_set():
+                    logger.info(f"Purge of event {event_id} interrupted at {purged}/{total} rows")
+                    return {"event_id": event_id, "status": "running", "total_rows": total, "purged_rows": purged}
+                feed_removed = self.feed_repo.delete_event_entries_chunk(event_id, self.chunk_size)
+                removed = self.attendee_repo.delete_event_rows_chunk(event_id, self.chunk_size)
+                if not removed and not feed_removed:
+                    break
+                purged = min(total, purged + removed)
+                self.purge_repo.update_progress(event_id, "running", purged_rows=purged)
+                if self.pause_seconds:
+                    time.sleep(self.pause_seconds)
+            self.event_repo.delete_event(event_id)
+            self.purge_repo.update_progress(event_id, "done", purged_rows=total)
+            logger.info(f"Purge of event {event_id} finished: {total} rows removed")
+            return {"event_id": event_id, "status": "done", "total_rows": total, "purged_rows": total}
+        except Exception as e:
+            logger.error(f"Purge of event {event_id} failed: {str(e)}")
+            try:
+                self.purge_repo.update_progress(event_id, "failed", error=str(e))
+            except Exception as update_error:
+                logger.error(f"Could not record failed purge of event {event_id}: {str(update_error)}")
+            return {"event_id": event_id, "status": "failed", "error": str(e)}
+
+    def resume_unfinished(self) -> List[Dict[str, Any]]:
+        """Run every pending, interrupted or failed purge to completion in the calling thread"""
+        return [
+            self.purge_event(job["event_id"], already_purged=job["purged_rows"] or 0)
+            for job in self.purge_repo.list_unfinished()
+        ]
+
+    def get_deletion_status(self, event_id: int, user_id: int) -> Dict[str, Any]:
+        """Purge progress of a deleted event, visible to its organizer"""
+        event_id = validate_event_id(event_id)
+        user_id = validate_user_id(user_id)
+
+        job = self.purge_repo.get_job(event_id)
+        if not job:
+            raise NotFoundException("Event deletion", str(event_id))
+        if job["organizer_user_id"] != user_id:
+            raise PermissionException("Only organizer can view the deletion of the event")
+
+        total = job["total_rows"] or 0
+        purged = job["purged_rows"] or 0
+        return {
+            "event_id": event_id,
+            "status": job["status"],
+            "total_rows": total,
+            "purged_rows": purged,
+            "progress": 1.0 if job["status"] == "done" or not total else round(purged / total, 4),
+            "error": job["error"],
+            "deleted_at": job["created_at"],
+            "finished_at": job["finished_at"]
+        }
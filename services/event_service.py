@@ -1,11 +1,22 @@
-from typing import Dict, Any, List, Optional
-from datetime import date, time as time_type
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, time as time_type, timedelta
+import hashlib
 import logging
 
+import metrics
+from cache import CacheBackend, NullCache
 from database import get_db_connection, close_db
 from models.event_repository import MysqlEventRepository
 from models.event_attendee_repository import MysqlEventAttendeeRepository
 from models.user_repository import UserRepository
+from models.feed_repository import MysqlUserEventFeedRepository
+from models.rsvp_count_repository import MysqlRsvpCountRepository, STATUS_COLUMNS
+from models.event_archive_repository import MysqlEventArchiveRepository
+from services.event_purge_service import EventPurgeService
+from recurrence import expand_events, is_occurrence
+from singleflight import SingleFlight
+from write_behind import AttendanceWriteBehindQueue
+from config import RECURRENCE_EXPANSION_DAYS, RECURRENCE_MAX_OCCURRENCES, BULK_EVENT_MAX_ITEMS
 from handlers.exceptions import (
     NotFoundException,
     PermissionException,
@@ -20,24 +31,199 @@ from validators import (
     validate_time,
     validate_user_id,
     validate_event_id,
+    validate_event_ids,
     validate_date_range,
     validate_role,
     validate_attendance_status,
-    validate_keyword
+    validate_keyword,
+    validate_email,
+    validate_recurrence
 )
 
 logger = logging.getLogger(__name__)
 
 
+def by_created(event: Dict[str, Any]) -> Any:
+    """Sort key of the organized and invited lists (newest created first)"""
+    return event.get("created_at") or datetime.min
+
+
+def by_date(event: Dict[str, Any]) -> Any:
+    """Sort key of search results (newest date first)"""
+    return event["date"], event.get("created_at") or datetime.min
+
+
+def build_etag(scope: str, version: Dict[str, Any]) -> str:
+    """Build a weak ETag from a repository version row"""
+    parts = [scope] + [f"{key}={version.get(key)}" for key in sorted(version)]
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
 class EventService:
     def __init__(
         self,
         event_repo: MysqlEventRepository = None,
-        attendee_repo: MysqlEventAttendeeRepository = None
+        attendee_repo: MysqlEventAttendeeRepository = None,
+        cache: CacheBackend = None,
+        feed_repo: MysqlUserEventFeedRepository = None,
+        rsvp_count_repo: MysqlRsvpCountRepository = None,
+        write_behind: bool = False,
+        purge_service: EventPurgeService = None,
+        archive_repo: MysqlEventArchiveRepository = None
     ):
         self.event_repo = event_repo or MysqlEventRepository()
         self.attendee_repo = attendee_repo or MysqlEventAttendeeRepository()
+        self.feed_repo = feed_repo or MysqlUserEventFeedRepository()
+        self.rsvp_count_repo = rsvp_count_repo or MysqlRsvpCountRepository()
+        self.archive_repo = archive_repo or MysqlEventArchiveRepository()
+        self.purge_service = purge_service or EventPurgeService(
+            event_repo=self.event_repo, attendee_repo=self.attendee_repo, feed_repo=self.feed_repo
+        )
         self.user_repo = UserRepository()
+        self.cache = cache or NullCache()
+        self.reads = SingleFlight("event_reads")
+        self.attendance_queue: Optional[AttendanceWriteBehindQueue] = None
+        if write_behind:
+            self.attendance_queue = AttendanceWriteBehindQueue(self._apply_attendance_statuses)
+            metrics.register("attendance_write_behind", self.attendance_queue.stats)
+            self.attendance_queue.start()
+
+    def close(self) -> None:
+        """Flush queued attendance updates and pause purges; called on application shutdown"""
+        if self.attendance_queue is not None:
+            self.attendance_queue.stop()
+        self.purge_service.close()
+
+    # Cached reads. Entries are tagged "event:<id>" and "user:<id>" so writes
+    # only need to invalidate the tags they touch. Misses on hot keys are
+    # coalesced so concurrent requests share a single query.
+    def _get_shared(self, key: str, loader, tags: List[str]) -> Any:
+        """Cached read whose misses are coalesced around the whole cache fill.
+
+        Only the leader snapshots the tags, loads and stores the value;
+        followers just receive its result. A follower that arrived after a
+        write never stores the leader's older result under the new tag
+        versions.
+        """
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        return self.reads.do(key, lambda: self.cache.get_or_load(key, loader, tags=tags))
+
+    def _get_event(self, event_id: int) -> Optional[Dict[str, Any]]:
+        key = f"event:{event_id}"
+        return self._get_shared(key, lambda: self.event_repo.get_event_by_id(event_id), tags=[key])
+
+    def _get_attendees(self, event_id: int) -> List[Dict[str, Any]]:
+        return self._get_shared(
+            f"attendees:{event_id}", lambda: self.attendee_repo.get_attendees(event_id), tags=[f"event:{event_id}"]
+        )
+
+    def _get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        def load():
+            user = self.user_repo.get_user_by_id(user_id)
+            if not user:
+                return None
+            return {"id": user["id"], "name": user["name"], "email": user["email"]}
+
+        return self.cache.get_or_load(f"user:{user_id}", load, tags=[f"user:{user_id}"])
+
+    def _get_event_list(self, key: str, user_id: int, loader, as_of: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Cache a per-user event list with its attendees, tagged with the user and every listed event.
+
+        `as_of` is the list ETag the caller has just computed from the
+        database. The entry is then cached under that ETag and loaded,
+        attendees included, from the database on a miss, so a body is never
+        older than the ETag sent with it.
+        """
+        cache_key = f"{key}@{as_of}" if as_of else key
+        events = self.cache.get(cache_key)
+        if events is not None:
+            return events
+        # Event tags must be read before loading, so a write to a listed event
+        # during the load invalidates the entry. They are taken for the ids of
+        # the last load; a list holding an event missing from that snapshot is
+        # returned without being cached.
+        ids_key = f"{key}:ids"
+        known_ids = self.cache.get(ids_key) or []
+        versions = self.cache.snapshot([f"user:{user_id}"])
+        event_versions = self.cache.snapshot([f"event:{event_id}" for event_id in known_ids])
+        events = self._attach_attendees(loader(), fresh=as_of is not None)
+        event_tags = [f"event:{event['id']}" for event in events]
+        if all(tag in event_versions for tag in event_tags):
+            versions.update({tag: event_versions[tag] for tag in event_tags})
+            self.cache.set(cache_key, events, versions=versions)
+        # Kept longer than the lists so a reload after expiry can be cached
+        self.cache.set(ids_key, [event["id"] for event in events], ttl=self.cache.default_ttl * 10)
+        return events
+
+    def _attach_attendees(self, events: List[Dict[str, Any]], fresh: bool = False) -> List[Dict[str, Any]]:
+        for event in events:
+            event["attendees"] = self.attendee_repo.get_attendees(event["id"]) if fresh else self._get_attendees(event["id"])
+        return events
+
+    def _with_archived(self, events: List[Dict[str, Any]], start_date: Optional[date], sort_key,
+                       **filters) -> List[Dict[str, Any]]:
+        """Merge in matching archived events when the date range reaches into the archive.
+
+        The archive is only read when it is not empty and the range starts on
+        or before its latest occurrence date (an open start always reaches
+        it). Archived events come with their attendees and are not cached;
+        they are merged newest first by `sort_key`, the order of `events`.
+        """
+        archived_through = self.archive_repo.get_archived_through()
+        if archived_through is None or (start_date is not None and start_date > archived_through):
+            return events
+        live_ids = {event["id"] for event in events}
+        archived = self.archive_repo.search_events(start_date=start_date, **filters)
+        return sorted(events + [event for event in archived if event["id"] not in live_ids], key=sort_key, reverse=True)
+
+    def _expand_recurring(
+        self,
+        events: List[Dict[str, Any]],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        user_id: Optional[int] = None,
+        attendance_status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Replace each series by its occurrences in the window, merged with one-off events by date.
+
+        Series without an end date are expanded up to RECURRENCE_EXPANSION_DAYS
+        from today. Occurrences carry the series attendees with their sparse
+        per-occurrence overrides applied; with `attendance_status`, only
+        occurrences where `user_id` has that status are kept.
+        """
+        series_ids = [event["id"] for event in events if event.get("recurrence_freq")]
+        horizon = date.today() + timedelta(days=RECURRENCE_EXPANSION_DAYS)
+        archived_ids = [event["id"] for event in events if event.get("recurrence_freq") and event.get("archived_at")]
+        overrides = self.attendee_repo.get_occurrence_overrides(
+            [event_id for event_id in series_ids if event_id not in archived_ids], start_date, end_date or horizon
+        )
+        if archived_ids:
+            overrides.update(self.archive_repo.get_occurrence_overrides(archived_ids, start_date, end_date or horizon))
+
+        def occurrences():
+            for event in expand_events(events, start_date, end_date, horizon=horizon,
+                                       series_limit=RECURRENCE_MAX_OCCURRENCES):
+                if not event.get("occurrence_date"):
+                    yield event
+                    continue
+                statuses = overrides.get((event["id"], event["occurrence_date"]), {})
+                attendees = [
+                    {**a, "attendance_status": statuses.get(a["user_id"], a.get("attendance_status") or "pending")}
+                    for a in event.get("attendees", [])
+                ]
+                if attendance_status and not any(
+                    a["user_id"] == user_id and a["attendance_status"] == attendance_status for a in attendees
+                ):
+                    continue
+                event["attendees"] = attendees
+                for status, column in STATUS_COLUMNS.items():
+                    event[column] = sum(1 for a in attendees if a["attendance_status"] == status)
+                yield event
+
+        return list(occurrences())
 
     def create_event(
         self,
@@ -46,9 +232,13 @@ class EventService:
         date_value: date,
         time_value: time_type,
         location: str,
-        description: Optional[str]
+        description: Optional[str],
+        recurrence_freq: Optional[str] = None,
+        recurrence_interval: Optional[int] = None,
+        recurrence_until: Optional[date] = None,
+        recurrence_count: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Create event with validation and proper error handling"""
+        """Create event (a recurring series when a frequency is given) with validation and proper error handling"""
 
         user_id = validate_user_id(user_id)
         title = validate_title(title)
@@ -56,13 +246,16 @@ class EventService:
         description = validate_description(description)
         date_value = validate_date(date_value)
         time_value = validate_time(time_value)
+        recurrence = validate_recurrence(
+            recurrence_freq, recurrence_interval, recurrence_until, recurrence_count, date_value
+        )
 
         conn = None
         try:
             conn = get_db_connection()
             conn.start_transaction()
 
-            user = self.user_repo.get_user_by_id(user_id)
+            user = self._get_user(user_id)
             if not user:
                 raise NotFoundException("User", str(user_id))
 
@@ -73,7 +266,8 @@ class EventService:
                 time_value=time_value,
                 location=location,
                 description=description,
-                conn=conn
+                conn=conn,
+                recurrence=recurrence
             )
 
             self.attendee_repo.add_attendee(
@@ -83,7 +277,19 @@ class EventService:
                 conn=conn
             )
 
+            self.feed_repo.add_entry(
+                event_id=event["id"],
+                user_id=user_id,
+                role="organizer",
+                event_date=date_value,
+                title=title,
+                conn=conn
+            )
+
+            self.rsvp_count_repo.increment(event["id"], "pending", conn=conn)
+
             conn.commit()
+            self.cache.invalidate_tags(f"user:{user_id}")
 
             event["attendees"] = [
                 {
@@ -92,6 +298,7 @@ class EventService:
                     "attendance_status": "pending"
                 }
             ]
+            event.update(pending_count=1, going_count=0, maybe_count=0, not_going_count=0)
 
             logger.info(f"Event created successfully: {event['id']}")
             return event
@@ -108,18 +315,64 @@ class EventService:
         finally:
             close_db(conn)
 
-    def get_organized_events(self, user_id: int) -> List[Dict[str, Any]]:
-        events = self.event_repo.get_events_by_organizer(user_id)
-        for event in events:
-            event["attendees"] = self.attendee_repo.get_attendees(event["id"])
+    def get_organized_events(self, user_id: int, start_date: Optional[date] = None,
+                             end_date: Optional[date] = None, as_of: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events the user organizes; with a date window, recurring series are expanded into occurrences.
+
+        Archived events are only included with a date window, so polling the
+        plain list never reads the archive. `as_of` is the ETag from
+        get_organized_events_etag sent with the body.
+        """
+        validate_date_range(start_date, end_date)
+        events = self._get_event_list(
+            f"organized:{user_id}",
+            user_id,
+            lambda: self.event_repo.get_events_by_organizer(user_id),
+            as_of=as_of
+        )
+        if start_date or end_date:
+            events = self._with_archived(events, start_date, by_created, user_id=user_id, end_date=end_date, role="organizer")
+            events = self._expand_recurring(events, start_date, end_date)
         return events
 
-    def get_invited_events(self, user_id: int) -> List[Dict[str, Any]]:
-        events = self.attendee_repo.get_invited_events_for_user(user_id)
-        for event in events:
-            event["attendees"] = self.attendee_repo.get_attendees(event["id"])
+    def get_invited_events(self, user_id: int, start_date: Optional[date] = None,
+                           end_date: Optional[date] = None, as_of: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events the user is invited to; with a date window, recurring series are expanded into occurrences.
+
+        Archived events are only included with a date window. `as_of` is the
+        ETag from get_invited_events_etag sent with the body.
+        """
+        validate_date_range(start_date, end_date)
+        events = self._get_event_list(
+            f"invited:{user_id}",
+            user_id,
+            lambda: self.attendee_repo.get_invited_events_for_user(user_id),
+            as_of=as_of
+        )
+        if start_date or end_date:
+            events = self._with_archived(events, start_date, by_created, user_id=user_id, end_date=end_date, role="attendee")
+            events = self._expand_recurring(events, start_date, end_date)
         return events
 
+    @staticmethod
+    def _list_scope(scope: str, start_date: Optional[date], end_date: Optional[date]) -> str:
+        # An open-ended window is expanded relative to today, so the day is part of the version
+        if start_date or end_date:
+            return f"{scope}:{start_date}:{end_date or date.today()}"
+        return scope
+
+    def get_organized_events_etag(self, user_id: int, start_date: Optional[date] = None,
+                                  end_date: Optional[date] = None) -> str:
+        user_id = validate_user_id(user_id)
+        version = self.event_repo.get_organized_events_version(user_id)
+        return build_etag(self._list_scope(f"organized:{user_id}", start_date, end_date), version)
+
+    def get_invited_events_etag(self, user_id: int, start_date: Optional[date] = None,
+                                end_date: Optional[date] = None) -> str:
+        user_id = validate_user_id(user_id)
+        version = self.attendee_repo.get_invited_events_version(user_id)
+        return build_etag(self._list_scope(f"invited:{user_id}", start_date, end_date), version)
+
     def invite_user(
         self,
         event_id: int,
@@ -131,14 +384,14 @@ class EventService:
         inviter_id = validate_user_id(inviter_id)
         invited_user_id = validate_user_id(invited_user_id)
 
-        event = self.event_repo.get_event_by_id(event_id)
+        event = self._get_event(event_id)
         if not event:
             raise NotFoundException("Event", str(event_id))
 
         if not self.attendee_repo.is_user_organizer(event_id, inviter_id):
             raise PermissionException("Only organizer can invite users")
 
-        invited_user = self.user_repo.get_user_by_id(invited_user_id)
+        invited_user = self._get_user(invited_user_id)
         if not invited_user:
             raise NotFoundException("User", str(invited_user_id))
 
@@ -148,11 +401,40 @@ class EventService:
         if self.attendee_repo.is_user_attendee(event_id, invited_user_id):
             raise ValidationException("User already invited to this event")
 
-        attendee_id = self.attendee_repo.add_attendee(
-            event_id,
-            invited_user_id,
-            "attendee"
-        )
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+
+            attendee_id = self.attendee_repo.add_attendee(
+                event_id,
+                invited_user_id,
+                "attendee",
+                conn=conn
+            )
+            self.feed_repo.add_entry(
+                event_id=event_id,
+                user_id=invited_user_id,
+                role="attendee",
+                event_date=event["date"],
+                title=event["title"],
+                conn=conn
+            )
+            self.rsvp_count_repo.increment(event_id, "pending", conn=conn)
+
+            conn.commit()
+        except DatabaseException:
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error inviting user: {str(e)}")
+            raise DatabaseException("Failed to invite user")
+        finally:
+            close_db(conn)
+        self.cache.invalidate_tags(f"event:{event_id}", f"user:{invited_user_id}")
 
         logger.info(f"User {invited_user_id} invited to event {event_id}")
         return {
@@ -162,19 +444,212 @@ class EventService:
             "role": "attendee"
         }
 
+    def invite_users_bulk(
+        self,
+        event_id: int,
+        inviter_id: int,
+        user_ids: Optional[List[int]] = None,
+        emails: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Invite many users with one organizer check, one existence query and one INSERT.
+
+        Users can be given by id and/or email; emails are resolved in a single
+        query. Returns one result per distinct user id, in request order, with
+        status "invited", "already_invited", "unknown_user" or "self", followed
+        by one result per distinct email ("invalid_email" and "unknown_email"
+        for addresses that do not resolve to a user).
+        """
+        event_id = validate_event_id(event_id)
+        inviter_id = validate_user_id(inviter_id)
+        user_ids = list(user_ids or [])
+        emails = list(emails or [])
+        if not user_ids and not emails:
+            raise ValidationException("Provide user_ids and/or emails to invite")
+
+        event = self._get_event(event_id)
+        if not event:
+            raise NotFoundException("Event", str(event_id))
+
+        if not self.attendee_repo.is_user_organizer(event_id, inviter_id):
+            raise PermissionException("Only organizer can invite users")
+
+        # Normalize, then resolve every address with one WHERE email IN (...) on the unique index
+        normalized: Dict[str, Optional[str]] = {}
+        for raw_email in emails:
+            try:
+                normalized.setdefault(raw_email, validate_email(raw_email))
+            except ValidationException:
+                normalized.setdefault(raw_email, None)
+        resolved = self.user_repo.get_user_ids_by_emails(
+            {email for email in normalized.values() if email is not None}
+        )
+
+        statuses: Dict[int, str] = {}
+        candidates: List[int] = []
+        for user_id in user_ids + [resolved[email] for email in normalized.values() if email in resolved]:
+            if user_id in statuses:
+                continue
+            if user_id == inviter_id:
+                statuses[user_id] = "self"
+            elif not isinstance(user_id, int) or user_id <= 0:
+                statuses[user_id] = "unknown_user"
+            else:
+                statuses[user_id] = "invited"
+                candidates.append(user_id)
+
+        invited: List[int] = []
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            # Share-lock the users and lock the (event, user) index ranges so the
+            # outcome computed here is exactly what the INSERT does
+            existing = self.user_repo.get_existing_user_ids(candidates, conn=conn, lock=True)
+            attending = self.attendee_repo.get_attendee_user_ids(event_id, candidates, conn=conn, for_update=True)
+            for user_id in candidates:
+                if user_id not in existing:
+                    statuses[user_id] = "unknown_user"
+                elif user_id in attending:
+                    statuses[user_id] = "already_invited"
+                else:
+                    invited.append(user_id)
+
+            if invited:
+                inserted = self.attendee_repo.add_attendees_batch(event_id, invited, "attendee", conn=conn)
+                if inserted != len(invited):
+                    raise DatabaseException("Bulk invite inserted an unexpected number of attendees")
+                self.feed_repo.add_entries(
+                    event_id=event_id,
+                    user_ids=invited,
+                    role="attendee",
+                    event_date=event["date"],
+                    title=event["title"],
+                    conn=conn
+                )
+                self.rsvp_count_repo.increment(event_id, "pending", conn=conn, amount=len(invited))
+            conn.commit()
+        except DatabaseException:
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error inviting users: {str(e)}")
+            raise DatabaseException("Failed to invite users")
+        finally:
+            close_db(conn)
+        if invited:
+            self.cache.invalidate_tags(f"event:{event_id}", *(f"user:{user_id}" for user_id in invited))
+
+        results = []
+        for user_id in dict.fromkeys(user_ids):
+            results.append({"user_id": user_id, "status": statuses[user_id]})
+        # Valid addresses are reported once per normalized email, invalid ones once per raw entry
+        reported_emails = set()
+        for raw_email, email in normalized.items():
+            if email is not None:
+                if email in reported_emails:
+                    continue
+                reported_emails.add(email)
+            if email is None:
+                results.append({"user_id": None, "email": raw_email, "status": "invalid_email"})
+            elif email not in resolved:
+                results.append({"user_id": None, "email": email, "status": "unknown_email"})
+            else:
+                user_id = resolved[email]
+                results.append({"user_id": user_id, "email": email, "status": statuses[user_id]})
+
+        logger.info(f"{len(invited)} users invited to event {event_id} in bulk")
+        return {
+            "event_id": event_id,
+            "invited_count": len(invited),
+            "unresolved_emails": [r["email"] for r in results if r["status"] in ("invalid_email", "unknown_email")],
+            "results": results
+        }
+
     def delete_event(self, event_id: int, user_id: int) -> None:
+        """Soft-delete an event: it disappears from every read at once and its rows are purged in the background"""
         event_id = validate_event_id(event_id)
         user_id = validate_user_id(user_id)
 
-        event = self.event_repo.get_event_by_id(event_id)
+        event = self._get_event(event_id)
         if not event:
             raise NotFoundException("Event", str(event_id))
 
         if event["organizer_user_id"] != user_id:
             raise PermissionException("Only organizer can delete the event")
 
-        self.event_repo.delete_event(event_id)
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            if not self.event_repo.soft_delete_event(event_id, conn=conn):
+                raise NotFoundException("Event", str(event_id))
+            self.purge_service.record_job(event_id, user_id, conn=conn)
+            conn.commit()
+        except (NotFoundException, DatabaseException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error deleting event: {str(e)}")
+            raise DatabaseException("Failed to delete event")
+        finally:
+            close_db(conn)
+        self.cache.invalidate_tags(f"event:{event_id}", f"user:{user_id}")
         logger.info(f"Event {event_id} deleted by user {user_id}")
+        self.purge_service.schedule(event_id)
+
+    def delete_events_bulk(self, organizer_id: int, event_ids: List[int]) -> Dict[str, Any]:
+        """Soft-delete many of an organizer's events in one transaction.
+
+        Ownership of every id is checked with one locking query instead of a
+        lookup per event; the owned events are marked deleted with one UPDATE
+        and purged afterwards by a single background task.
+        """
+        organizer_id = validate_user_id(organizer_id)
+        event_ids = validate_event_ids(event_ids, BULK_EVENT_MAX_ITEMS)
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            owners = self.event_repo.get_event_owners(event_ids, conn=conn, for_update=True)
+            owned = [event_id for event_id in event_ids
+                     if event_id in owners and owners[event_id]["organizer_user_id"] == organizer_id]
+            self.event_repo.soft_delete_events(owned, conn=conn)
+            self.purge_service.record_jobs(owned, organizer_id, conn=conn)
+            conn.commit()
+        except (ValidationException, DatabaseException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error deleting events: {str(e)}")
+            raise DatabaseException("Failed to delete events")
+        finally:
+            close_db(conn)
+
+        if owned:
+            self.cache.invalidate_tags(*(f"event:{event_id}" for event_id in owned), f"user:{organizer_id}")
+            self.purge_service.schedule_many(owned)
+        logger.info(f"{len(owned)} events deleted in bulk by user {organizer_id}")
+
+        results = []
+        for event_id in event_ids:
+            if event_id not in owners:
+                outcome = "not_found"
+            elif owners[event_id]["organizer_user_id"] != organizer_id:
+                outcome = "forbidden"
+            else:
+                outcome = "deleted"
+            results.append({"event_id": event_id, "status": outcome})
+        return {"action": "delete", "processed_count": len(owned), "scheduled": False, "results": results}
 
     def update_attendance_status(
         self,
@@ -187,18 +662,54 @@ class EventService:
         user_id = validate_user_id(user_id)
         status = validate_attendance_status(status)
 
-        event = self.event_repo.get_event_by_id(event_id)
+        event = self._get_event(event_id)
         if not event:
             raise NotFoundException("Event", str(event_id))
 
-        if not self.attendee_repo.is_user_attendee(event_id, user_id):
-            raise ValidationException("User is not an attendee of this event")
+        if self.attendance_queue is not None:
+            # Write-behind: acknowledge once queued, the flush applies the last status
+            if not self.attendee_repo.is_user_attendee(event_id, user_id):
+                raise ValidationException("User is not an attendee of this event")
+            self.attendance_queue.submit(event_id, user_id, status)
+            return {
+                "event_id": event_id,
+                "user_id": user_id,
+                "status": status,
+                "queued": True
+            }
 
-        success = self.attendee_repo.update_attendance_status(
-            event_id, user_id, status
-        )
-        if not success:
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            # Lock the attendee row so the counter transition matches the stored status
+            old_status = self.attendee_repo.get_attendance_status(
+                event_id, user_id, conn=conn, for_update=True
+            )
+            if old_status is None:
+                raise ValidationException("User is not an attendee of this event")
+
+            if old_status != status:
+                success = self.attendee_repo.update_attendance_status(
+                    event_id, user_id, status, conn=conn
+                )
+                if not success:
+                    raise DatabaseException("Failed to update attendance status")
+                self.feed_repo.update_status(event_id, user_id, status, conn=conn)
+                self.rsvp_count_repo.apply_transition(event_id, old_status, status, conn=conn)
+            conn.commit()
+        except (ValidationException, DatabaseException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error updating attendance status: {str(e)}")
             raise DatabaseException("Failed to update attendance status")
+        finally:
+            close_db(conn)
+        self.cache.invalidate_tags(f"event:{event_id}", f"user:{user_id}")
 
         logger.info(
             f"Attendance updated for user {user_id} in event {event_id}"
@@ -209,16 +720,190 @@ class EventService:
             "status": status
         }
 
+    def update_occurrence_attendance(
+        self,
+        event_id: int,
+        occurrence_date: date,
+        user_id: int,
+        status: str
+    ) -> Dict[str, Any]:
+        """Set an attendee's status for one occurrence of a recurring event.
+
+        Only differences from the series status are stored, so setting an
+        occurrence back to the series status removes its override row.
+        """
+        event_id = validate_event_id(event_id)
+        user_id = validate_user_id(user_id)
+        occurrence_date = validate_date(occurrence_date)
+        status = validate_attendance_status(status)
+        if status is None:
+            raise ValidationException("Attendance status is required")
+
+        event = self._get_event(event_id)
+        if not event:
+            raise NotFoundException("Event", str(event_id))
+        if not event.get("recurrence_freq"):
+            raise ValidationException("Event is not recurring")
+        if not is_occurrence(event, occurrence_date):
+            raise ValidationException(f"Event has no occurrence on {occurrence_date.isoformat()}")
+
+        if self.attendance_queue is not None:
+            # The override is relative to the series status, so land a queued one first
+            self.attendance_queue.flush_pending(event_id, [user_id])
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            series_status = self.attendee_repo.get_attendance_status(event_id, user_id, conn=conn, for_update=True)
+            if series_status is None:
+                raise ValidationException("User is not an attendee of this event")
+            self.attendee_repo.set_occurrence_status(
+                event_id, occurrence_date, user_id,
+                None if status == series_status else status,
+                conn=conn
+            )
+            conn.commit()
+        except (ValidationException, DatabaseException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error updating occurrence attendance: {str(e)}")
+            raise DatabaseException("Failed to update occurrence attendance")
+        finally:
+            close_db(conn)
+        self.cache.invalidate_tags(f"event:{event_id}", f"user:{user_id}")
+
+        logger.info(f"Attendance updated for user {user_id} in event {event_id} on {occurrence_date}")
+        return {
+            "event_id": event_id,
+            "user_id": user_id,
+            "occurrence_date": occurrence_date,
+            "status": status
+        }
+
+    def _apply_attendance_statuses(
+        self,
+        event_id: int,
+        requested: Dict[int, str]
+    ) -> Tuple[Dict[int, str], Dict[int, str]]:
+        """Write already validated statuses for one event in a single transaction.
+
+        Returns (outcome per user, the statuses that actually changed).
+        """
+        outcomes: Dict[int, str] = {}
+        changes: Dict[int, str] = {}
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            current = self.attendee_repo.get_attendance_statuses(
+                event_id, list(requested), conn=conn, for_update=True
+            )
+            deltas: Dict[str, int] = {}
+            for user_id, status in requested.items():
+                old_status = current.get(user_id)
+                if old_status is None:
+                    outcomes[user_id] = "not_attendee"
+                elif old_status == status:
+                    outcomes[user_id] = "unchanged"
+                else:
+                    outcomes[user_id] = "updated"
+                    changes[user_id] = status
+                    deltas[old_status] = deltas.get(old_status, 0) - 1
+                    deltas[status] = deltas.get(status, 0) + 1
+
+            if changes:
+                updated = self.attendee_repo.update_attendance_statuses(event_id, changes, conn=conn)
+                if updated != len(changes):
+                    raise DatabaseException("Bulk attendance update changed an unexpected number of rows")
+                self.feed_repo.update_statuses(event_id, changes, conn=conn)
+                self.rsvp_count_repo.apply_deltas(event_id, deltas, conn=conn)
+            conn.commit()
+        except (ValidationException, DatabaseException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error updating attendance statuses: {str(e)}")
+            raise DatabaseException("Failed to update attendance statuses")
+        finally:
+            close_db(conn)
+        if changes:
+            self.cache.invalidate_tags(f"event:{event_id}", *(f"user:{user_id}" for user_id in changes))
+
+        return outcomes, changes
+
+    def update_attendance_statuses_bulk(
+        self,
+        event_id: int,
+        organizer_id: int,
+        updates: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Set many attendees' statuses in one transaction (organizer only).
+
+        Every status is validated before anything is written. The rows are
+        locked and read with one query, changed with one UPDATE ... CASE, and
+        the feed and counters follow in the same transaction. When a user
+        appears more than once the last status wins. Returns one result per
+        distinct user with outcome "updated", "unchanged" or "not_attendee".
+        """
+        event_id = validate_event_id(event_id)
+        organizer_id = validate_user_id(organizer_id)
+
+        requested: Dict[int, str] = {}
+        for update in updates:
+            user_id = validate_user_id(update.get("user_id"))
+            try:
+                requested[user_id] = validate_attendance_status(update.get("status"))
+            except ValidationException as e:
+                raise ValidationException(f"User {user_id}: {e.message}")
+            if requested[user_id] is None:
+                raise ValidationException(f"User {user_id}: Attendance status is required")
+        if not requested:
+            raise ValidationException("Provide at least one attendance update")
+
+        event = self._get_event(event_id)
+        if not event:
+            raise NotFoundException("Event", str(event_id))
+
+        if not self.attendee_repo.is_user_organizer(event_id, organizer_id):
+            raise PermissionException("Only organizer can update attendance in bulk")
+
+        if self.attendance_queue is not None:
+            # These statuses are newer than anything queued for the same attendees
+            self.attendance_queue.discard(event_id, requested)
+
+        outcomes, changes = self._apply_attendance_statuses(event_id, requested)
+
+        logger.info(f"Attendance updated for {len(changes)} users in event {event_id} in bulk")
+        return {
+            "event_id": event_id,
+            "updated_count": len(changes),
+            "results": [
+                {"user_id": user_id, "status": status, "result": outcomes[user_id]}
+                for user_id, status in requested.items()
+            ]
+        }
+
     def get_event_attendees(
         self,
         event_id: int,
-        requesting_user_id: int
+        requesting_user_id: int,
+        as_of: Optional[str] = None
     ) -> List[Dict[str, Any]]:
+        """Attendee list; with `as_of`, the ETag from get_event_attendees_etag, it is cached
+        under that ETag and read from the database on a miss, never older than the ETag"""
 
         event_id = validate_event_id(event_id)
         requesting_user_id = validate_user_id(requesting_user_id)
 
-        event = self.event_repo.get_event_by_id(event_id)
+        event = self._get_event(event_id)
         if not event:
             raise NotFoundException("Event", str(event_id))
 
@@ -234,7 +919,35 @@ class EventService:
                 "You must be an organizer or attendee to view attendee list"
             )
 
-        return self.attendee_repo.get_attendees(event_id)
+        if as_of:
+            return self.cache.get_or_load(
+                f"attendees:{event_id}@{as_of}",
+                lambda: self.attendee_repo.get_attendees(event_id),
+                tags=[f"event:{event_id}"]
+            )
+        return self._get_attendees(event_id)
+
+    def get_event_attendees_etag(
+        self,
+        event_id: int,
+        requesting_user_id: int
+    ) -> str:
+        """Validator for the attendee list, enforcing the same access rules"""
+
+        event_id = validate_event_id(event_id)
+        requesting_user_id = validate_user_id(requesting_user_id)
+
+        event = self._get_event(event_id)
+        if not event:
+            raise NotFoundException("Event", str(event_id))
+
+        if not self.attendee_repo.is_user_attendee(event_id, requesting_user_id):
+            raise PermissionException(
+                "You must be an organizer or attendee to view attendee list"
+            )
+
+        version = self.attendee_repo.get_attendees_version(event_id)
+        return build_etag(f"attendees:{event_id}", version)
 
     def search_events(
         self,
@@ -256,24 +969,52 @@ class EventService:
             if attendance_status else None
         )
 
-        if not self.user_repo.get_user_by_id(user_id):
+        if not self._get_user(user_id):
             raise NotFoundException("User", str(user_id))
 
-        events = self.event_repo.search_events(
+        search_key = hashlib.sha1(
+            repr((keyword, start_date, end_date, role, location, attendance_status)).encode("utf-8")
+        ).hexdigest()
+        events = self._get_event_list(
+            f"search:{user_id}:{search_key}",
+            user_id,
+            lambda: self.event_repo.search_events(
+                user_id=user_id,
+                keyword=keyword,
+                start_date=start_date,
+                end_date=end_date,
+                role=role,
+                location=location,
+                attendance_status=attendance_status
+            )
+        )
+        events = self._with_archived(
+            events, start_date, by_date, user_id=user_id, keyword=keyword, end_date=end_date,
+            role=role, location=location, attendance_status=attendance_status
+        )
+        return self._expand_recurring(events, start_date, end_date, user_id=user_id, attendance_status=attendance_status)
+
+    def get_user_feed(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        role: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+
+        user_id = validate_user_id(user_id)
+        validate_date_range(start_date, end_date)
+        role = validate_role(role) if role else None
+
+        return self.feed_repo.get_feed(
             user_id=user_id,
-            keyword=keyword,
             start_date=start_date,
             end_date=end_date,
             role=role,
-            location=location,
-            attendance_status=attendance_status
+            limit=limit
         )
 
-        for event in events:
-            event["attendees"] = self.attendee_repo.get_attendees(event["id"])
-
-        return events
-
     def get_my_invitations(
         self,
         organizer_id: int
@@ -281,7 +1022,7 @@ class EventService:
 
         organizer_id = validate_user_id(organizer_id)
 
-        if not self.user_repo.get_user_by_id(organizer_id):
+        if not self._get_user(organizer_id):
             raise NotFoundException("User", str(organizer_id))
 
         return self.attendee_repo.get_my_invitations(organizer_id)
@@ -0,0 +1,106 @@
+from typing import Dict, Any
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import secrets
+import uuid
+
+from database import get_db_connection, close_db
+from models.refresh_token_repository import MysqlRefreshTokenRepository
+from security import create_access_token
+from config import REFRESH_TOKEN_EXPIRE_DAYS
+from handlers.exceptions import AuthenticationException, DatabaseException
+
+logger = logging.getLogger(__name__)
+
+
+def hash_refresh_token(token: str) -> str:
+    """SHA-256 digest stored instead of the token.
+
+    Refresh tokens are 256 random bits, so unlike passwords they need no slow,
+    salted hash: a fast digest cannot be brute-forced back to the token.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenService:
+    def __init__(self, refresh_repo: MysqlRefreshTokenRepository = None):
+        self.refresh_repo = refresh_repo or MysqlRefreshTokenRepository()
+
+    def issue_refresh_token(self, user_id: int) -> str:
+        """Start a new token family for a successful login"""
+        token = secrets.token_urlsafe(32)
+        expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        self.refresh_repo.create(user_id, hash_refresh_token(token), uuid.uuid4().hex, expires_at)
+        return token
+
+    def refresh(self, refresh_token: str) -> Dict[str, Any]:
+        """Exchange a refresh token for a new access token and a new refresh token.
+
+        The presented token is retired in the same transaction. Presenting a
+        retired token again means it was copied, so its whole family is revoked.
+        """
+        if not refresh_token:
+            raise AuthenticationException("Invalid refresh token")
+
+        token_hash = hash_refresh_token(refresh_token)
+        new_token = secrets.token_urlsafe(32)
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.start_transaction()
+            stored = self.refresh_repo.get_by_hash(token_hash, conn=conn, for_update=True)
+            if stored is None:
+                raise AuthenticationException("Invalid refresh token")
+
+            if stored["revoked_at"] is not None:
+                revoked = self.refresh_repo.revoke_family(stored["family_id"], conn=conn)
+                conn.commit()
+                logger.warning(
+                    f"Reuse of retired refresh token for user {stored['user_id']}, "
+                    f"revoked {revoked} tokens in its family"
+                )
+                raise AuthenticationException("Refresh token has been revoked")
+
+            if stored["expires_at"] <= datetime.utcnow():
+                raise AuthenticationException("Refresh token has expired")
+
+            expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+            new_id = self.refresh_repo.create(
+                stored["user_id"], hash_refresh_token(new_token), stored["family_id"], expires_at, conn=conn
+            )
+            self.refresh_repo.mark_replaced(stored["id"], new_id, conn=conn)
+            conn.commit()
+        except (AuthenticationException, DatabaseException):
+            if conn:
+                conn.rollback()
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Unexpected error refreshing token: {str(e)}")
+            raise DatabaseException("Failed to refresh token")
+        finally:
+            close_db(conn)
+
+        return {
+            "user_id": stored["user_id"],
+            "token": create_access_token(user_id=stored["user_id"]),
+            "refresh_token": new_token
+        }
+
+    def revoke_refresh_token(self, refresh_token: str, user_id: int) -> None:
+        """Revoke the family a refresh token belongs to (logout); only `user_id`'s own tokens"""
+        conn = None
+        try:
+            conn = get_db_connection()
+            stored = self.refresh_repo.get_by_hash(hash_refresh_token(refresh_token), conn=conn)
+            if stored is None:
+                return
+            if stored["user_id"] != user_id:
+                logger.warning(f"User {user_id} tried to revoke a refresh token of user {stored['user_id']}")
+                raise AuthenticationException("Invalid refresh token")
+            self.refresh_repo.revoke_family(stored["family_id"], conn=conn)
+            conn.commit()
+        finally:
+            close_db(conn)
@@ -0,0 +1,183 @@
+from typing import Dict, Any, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import threading
+
+from models.user_repository import UserRepository
+from bloom import get_registered_email_filter
+from utils import hash_password, get_bcrypt_rounds
+from handlers.exceptions import ValidationException, DatabaseException
+from validators import validate_email, validate_password, validate_name
+from config import USER_IMPORT_BATCH_SIZE, USER_IMPORT_MAX_ROWS, USER_IMPORT_HASH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "json")
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def get_hash_pool(workers: int = USER_IMPORT_HASH_WORKERS) -> ProcessPoolExecutor:
+    """Process pool hashing imported passwords, created on first use and kept for the process lifetime.
+
+    spawn, not fork: forking a process that runs server threads can copy held
+    locks. Spawned workers import the server's entry module, so main.py keeps
+    its startup work in a startup hook.
+    """
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing processes (called on application shutdown)"""
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def parse_user_import(content: bytes, fmt: str) -> List[Dict[str, Any]]:
+    """Parse a CSV (header: name,email,password) or JSON array of user objects"""
+    fmt = (fmt or "").lower()
+    if fmt not in IMPORT_FORMATS:
+        raise ValidationException(f"Unsupported import format '{fmt}', expected csv or json")
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValidationException("Import file must be UTF-8 encoded")
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        missing = {"name", "email", "password"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValidationException(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+        return list(reader)
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValidationException(f"Invalid JSON: {e.msg}")
+    if isinstance(data, dict):
+        data = data.get("users")
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValidationException("JSON import must be an array of user objects (or {\"users\": [...]})")
+    return data
+
+
+class UserImportService:
+    def __init__(
+        self,
+        user_repository: UserRepository = None,
+        batch_size: int = USER_IMPORT_BATCH_SIZE,
+        hash_workers: int = USER_IMPORT_HASH_WORKERS
+    ):
+        self.user_repository = user_repository or UserRepository()
+        self.batch_size = max(1, batch_size)
+        self.hash_workers = max(1, hash_workers)
+
+    def import_users(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create every valid, unregistered user and report the outcome of each row.
+
+        Rows that are invalid or whose email is taken are reported and skipped;
+        they never abort the rest of the import. Passwords are only hashed for
+        rows that will actually be inserted.
+        """
+        if len(rows) > USER_IMPORT_MAX_ROWS:
+            raise ValidationException(f"Too many rows in one import (max {USER_IMPORT_MAX_ROWS})")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        pending: List[Dict[str, Any]] = []
+        first_row_by_email: Dict[str, int] = {}
+
+        for index, row in enumerate(rows):
+            try:
+                name = validate_name(row.get("name"))
+                email = validate_email(row.get("email"))
+                validate_password(row.get("password"))
+            except ValidationException as e:
+                results[index] = self._result(index, row.get("email"), "invalid", message=e.message)
+                continue
+            if email in first_row_by_email:
+                results[index] = self._result(
+                    index, email, "conflict",
+                    message=f"Duplicate of row {first_row_by_email[email] + 1} in this import"
+                )
+                continue
+            first_row_by_email[email] = index
+            pending.append({"index": index, "name": name, "email": email, "password": row["password"]})
+
+        # Cheap read before the expensive part: no bcrypt work for emails already taken
+        existing = self.user_repository.get_existing_emails(user["email"] for user in pending)
+        to_create = []
+        for user in pending:
+            if user["email"] in existing:
+                results[user["index"]] = self._result(user["index"], user["email"], "conflict",
+                                                      message="Email already registered")
+            else:
+                to_create.append(user)
+
+        hashes = self._hash_passwords([user["password"] for user in to_create])
+        for user, hashed in zip(to_create, hashes):
+            user["password"] = hashed
+
+        for start in range(0, len(to_create), self.batch_size):
+            batch = to_create[start:start + self.batch_size]
+            try:
+                outcome = self.user_repository.create_users_batch(batch)
+            except DatabaseException as e:
+                for user in batch:
+                    results[user["index"]] = self._result(user["index"], user["email"], "error", message=e.message)
+                continue
+            for user in batch:
+                user_id = outcome["created"].get(user["email"])
+                if user_id is not None:
+                    results[user["index"]] = self._result(user["index"], user["email"], "created", user_id=user_id)
+                else:
+                    # Registered by someone else after the pre-check
+                    results[user["index"]] = self._result(user["index"], user["email"], "conflict",
+                                                          message="Email already registered")
+
+        email_filter = get_registered_email_filter()
+        if email_filter is not None:
+            for result in results:
+                if result["status"] == "created":
+                    email_filter.add(result["email"])
+
+        summary = {status: 0 for status in ("created", "conflict", "invalid", "error")}
+        for result in results:
+            summary[result["status"]] += 1
+        logger.info(f"User import finished: {summary}")
+        return {"total": len(rows), **summary, "results": results}
+
+    def _hash_passwords(self, passwords: List[str]) -> List[str]:
+        """Hash across the long-lived process pool; bcrypt dominates the import time"""
+        # Pass the cost explicitly: pool workers do not share the configured rounds
+        rounds = get_bcrypt_rounds()
+        workers = min(self.hash_workers, len(passwords))
+        if workers <= 1:
+            return [hash_password(password, rounds) for password in passwords]
+        chunksize = max(1, len(passwords) // (workers * 4))
+        pool = get_hash_pool(self.hash_workers)
+        return list(pool.map(hash_password, passwords, repeat(rounds), chunksize=chunksize))
+
+    @staticmethod
+    def _result(index: int, email: Any, status: str, user_id: Optional[int] = None,
+                message: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "row": index + 1,
+            "email": email if isinstance(email, str) else None,
+            "status": status,
+            "user_id": user_id,
+            "message": message
+        }
@@ -0,0 +1,96 @@
+"""Request coalescing for hot reads
+
+Concurrent callers asking for the same key while a load is in flight wait
+for that load and share its result instead of issuing their own query.
+Results are shared between callers and must be treated as read-only.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+import metrics
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls, for threads and asyncio tasks"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        metrics.register(f"singleflight.{name}", self.stats)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn` once for all threads concurrently requesting `key`"""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()` once for all tasks of the running loop requesting `key`"""
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            self.calls += 1
+            future = self._tasks.get(task_key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = loop.create_task(fn())
+                self._tasks[task_key] = future
+                self.executions += 1
+                future.add_done_callback(lambda _: self._forget_task(task_key, future))
+        # Shield so a cancelled caller does not cancel the shared load
+        return await asyncio.shield(future)
+
+    def _forget_task(self, task_key: Tuple[int, Hashable], future: asyncio.Future) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is future:
+                del self._tasks[task_key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
@@ -0,0 +1,33 @@
+from concurrent.futures import Future
+import services.auth_service as auth_module
+from services.auth_service import AuthService
+
+class InlineExecutor:
+    """Runs submitted work at once and records which pool got it"""
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+    def submit(self, fn, *args):
+        self.calls.append((self.name, fn.__name__))
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+class StubUserRepo:
+    def __init__(self):
+        self.updates = []
+    def update_password(self, user_id, new_hash, expected_hash=None):
+        self.updates.append((user_id, new_hash, expected_hash))
+        return True
+
+def test_rehash_hashes_in_the_auth_pool_and_updates_in_the_background(monkeypatch):
+    calls = []
+    monkeypatch.setattr(auth_module, "get_auth_executor", lambda: InlineExecutor("auth", calls))
+    monkeypatch.setattr(auth_module, "get_executor", lambda name: InlineExecutor(name, calls))
+    monkeypatch.setattr(auth_module, "hash_password", lambda password, rounds: f"new:{password}")
+    repo = StubUserRepo()
+    service = AuthService(user_repository=repo, email_filter=None)
+
+    service._schedule_rehash(7, "secret", "old-hash")
+    assert calls == [("auth", "<lambda>"), ("background", "_update_password_hash")]
+    assert repo.updates == [(7, "new:secret", "old-hash")]
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+import services.auth_service as auth_module
+from bloom import BloomFilter, RegisteredEmailFilter
+from services.auth_service import AuthService
+from handlers.exceptions import ConflictException
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"user{i}@example.com")
+    assert all(f"user{i}@example.com" in bloom for i in range(2000))
+    false_positives = sum(f"other{i}@example.com" in bloom for i in range(5000))
+    assert false_positives / 5000 < 0.03
+
+
+class StubUserRepo:
+    def __init__(self, registered):
+        self.registered = set(registered)
+        self.exists_queries = 0
+    def user_exists(self, email):
+        self.exists_queries += 1
+        return email in self.registered
+    def create_user(self, name, email, hashed_password):
+        self.registered.add(email)
+        return {"user_id": 1, "name": name, "email": email}
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    calls = []
+    async def fake_hash(password):
+        calls.append(password)
+        return "hashed"
+    monkeypatch.setattr(auth_module, "hash_password_async", fake_hash)
+    return calls
+
+
+def test_duplicate_signup_is_rejected_before_hashing(hashes):
+    repo = StubUserRepo(registered={"taken@example.com"})
+    email_filter = RegisteredEmailFilter(capacity=100)
+    email_filter.rebuild(repo.registered)
+    service = AuthService(user_repository=repo, email_filter=email_filter)
+
+    with pytest.raises(ConflictException):
+        asyncio.run(service.signup("Ana", "Taken@example.com", "secret1"))
+    assert hashes == []
+    assert repo.exists_queries == 1
+
+    asyncio.run(service.signup("Bo", "new@example.com", "secret1"))
+    # A definite negative from the filter skips the existence query entirely
+    assert repo.exists_queries == 1
+    assert hashes == ["secret1"]
+    assert email_filter.might_contain("new@example.com")
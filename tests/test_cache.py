@@ -0,0 +1,56 @@
+import pytest
+from cache import InMemoryCache, RedisCache, NullCache
+
+
+def test_memory_cache_tag_invalidation():
+    cache = InMemoryCache(max_entries=10)
+    cache.set("event:1", {"id": 1}, tags=["event:1"])
+    cache.set("event:2", {"id": 2}, tags=["event:2"])
+    assert cache.get("event:1") == {"id": 1}
+    cache.invalidate_tags("event:1")
+    assert cache.get("event:1") is None
+    assert cache.get("event:2") == {"id": 2}
+
+
+def test_memory_cache_returns_copies_and_evicts_lru():
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", {"attendees": []})
+    cache.get("a")["attendees"].append(1)
+    assert cache.get("a") == {"attendees": []}
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_get_or_load_discards_value_invalidated_while_loading():
+    cache = InMemoryCache()
+
+    def loader():
+        # A concurrent write lands while the value is being read
+        cache.invalidate_tags("event:1")
+        return "stale"
+
+    assert cache.get_or_load("event:1", loader, tags=["event:1"]) == "stale"
+    assert cache.get("event:1") is None
+
+
+def test_null_cache_always_loads():
+    cache = NullCache()
+    calls = []
+    for _ in range(2):
+        cache.get_or_load("k", lambda: calls.append(1) or "v")
+    assert len(calls) == 2
+
+
+def test_redis_cache_invalidation_is_shared_between_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    worker_a = RedisCache(client=fakeredis.FakeRedis(server=server))
+    worker_b = RedisCache(client=fakeredis.FakeRedis(server=server))
+
+    worker_a.set("search:1:abc", [{"id": 7}], tags=["user:1"])
+    assert worker_b.get("search:1:abc") == [{"id": 7}]
+    worker_b.invalidate_tags("user:1")
+    assert worker_a.get("search:1:abc") is None
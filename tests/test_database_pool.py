@@ -0,0 +1,68 @@
+import pytest
+import mysql.connector
+import database
+from database import ConnectionPool
+from handlers.exceptions import DatabaseConnectionException
+
+
+class FakeCursor:
+    def __init__(self):
+        self.closed = False
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursors = []
+        self.closed = False
+    def cursor(self, prepared=False):
+        cursor = FakeCursor()
+        self.cursors.append(cursor)
+        return cursor
+    def ping(self, reconnect=False, attempts=1):
+        pass
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+    def connect(**kwargs):
+        assert kwargs["autocommit"] is True
+        opened.append(FakeConnection())
+        return opened[-1]
+    monkeypatch.setattr(database.mysql.connector, "connect", connect)
+    return opened
+
+
+def test_connections_and_prepared_statements_are_reused(connections):
+    pool = ConnectionPool(size=2, timeout=0.05)
+    with pool.connection() as pooled:
+        first = pooled.prepared("SELECT 1")
+    with pool.connection() as pooled:
+        assert pooled.prepared("SELECT 1") is first
+    assert len(connections) == 1
+    assert pool.stats()["checkouts"] == 2
+
+
+def test_pool_is_bounded_and_times_out(connections):
+    pool = ConnectionPool(size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(DatabaseConnectionException):
+            with pool.connection():
+                pass
+    assert pool.stats()["waits"] == 1
+
+
+def test_connection_dropped_after_mysql_error(connections):
+    pool = ConnectionPool(size=1, timeout=0.05)
+    with pytest.raises(mysql.connector.Error):
+        with pool.connection():
+            raise mysql.connector.Error("gone away")
+    assert connections[0].closed
+    with pool.connection():
+        pass
+    assert len(connections) == 2
+    assert pool.stats()["discarded"] == 1
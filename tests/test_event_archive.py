@@ -0,0 +1,149 @@
+import pytest
+from datetime import date
+import services.event_archive_service as archive_module
+from services.event_archive_service import EventArchiveService, chunk_by_rows
+from handlers.exceptions import ValidationException
+
+class StubConnection:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+    def start_transaction(self):
+        pass
+    def commit(self):
+        self.committed = True
+    def rollback(self):
+        self.rolled_back = True
+    def close(self):
+        pass
+
+class StubEventRepo:
+    def __init__(self, events, rules=None):
+        # event_id -> (organizer_user_id, attendee_count); events are in the past unless given a rule
+        self.events = events
+        self.rules = rules or {}
+    def get_event_owners(self, event_ids, conn, for_update=False):
+        assert for_update
+        return {event_id: {"id": event_id, "organizer_user_id": self.events[event_id][0],
+                           "attendee_count": self.events[event_id][1],
+                           **self.rules.get(event_id, {"date": date(2020, 1, 1)})}
+                for event_id in event_ids if event_id in self.events}
+
+class StubArchiveRepo:
+    def __init__(self):
+        self.archived = []
+    def archive_events(self, event_ids, conn):
+        self.archived.append(list(event_ids))
+        return len(event_ids)
+
+class RecordingExecutor:
+    def __init__(self):
+        self.tasks = []
+    def submit(self, fn, *args):
+        self.tasks.append((fn, args))
+
+def test_small_archive_runs_in_one_transaction(monkeypatch):
+    monkeypatch.setattr(archive_module, "get_db_connection", StubConnection)
+    archive_repo = StubArchiveRepo()
+    service = EventArchiveService(event_repo=StubEventRepo({1: (7, 10), 2: (7, 20), 3: (8, 5)}),
+                                  archive_repo=archive_repo, sync_max_rows=100)
+    result = service.archive_events_bulk(organizer_id=7, event_ids=[1, 2, 3, 4])
+    assert archive_repo.archived == [[1, 2]]
+    assert (result["processed_count"], result["scheduled"]) == (2, False)
+    assert [r["status"] for r in result["results"]] == ["archived", "archived", "forbidden", "not_found"]
+
+def test_large_archive_is_chunked_in_the_background(monkeypatch):
+    monkeypatch.setattr(archive_module, "get_db_connection", StubConnection)
+    executor = RecordingExecutor()
+    monkeypatch.setattr(archive_module, "get_executor", lambda name: executor)
+    archive_repo = StubArchiveRepo()
+    service = EventArchiveService(event_repo=StubEventRepo({1: (7, 60), 2: (7, 30), 3: (7, 80)}),
+                                  archive_repo=archive_repo, sync_max_rows=100)
+    result = service.archive_events_bulk(organizer_id=7, event_ids=[1, 2, 3])
+    assert result["scheduled"] is True
+    assert {r["status"] for r in result["results"]} == {"scheduled"}
+    assert archive_repo.archived == []
+
+    fn, args = executor.tasks[0]
+    fn(*args)
+    assert archive_repo.archived == [[1, 2], [3]]
+
+def test_bulk_archive_skips_events_that_are_not_past(monkeypatch):
+    monkeypatch.setattr(archive_module, "get_db_connection", StubConnection)
+    archive_repo = StubArchiveRepo()
+    rules = {
+        2: {"date": date(2100, 1, 1)},
+        3: {"date": date(2020, 1, 6), "recurrence_freq": "weekly", "recurrence_interval": 1},
+        4: {"date": date(2020, 1, 6), "recurrence_freq": "weekly", "recurrence_interval": 1, "recurrence_count": 3},
+    }
+    service = EventArchiveService(event_repo=StubEventRepo({1: (7, 1), 2: (7, 1), 3: (7, 1), 4: (7, 1)}, rules),
+                                  archive_repo=archive_repo)
+    result = service.archive_events_bulk(organizer_id=7, event_ids=[1, 2, 3, 4])
+    assert archive_repo.archived == [[1, 4]]
+    assert [r["status"] for r in result["results"]] == ["archived", "not_past", "not_past", "archived"]
+
+def test_chunk_by_rows_and_id_validation():
+    assert chunk_by_rows([1, 2, 3, 4], {1: 5, 2: 500, 3: 1, 4: 1}, 10) == [[1], [2], [3, 4]]
+    with pytest.raises(ValidationException):
+        EventArchiveService(event_repo=StubEventRepo({}), archive_repo=StubArchiveRepo()).archive_events_bulk(7, [])
+
+class StubPastArchiveRepo(StubArchiveRepo):
+    """Events 1..7 in id order; the even ones are past the horizon"""
+    def __init__(self, archived_through=None, archived_events=()):
+        super().__init__()
+        self.archived_through = archived_through
+        self.archived_events = list(archived_events)
+        self.searches = []
+    def find_archivable(self, cutoff, after_id, limit):
+        scanned = [event_id for event_id in range(1, 8) if event_id > after_id][:limit]
+        return [event_id for event_id in scanned if event_id % 2 == 0], (scanned[-1] if scanned else after_id)
+    def get_archived_through(self):
+        return self.archived_through
+    def search_events(self, **filters):
+        self.searches.append(filters)
+        return [dict(event) for event in self.archived_events]
+
+def test_archive_job_walks_the_table_in_batches(monkeypatch):
+    monkeypatch.setattr(archive_module, "get_db_connection", StubConnection)
+    archive_repo = StubPastArchiveRepo()
+    service = EventArchiveService(event_repo=StubEventRepo({event_id: (7, 1) for event_id in range(1, 8)}),
+                                  archive_repo=archive_repo)
+    result = service.archive_past_events(before=date(2024, 1, 1), batch_size=3)
+    assert archive_repo.archived == [[2], [4, 6]]
+    assert (result["archived"], result["failed"]) == (3, 0)
+
+def test_reads_only_reach_into_the_archive_when_the_range_does():
+    from services.event_service import EventService, by_date
+    archived = {"id": 3, "date": date(2021, 5, 1), "archived_at": date(2023, 1, 1), "attendees": []}
+    archive_repo = StubPastArchiveRepo(archived_through=date(2022, 12, 31), archived_events=[archived])
+    service = EventService(event_repo=object(), attendee_repo=object(), archive_repo=archive_repo)
+    live = [{"id": 9, "date": date(2024, 2, 1), "attendees": []}, {"id": 8, "date": date(2020, 3, 1), "attendees": []}]
+
+    assert service._with_archived(live, date(2023, 6, 1), by_date, user_id=1, role="organizer") == live
+    assert archive_repo.searches == []
+    # Archived rows are merged in the order of the live list
+    merged = service._with_archived(live, date(2020, 1, 1), by_date, user_id=1, role="organizer", end_date=None)
+    assert [event["id"] for event in merged] == [9, 3, 8]
+    assert archive_repo.searches == [{"start_date": date(2020, 1, 1), "user_id": 1, "role": "organizer", "end_date": None}]
+    # An empty archive is never searched
+    archive_repo.archived_through = None
+    assert service._with_archived(live, None, by_date, user_id=1) == live
+    assert len(archive_repo.searches) == 1
+
+class StubListEventRepo:
+    def get_events_by_organizer(self, user_id):
+        return [{"id": 9, "date": date(2024, 2, 1)}]
+
+class StubListAttendeeRepo:
+    def get_attendees(self, event_id):
+        return []
+    def get_occurrence_overrides(self, event_ids, start_date, end_date):
+        return {}
+
+def test_polled_lists_without_a_window_never_read_the_archive():
+    from services.event_service import EventService
+    archive_repo = StubPastArchiveRepo(archived_through=date(2022, 12, 31))
+    archive_repo.get_archived_through = lambda: pytest.fail("archive state read for a plain list")
+    service = EventService(event_repo=StubListEventRepo(), attendee_repo=StubListAttendeeRepo(), archive_repo=archive_repo)
+    assert [event["id"] for event in service.get_organized_events(1)] == [9]
+    assert archive_repo.searches == []
@@ -0,0 +1,111 @@
+import io
+import pytest
+from datetime import date, time
+import services.event_import_service as import_module
+from services.event_import_service import EventImportService, iter_event_rows
+from handlers.exceptions import ValidationException, DatabaseException
+
+ICS = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VEVENT\r
+SUMMARY:Team sync\\, weekly\r
+DTSTART;TZID=Africa/Cairo:20301105T093000\r
+LOCATION:Room 4\r
+DESCRIPTION:Agenda:\\n- status\r
+  updates\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+SUMMARY:Holiday\r
+DTSTART;VALUE=DATE:20301225\r
+LOCATION:Everywhere\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+class StubConnection:
+    def __init__(self):
+        self.committed = False
+    def start_transaction(self, consistent_snapshot=False):
+        assert consistent_snapshot
+    def commit(self):
+        self.committed = True
+    def rollback(self):
+        pass
+    def close(self):
+        pass
+
+class StubEventRepo:
+    def __init__(self, fail_on_batch=None):
+        self.batches = []
+        self.fail_on_batch = fail_on_batch
+    def create_events_batch(self, organizer_user_id, events, conn):
+        self.batches.append([event["title"] for event in events])
+        if len(self.batches) == self.fail_on_batch:
+            raise DatabaseException("Failed to create events: deadlock")
+        start = 100 * len(self.batches)
+        return list(range(start, start + len(events)))
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+    def add_organizer_rows(self, event_ids, user_id, conn):
+        self.calls.append(("attendees", list(event_ids)))
+    def add_user_entries(self, user_id, role, events, conn):
+        self.calls.append(("feed", [event["id"] for event in events]))
+    def initialize(self, event_ids, conn):
+        self.calls.append(("counts", list(event_ids)))
+
+class StubUserRepo:
+    def get_user_by_id(self, user_id):
+        return {"id": user_id} if user_id == 7 else None
+
+def make_service(event_repo, recorder, monkeypatch):
+    monkeypatch.setattr(import_module, "get_db_connection", StubConnection)
+    service = EventImportService(event_repo=event_repo, attendee_repo=recorder, feed_repo=recorder,
+                                 rsvp_count_repo=recorder, batch_size=2)
+    service.user_repo = StubUserRepo()
+    return service
+
+def test_ics_events_are_unfolded_and_unescaped():
+    rows = list(iter_event_rows(io.StringIO(ICS, newline=""), "ics"))
+    assert rows[0] == {"title": "Team sync, weekly", "date": "2030-11-05", "time": "09:30:00",
+                       "location": "Room 4", "description": "Agenda:\n- status updates"}
+    assert (rows[1]["date"], rows[1]["time"]) == ("2030-12-25", "00:00:00")
+
+def test_csv_header_is_checked():
+    with pytest.raises(ValidationException):
+        list(iter_event_rows(io.StringIO("title,date\nA,2030-01-01\n"), "csv"))
+    with pytest.raises(ValidationException):
+        list(iter_event_rows(io.StringIO(""), "xlsx"))
+
+def test_import_writes_batches_and_reports_each_row(monkeypatch):
+    csv_text = (
+        "title,date,time,location,description\n"
+        "Kickoff,2030-01-10,09:00,Cairo,\n"
+        "No date,,09:00,Cairo,\n"
+        "Retro,2030-01-24,17:30,Giza,Sprint retro\n"
+        "Launch,2030-02-01,10:00,Cairo,\n"
+    )
+    event_repo, recorder = StubEventRepo(), Recorder()
+    service = make_service(event_repo, recorder, monkeypatch)
+    result = service.import_events(7, iter_event_rows(io.StringIO(csv_text), "csv"))
+
+    assert [r["status"] for r in result["results"]] == ["created", "invalid", "created", "created"]
+    assert [r["event_id"] for r in result["results"]] == [100, None, 101, 200]
+    assert (result["total"], result["created"], result["invalid"], result["truncated"]) == (4, 3, 1, False)
+    assert event_repo.batches == [["Kickoff", "Retro"], ["Launch"]]
+    # Organizer row, feed row and counters are written for every event of the batch
+    assert recorder.calls[:3] == [("attendees", [100, 101]), ("feed", [100, 101]), ("counts", [100, 101])]
+
+def test_failed_batch_does_not_stop_the_import(monkeypatch):
+    rows = [{"title": f"Event {i}", "date": date(2030, 1, i + 1), "time": time(9), "location": "Cairo"} for i in range(4)]
+    service = make_service(StubEventRepo(fail_on_batch=1), Recorder(), monkeypatch)
+    result = service.import_events(7, rows)
+    assert [r["status"] for r in result["results"]] == ["error", "error", "created", "created"]
+    assert result["results"][0]["message"] == "Failed to create events: deadlock"
+
+def test_import_stops_at_row_limit(monkeypatch):
+    monkeypatch.setattr(import_module, "EVENT_IMPORT_MAX_ROWS", 3)
+    rows = [{"title": f"Event {i}", "date": "2030-01-01", "time": "09:00", "location": "Cairo"} for i in range(5)]
+    result = make_service(StubEventRepo(), Recorder(), monkeypatch).import_events(7, iter(rows))
+    assert (result["total"], result["created"], result["truncated"]) == (3, 3, True)
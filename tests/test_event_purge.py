@@ -0,0 +1,157 @@
+import pytest
+import services.event_service as event_service_module
+import services.event_purge_service as purge_module
+from services.event_service import EventService
+from services.event_purge_service import EventPurgeService
+from handlers.exceptions import NotFoundException, PermissionException, ServiceUnavailableException, DatabaseException
+
+class StubConnection:
+    def start_transaction(self):
+        pass
+    def commit(self):
+        self.committed = True
+    def rollback(self):
+        pass
+    def close(self):
+        pass
+
+class StubPurgeRepo:
+    def __init__(self, job=None):
+        self.job = job
+        self.updates = []
+        self.created = []
+    def create_job(self, event_id, organizer_user_id, conn):
+        self.created.append((event_id, organizer_user_id))
+    def get_job(self, event_id):
+        return self.job
+    def update_progress(self, event_id, status, total_rows=None, purged_rows=None, error=None):
+        self.updates.append((status, total_rows, purged_rows, error))
+    def list_unfinished(self):
+        return [self.job] if self.job else []
+
+class StubRowsRepo:
+    """Attendee rows and feed rows of one event, removed chunk by chunk"""
+    def __init__(self, attendee_rows, feed_rows, fail_after=None):
+        self.attendee_rows = attendee_rows
+        self.feed_rows = feed_rows
+        self.fail_after = fail_after
+        self.chunks = 0
+    def count_event_rows(self, event_id):
+        return self.attendee_rows
+    def delete_event_rows_chunk(self, event_id, limit):
+        self.chunks += 1
+        if self.fail_after is not None and self.chunks > self.fail_after:
+            raise DatabaseException("Failed to purge event rows: lock wait timeout")
+        removed = min(limit, self.attendee_rows)
+        self.attendee_rows -= removed
+        return removed
+    def delete_event_entries_chunk(self, event_id, limit):
+        removed = min(limit, self.feed_rows)
+        self.feed_rows -= removed
+        return removed
+
+class StubEventRepo:
+    def __init__(self):
+        self.deleted = []
+        self.soft_deleted = []
+    def get_event_by_id(self, event_id):
+        return None if event_id in self.soft_deleted else {"id": event_id, "organizer_user_id": 1}
+    def soft_delete_event(self, event_id, conn=None):
+        self.soft_deleted.append(event_id)
+        return True
+    def delete_event(self, event_id, conn=None):
+        self.deleted.append(event_id)
+
+def make_purge_service(rows, purge_repo, event_repo=None):
+    return EventPurgeService(event_repo=event_repo or StubEventRepo(), attendee_repo=rows, feed_repo=rows,
+                             purge_repo=purge_repo, chunk_size=2, pause_ms=0)
+
+def test_purge_removes_rows_in_chunks_and_records_progress():
+    rows, purge_repo, event_repo = StubRowsRepo(attendee_rows=5, feed_rows=3), StubPurgeRepo(), StubEventRepo()
+    result = make_purge_service(rows, purge_repo, event_repo).purge_event(10)
+
+    assert result == {"event_id": 10, "status": "done", "total_rows": 5, "purged_rows": 5}
+    assert (rows.attendee_rows, rows.feed_rows) == (0, 0)
+    assert [update[2] for update in purge_repo.updates] == [0, 2, 4, 5, 5]
+    assert purge_repo.updates[-1][0] == "done"
+    # The event row is removed only once nothing references it
+    assert event_repo.deleted == [10]
+
+def test_failed_purge_is_recorded_and_resumed_from_its_progress():
+    rows, purge_repo, event_repo = StubRowsRepo(attendee_rows=5, feed_rows=0, fail_after=1), StubPurgeRepo(), StubEventRepo()
+    service = make_purge_service(rows, purge_repo, event_repo)
+    assert service.purge_event(10)["status"] == "failed"
+    assert purge_repo.updates[-1] == ("failed", None, None, "Failed to purge event rows: lock wait timeout")
+    assert event_repo.deleted == []
+
+    rows.fail_after = None
+    purge_repo.job = {"event_id": 10, "purged_rows": 2}
+    assert service.resume_unfinished() == [{"event_id": 10, "status": "done", "total_rows": 5, "purged_rows": 5}]
+
+def test_delete_hides_the_event_and_schedules_the_purge(monkeypatch):
+    monkeypatch.setattr(event_service_module, "get_db_connection", StubConnection)
+    event_repo, purge_repo = StubEventRepo(), StubPurgeRepo()
+    purge_service = make_purge_service(StubRowsRepo(0, 0), purge_repo, event_repo)
+    scheduled = []
+    monkeypatch.setattr(purge_service, "schedule", scheduled.append)
+    service = EventService(event_repo=event_repo, attendee_repo=object(), purge_service=purge_service)
+
+    service.delete_event(event_id=10, user_id=1)
+    assert event_repo.soft_deleted == [10] and event_repo.deleted == []
+    assert purge_repo.created == [(10, 1)]
+    assert scheduled == [10]
+    with pytest.raises(NotFoundException):
+        service.delete_event(event_id=10, user_id=1)
+
+def test_busy_background_pool_leaves_the_purge_pending(monkeypatch):
+    class BusyExecutor:
+        def submit(self, fn, *args):
+            raise ServiceUnavailableException()
+    monkeypatch.setattr(purge_module, "get_executor", lambda name: BusyExecutor())
+    purge_repo = StubPurgeRepo()
+    make_purge_service(StubRowsRepo(1, 1), purge_repo).schedule(10)
+    assert purge_repo.updates == []
+
+def test_deletion_status_is_visible_to_the_organizer_only():
+    job = {"event_id": 10, "organizer_user_id": 1, "status": "running", "total_rows": 8, "purged_rows": 2,
+           "error": None, "created_at": None, "finished_at": None}
+    service = make_purge_service(StubRowsRepo(0, 0), StubPurgeRepo(job))
+    assert service.get_deletion_status(10, 1)["progress"] == 0.25
+    with pytest.raises(PermissionException):
+        service.get_deletion_status(10, 2)
+    with pytest.raises(NotFoundException):
+        make_purge_service(StubRowsRepo(0, 0), StubPurgeRepo()).get_deletion_status(10, 1)
+
+class StubOwnersEventRepo(StubEventRepo):
+    def __init__(self, owners):
+        super().__init__()
+        self.owners = owners
+        self.owner_lookups = 0
+    def get_event_owners(self, event_ids, conn, for_update=False):
+        self.owner_lookups += 1
+        return {event_id: {"id": event_id, "organizer_user_id": self.owners[event_id], "attendee_count": 3}
+                for event_id in event_ids if event_id in self.owners}
+    def soft_delete_events(self, event_ids, conn):
+        self.soft_deleted.extend(event_ids)
+        return len(event_ids)
+
+def test_bulk_delete_checks_ownership_once_and_purges_in_one_task(monkeypatch):
+    monkeypatch.setattr(event_service_module, "get_db_connection", StubConnection)
+    event_repo, purge_repo = StubOwnersEventRepo({10: 1, 11: 2, 12: 1}), StubPurgeRepo()
+    purge_repo.create_jobs = lambda event_ids, organizer_user_id, conn: purge_repo.created.extend(event_ids)
+    purge_service = make_purge_service(StubRowsRepo(0, 0), purge_repo, event_repo)
+    scheduled = []
+    monkeypatch.setattr(purge_service, "schedule_many", scheduled.append)
+    service = EventService(event_repo=event_repo, attendee_repo=object(), purge_service=purge_service)
+
+    result = service.delete_events_bulk(organizer_id=1, event_ids=[12, 11, 99, 10, 12])
+    assert result["processed_count"] == 2
+    assert result["results"] == [
+        {"event_id": 12, "status": "deleted"},
+        {"event_id": 11, "status": "forbidden"},
+        {"event_id": 99, "status": "not_found"},
+        {"event_id": 10, "status": "deleted"},
+    ]
+    assert event_repo.owner_lookups == 1
+    assert event_repo.soft_deleted == [12, 10] and purge_repo.created == [12, 10]
+    assert scheduled == [[12, 10]]
@@ -1,5 +1,6 @@
 import pytest
 from services.event_service import EventService
+from handlers.exceptions import PermissionException, ValidationException
 
 class StubEventRepo:
     def __init__(self, organizer_id: int):
@@ -9,6 +10,9 @@ class StubEventRepo:
         return {"id": event_id, "organizer_user_id": self.organizer_id}
     def delete_event(self, event_id: int, conn=None):
         self.deleted = True
+    def soft_delete_event(self, event_id: int, conn=None):
+        self.deleted = True
+        return True
 
 class StubAttendeeRepo:
     pass
@@ -24,3 +28,314 @@ def test_delete_event_permission():
     assert stub_repo.deleted is True
 
 
+class StubVersionAttendeeRepo:
+    def __init__(self):
+        self.version = {"attendee_count": 2, "attendees_updated_at": "2025-01-01 10:00:00", "checksum": 17}
+    def get_attendees_version(self, event_id: int):
+        return dict(self.version)
+    def is_user_attendee(self, event_id: int, user_id: int):
+        return user_id in (1, 2)
+
+def test_attendees_etag_changes_with_version():
+    attendee_repo = StubVersionAttendeeRepo()
+    service = EventService(event_repo=StubEventRepo(organizer_id=1), attendee_repo=attendee_repo)
+    first = service.get_event_attendees_etag(event_id=10, requesting_user_id=2)
+    assert first == service.get_event_attendees_etag(event_id=10, requesting_user_id=1)
+    attendee_repo.version["checksum"] = 18
+    assert service.get_event_attendees_etag(event_id=10, requesting_user_id=2) != first
+
+class StubListAttendeeRepo(StubVersionAttendeeRepo):
+    def __init__(self):
+        super().__init__()
+        self.rows = [{"user_id": 1, "role": "organizer", "attendance_status": "going"}]
+    def is_user_organizer(self, event_id: int, user_id: int):
+        return user_id == 1
+    def get_attendees(self, event_id: int):
+        return [dict(row) for row in self.rows]
+
+def test_body_sent_with_an_etag_is_not_older_than_it():
+    from cache import InMemoryCache
+    attendee_repo = StubListAttendeeRepo()
+    service = EventService(event_repo=StubEventRepo(organizer_id=1), attendee_repo=attendee_repo, cache=InMemoryCache())
+    assert service.get_event_attendees(event_id=10, requesting_user_id=1)[0]["attendance_status"] == "going"
+    # A write the cache has not heard about yet (committed, tags not yet bumped)
+    attendee_repo.rows[0]["attendance_status"] = "maybe"
+    assert service.get_event_attendees(event_id=10, requesting_user_id=1)[0]["attendance_status"] == "going"
+    fresh = service.get_event_attendees(event_id=10, requesting_user_id=1, as_of='W/"v2"')
+    assert fresh[0]["attendance_status"] == "maybe"
+
+def test_list_written_to_while_loading_is_not_cached():
+    from cache import InMemoryCache
+    cache = InMemoryCache()
+    attendee_repo = StubListAttendeeRepo()
+    service = EventService(event_repo=StubEventRepo(organizer_id=1), attendee_repo=attendee_repo, cache=cache)
+    titles = {10: "Launch"}
+    loads = []
+
+    def loader(write=False):
+        loads.append(1)
+        events = [{"id": event_id, "title": title} for event_id, title in titles.items()]
+        if write:
+            # A write to a listed event commits and invalidates while the list is read
+            titles[10] = "Renamed"
+            cache.invalidate_tags("event:10")
+        return events
+
+    # First load only learns the ids; the second is cached
+    service._get_event_list("organized:1", 1, loader)
+    service._get_event_list("organized:1", 1, loader)
+    assert service._get_event_list("organized:1", 1, loader)[0]["title"] == "Launch"
+    assert len(loads) == 2
+    cache.invalidate_tags("event:10")
+    assert service._get_event_list("organized:1", 1, lambda: loader(write=True))[0]["title"] == "Launch"
+    assert service._get_event_list("organized:1", 1, loader)[0]["title"] == "Renamed"
+
+class BlockingEventRepo:
+    def __init__(self):
+        import threading
+        self.started = threading.Event()
+        self.release = threading.Event()
+    def get_event_by_id(self, event_id: int):
+        self.started.set()
+        self.release.wait(5)
+        return {"id": event_id, "title": "before write"}
+
+def test_follower_does_not_cache_a_read_invalidated_while_in_flight():
+    import threading
+    import time
+    from cache import InMemoryCache
+    cache = InMemoryCache()
+    event_repo = BlockingEventRepo()
+    service = EventService(event_repo=event_repo, attendee_repo=StubAttendeeRepo(), cache=cache)
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(service._get_event(10)))
+    leader.start()
+    event_repo.started.wait(5)
+    # A write commits and invalidates while the leader's query is in flight
+    cache.invalidate_tags("event:10")
+    follower = threading.Thread(target=lambda: results.append(service._get_event(10)))
+    follower.start()
+    while service.reads.stats()["coalesced"] < 1:
+        time.sleep(0.005)
+    event_repo.release.set()
+    leader.join()
+    follower.join()
+
+    assert results == [{"id": 10, "title": "before write"}] * 2
+    assert cache.get("event:10") is None
+
+def test_if_none_match_weak_comparison():
+    from routes.events import _etag_matches
+    etag = 'W/"abc123"'
+    assert _etag_matches('W/"abc123"', etag)
+    assert _etag_matches('"zzz", "abc123"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('W/"other"', etag)
+    assert not _etag_matches(None, etag)
+
+
+class StubConnection:
+    def start_transaction(self):
+        pass
+    def commit(self):
+        self.committed = True
+    def rollback(self):
+        pass
+    def close(self):
+        pass
+
+class StubBulkAttendeeRepo:
+    def __init__(self, organizer_id, attendees):
+        self.organizer_id = organizer_id
+        self.attendees = set(attendees)
+        self.inserted = []
+    def is_user_organizer(self, event_id, user_id):
+        return user_id == self.organizer_id
+    def get_attendee_user_ids(self, event_id, user_ids, conn, for_update=False):
+        return {user_id for user_id in user_ids if user_id in self.attendees}
+    def add_attendees_batch(self, event_id, user_ids, role, conn):
+        self.inserted.append(list(user_ids))
+        return len(user_ids)
+
+class StubUserRepo:
+    def __init__(self, user_ids):
+        self.user_ids = set(user_ids)
+    def get_existing_user_ids(self, user_ids, conn=None, lock=False):
+        return {user_id for user_id in user_ids if user_id in self.user_ids}
+    def get_user_ids_by_emails(self, emails):
+        self.email_lookups = getattr(self, "email_lookups", 0) + 1
+        return {email: int(email[4:-12]) for email in emails if email[4:-12].isdigit() and int(email[4:-12]) in self.user_ids}
+
+class StubFeedRepo:
+    def __init__(self):
+        self.added = []
+    def add_entries(self, event_id, user_ids, role, event_date, title, conn):
+        self.added.extend(user_ids)
+
+class StubCountRepo:
+    def __init__(self):
+        self.increments = []
+    def increment(self, event_id, status, conn, amount=1):
+        self.increments.append((status, amount))
+
+class StubBulkEventRepo:
+    def get_event_by_id(self, event_id):
+        return {"id": event_id, "organizer_user_id": 1, "date": "2030-01-01", "title": "Launch"}
+
+def test_bulk_invite_reports_per_user_outcomes(monkeypatch):
+    import services.event_service as event_service_module
+    monkeypatch.setattr(event_service_module, "get_db_connection", StubConnection)
+    attendee_repo = StubBulkAttendeeRepo(organizer_id=1, attendees={1, 3})
+    feed_repo, count_repo = StubFeedRepo(), StubCountRepo()
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=attendee_repo,
+                           feed_repo=feed_repo, rsvp_count_repo=count_repo)
+    service.user_repo = StubUserRepo({1, 2, 3, 4})
+
+    result = service.invite_users_bulk(event_id=10, inviter_id=1, user_ids=[2, 3, 1, 99, 4, 2])
+    assert result["invited_count"] == 2
+    assert result["results"] == [
+        {"user_id": 2, "status": "invited"},
+        {"user_id": 3, "status": "already_invited"},
+        {"user_id": 1, "status": "self"},
+        {"user_id": 99, "status": "unknown_user"},
+        {"user_id": 4, "status": "invited"},
+    ]
+    # One batched insert, with the feed and counters kept in step
+    assert attendee_repo.inserted == [[2, 4]]
+    assert feed_repo.added == [2, 4]
+    assert count_repo.increments == [("pending", 2)]
+
+def test_bulk_invite_requires_organizer():
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=StubBulkAttendeeRepo(organizer_id=1, attendees={1}))
+    with pytest.raises(PermissionException):
+        service.invite_users_bulk(event_id=10, inviter_id=2, user_ids=[3])
+
+def test_bulk_invite_resolves_emails_in_one_lookup(monkeypatch):
+    import services.event_service as event_service_module
+    monkeypatch.setattr(event_service_module, "get_db_connection", StubConnection)
+    attendee_repo = StubBulkAttendeeRepo(organizer_id=1, attendees={1})
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=attendee_repo,
+                           feed_repo=StubFeedRepo(), rsvp_count_repo=StubCountRepo())
+    service.user_repo = StubUserRepo({1, 2, 3})
+
+    result = service.invite_users_bulk(
+        event_id=10, inviter_id=1, user_ids=[2],
+        emails=[" USER2@example.com", "user3@example.com", "user3@Example.com", "user9@example.com", "not-an-email",
+                "also bad", "not-an-email"]
+    )
+    assert service.user_repo.email_lookups == 1
+    assert result["invited_count"] == 2
+    assert attendee_repo.inserted == [[2, 3]]
+    assert result["results"] == [
+        {"user_id": 2, "status": "invited"},
+        {"user_id": 2, "email": "user2@example.com", "status": "invited"},
+        {"user_id": 3, "email": "user3@example.com", "status": "invited"},
+        {"user_id": None, "email": "user9@example.com", "status": "unknown_email"},
+        {"user_id": None, "email": "not-an-email", "status": "invalid_email"},
+        {"user_id": None, "email": "also bad", "status": "invalid_email"},
+    ]
+    assert result["unresolved_emails"] == ["user9@example.com", "not-an-email", "also bad"]
+
+class StubStatusAttendeeRepo(StubBulkAttendeeRepo):
+    def __init__(self, organizer_id, statuses):
+        super().__init__(organizer_id, statuses)
+        self.statuses = dict(statuses)
+        self.updates = []
+    def get_attendance_statuses(self, event_id, user_ids, conn, for_update=False):
+        return {user_id: self.statuses[user_id] for user_id in user_ids if user_id in self.statuses}
+    def update_attendance_statuses(self, event_id, statuses, conn):
+        self.updates.append(dict(statuses))
+        return len(statuses)
+
+class StubStatusFeedRepo:
+    def __init__(self):
+        self.updates = []
+    def update_statuses(self, event_id, statuses, conn):
+        self.updates.append(dict(statuses))
+
+class StubDeltaCountRepo:
+    def __init__(self):
+        self.deltas = []
+    def apply_deltas(self, event_id, deltas, conn):
+        self.deltas.append(deltas)
+
+def test_bulk_attendance_update_applies_one_batch(monkeypatch):
+    import services.event_service as event_service_module
+    monkeypatch.setattr(event_service_module, "get_db_connection", StubConnection)
+    attendee_repo = StubStatusAttendeeRepo(organizer_id=1, statuses={1: "going", 2: "pending", 3: "maybe", 4: "pending"})
+    feed_repo, count_repo = StubStatusFeedRepo(), StubDeltaCountRepo()
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=attendee_repo,
+                           feed_repo=feed_repo, rsvp_count_repo=count_repo)
+
+    result = service.update_attendance_statuses_bulk(event_id=10, organizer_id=1, updates=[
+        {"user_id": 2, "status": "going"},
+        {"user_id": 3, "status": "maybe"},
+        {"user_id": 99, "status": "going"},
+        {"user_id": 4, "status": "maybe"},
+        {"user_id": 4, "status": "Going"},
+    ])
+    assert result["updated_count"] == 2
+    assert result["results"] == [
+        {"user_id": 2, "status": "going", "result": "updated"},
+        {"user_id": 3, "status": "maybe", "result": "unchanged"},
+        {"user_id": 99, "status": "going", "result": "not_attendee"},
+        {"user_id": 4, "status": "going", "result": "updated"},
+    ]
+    assert attendee_repo.updates == [{2: "going", 4: "going"}]
+    assert feed_repo.updates == [{2: "going", 4: "going"}]
+    assert count_repo.deltas == [{"pending": -2, "going": 2}]
+
+def test_bulk_attendance_update_rejects_invalid_status_before_writing():
+    attendee_repo = StubStatusAttendeeRepo(organizer_id=1, statuses={1: "going", 2: "pending"})
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=attendee_repo)
+    with pytest.raises(ValidationException):
+        service.update_attendance_statuses_bulk(event_id=10, organizer_id=1, updates=[
+            {"user_id": 2, "status": "going"}, {"user_id": 2, "status": "sometimes"}
+        ])
+    with pytest.raises(PermissionException):
+        service.update_attendance_statuses_bulk(event_id=10, organizer_id=2, updates=[{"user_id": 2, "status": "going"}])
+    assert attendee_repo.updates == []
+
+class StubStoredStatusAttendeeRepo(StubStatusAttendeeRepo):
+    def update_attendance_statuses(self, event_id, statuses, conn):
+        self.statuses.update(statuses)
+        return super().update_attendance_statuses(event_id, statuses, conn)
+
+def test_bulk_attendance_update_is_not_overwritten_by_a_queued_status(monkeypatch):
+    import services.event_service as event_service_module
+    from write_behind import AttendanceWriteBehindQueue
+    monkeypatch.setattr(event_service_module, "get_db_connection", StubConnection)
+    attendee_repo = StubStoredStatusAttendeeRepo(organizer_id=1, statuses={1: "going", 2: "pending"})
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=attendee_repo,
+                           feed_repo=StubStatusFeedRepo(), rsvp_count_repo=StubDeltaCountRepo())
+    service.attendance_queue = AttendanceWriteBehindQueue(service._apply_attendance_statuses, interval_seconds=60)
+
+    service.attendance_queue.submit(10, 2, "maybe")
+    service.update_attendance_statuses_bulk(event_id=10, organizer_id=1, updates=[{"user_id": 2, "status": "not_going"}])
+    service.attendance_queue.flush()
+    assert attendee_repo.statuses[2] == "not_going"
+
+class StubOverrideAttendeeRepo:
+    def __init__(self, overrides):
+        self.overrides = overrides
+    def get_occurrence_overrides(self, event_ids, start_date, end_date):
+        return self.overrides if event_ids else {}
+
+def test_occurrences_apply_sparse_attendance_overrides():
+    from datetime import date
+    overrides = {(5, date(2030, 1, 8)): {2: "not_going"}}
+    service = EventService(event_repo=StubBulkEventRepo(), attendee_repo=StubOverrideAttendeeRepo(overrides))
+    series = {
+        "id": 5, "date": date(2030, 1, 1), "recurrence_freq": "weekly", "recurrence_interval": 1,
+        "attendees": [{"user_id": 1, "role": "organizer", "attendance_status": "going"},
+                      {"user_id": 2, "role": "attendee", "attendance_status": "going"}],
+    }
+    events = service._expand_recurring([series], date(2030, 1, 1), date(2030, 1, 14))
+    assert [e["date"] for e in events] == [date(2030, 1, 8), date(2030, 1, 1)]
+    assert [a["attendance_status"] for a in events[0]["attendees"]] == ["going", "not_going"]
+    assert (events[0]["going_count"], events[0]["not_going_count"]) == (1, 1)
+    assert events[1]["going_count"] == 2
+
+    going = service._expand_recurring([series], date(2030, 1, 1), date(2030, 1, 14), user_id=2, attendance_status="going")
+    assert [e["date"] for e in going] == [date(2030, 1, 1)]
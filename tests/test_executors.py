@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import pytest
+from executors import BoundedExecutor
+from handlers.exceptions import ServiceUnavailableException
+
+
+def test_run_returns_result_from_pool():
+    executor = BoundedExecutor("test_run", max_workers=2, max_queue=2)
+    try:
+        assert asyncio.run(executor.run(pow, 2, 10)) == 1024
+    finally:
+        executor.shutdown()
+
+
+def test_rejects_work_when_queue_is_full():
+    executor = BoundedExecutor("test_full", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = [executor.submit(release.wait), executor.submit(release.wait)]
+        with pytest.raises(ServiceUnavailableException):
+            executor.submit(release.wait)
+        release.set()
+        for future in running:
+            future.result(timeout=5)
+        # Slots are returned before callers see the result
+        assert executor.submit(lambda: "ok").result(timeout=5) == "ok"
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 3
+        assert stats["queued"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_queue_wait_is_measured():
+    executor = BoundedExecutor("test_wait", max_workers=1, max_queue=4)
+    release = threading.Event()
+    try:
+        blocker = executor.submit(release.wait)
+        waiting = executor.submit(lambda: None)
+        assert executor.stats()["queued"] == 1
+        threading.Timer(0.05, release.set).start()
+        blocker.result(timeout=5)
+        waiting.result(timeout=5)
+        assert executor.stats()["queue_wait_max_ms"] >= 40
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_import_pool_rejects_past_its_workers(monkeypatch):
+    import executors
+    monkeypatch.setitem(executors.EXECUTOR_CONFIG, "import", {"kind": "thread", "max_workers": 1, "max_queue": 0})
+    monkeypatch.setattr(executors, "_executors", {})
+    release = threading.Event()
+    try:
+        running = executors.get_executor("import").submit(release.wait)
+        with pytest.raises(ServiceUnavailableException):
+            executors.get_executor("import").submit(release.wait)
+        # The background pool is unaffected
+        assert executors.get_executor("background").submit(lambda: "ok").result(timeout=5) == "ok"
+        release.set()
+        running.result(timeout=5)
+    finally:
+        release.set()
+        executors.shutdown_executors()
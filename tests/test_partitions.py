@@ -0,0 +1,45 @@
+from datetime import date
+from partitions import (
+    add_months, bounds_to_add, initial_partitioning, parse_bound, partition_definitions, partition_name, period_start
+)
+from models.event_repository import build_search_query
+
+def test_periods_and_names():
+    assert add_months(date(2030, 11, 15), 3) == date(2031, 2, 1)
+    assert period_start(date(2031, 8, 20), 3) == date(2031, 7, 1)
+    assert period_start(date(2031, 8, 20), 1) == date(2031, 8, 1)
+    assert partition_name(date(2031, 7, 1), 3) == "p2031q3"
+    assert partition_name(date(2031, 7, 1), 1) == "p2031m07"
+
+def test_partitions_are_added_until_the_horizon_is_covered():
+    # Current quarter is 2031 Q3; 6 months ahead means bounds up to 2032-04-01
+    bounds = bounds_to_add(date(2031, 7, 1), date(2031, 8, 20), 3, 6)
+    assert bounds == [date(2031, 10, 1), date(2032, 1, 1), date(2032, 4, 1)]
+    assert bounds_to_add(date(2032, 4, 1), date(2031, 8, 20), 3, 6) == []
+    assert partition_definitions(date(2031, 7, 1), bounds[:1], 3) == [
+        "PARTITION p2031q3 VALUES LESS THAN ('2031-10-01')",
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE)",
+    ]
+
+def test_initial_partitioning_and_bound_parsing():
+    clause = initial_partitioning("date", date(2031, 2, 10), 3, date(2031, 5, 1), 0)
+    assert clause == (
+        "PARTITION BY RANGE COLUMNS(date) ("
+        "PARTITION p_history VALUES LESS THAN ('2031-01-01'), "
+        "PARTITION p2031q1 VALUES LESS THAN ('2031-04-01'), "
+        "PARTITION p2031q2 VALUES LESS THAN ('2031-07-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+    )
+    assert parse_bound("'2031-04-01'") == date(2031, 4, 1)
+    assert parse_bound("MAXVALUE") is None
+
+def test_archive_search_bounds_partition_columns_outside_of_or():
+    query, params = build_search_query(7, None, date(2031, 1, 1), date(2031, 3, 31), None, None, None, archive=True)
+    one_off, series = query.split("UNION ALL")
+    assert "e.date >= %s AND ea.event_date >= %s" in one_off
+    assert "ea.event_date <= %s" in one_off and "ea.event_date <= %s" in series
+    assert "e.date >= %s" not in series
+    assert query.rstrip().endswith("ORDER BY date DESC, created_at DESC")
+    assert query.count("%s") == len(params)
+    assert params == [7, date(2031, 3, 31), date(2031, 3, 31), date(2031, 1, 1), date(2031, 1, 1),
+                      7, date(2031, 3, 31), date(2031, 3, 31), date(2031, 1, 1)]
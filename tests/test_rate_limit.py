@@ -0,0 +1,50 @@
+import time
+import fakeredis
+import pytest
+from rate_limit import InMemoryTokenBucketLimiter, RedisTokenBucketLimiter, LoginThrottle
+from handlers.exceptions import RateLimitException
+
+
+def test_bucket_allows_burst_then_refills():
+    limiter = InMemoryTokenBucketLimiter(capacity=2, refill_per_second=20)
+    assert limiter.consume("k")[0]
+    assert limiter.consume("k")[0]
+    allowed, retry_after = limiter.consume("k")
+    assert not allowed
+    assert 0 < retry_after <= 0.05
+    time.sleep(0.06)
+    assert limiter.consume("k")[0]
+
+
+def test_memory_buckets_are_lru_bounded():
+    limiter = InMemoryTokenBucketLimiter(capacity=1, refill_per_second=0.001, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.consume(key)
+    stats = limiter.stats()
+    assert stats["keys"] == 2
+    assert stats["evicted"] == 1
+    assert not limiter.consume("c")[0]
+
+
+def test_redis_buckets_are_shared():
+    client = fakeredis.FakeRedis()
+    first = RedisTokenBucketLimiter(capacity=2, refill_per_second=0.001, client=client)
+    second = RedisTokenBucketLimiter(capacity=2, refill_per_second=0.001, client=client)
+    assert first.consume("ip:1")[0]
+    assert second.consume("ip:1")[0]
+    assert not first.consume("ip:1")[0]
+    assert client.pttl(first.prefix + "ip:1") > 0
+
+
+def test_login_throttle_limits_email_across_ips():
+    throttle = LoginThrottle(
+        email_limiter=InMemoryTokenBucketLimiter(capacity=2, refill_per_second=0.001),
+        ip_limiter=InMemoryTokenBucketLimiter(capacity=100, refill_per_second=0.001),
+    )
+    throttle.check("User@Example.com", "10.0.0.1")
+    throttle.check("user@example.com ", "10.0.0.2")
+    with pytest.raises(RateLimitException) as exc:
+        throttle.check("user@example.com", "10.0.0.3")
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after >= 1
+    throttle.check("other@example.com", "10.0.0.3")
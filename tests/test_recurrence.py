@@ -0,0 +1,65 @@
+import pytest
+from datetime import date
+from recurrence import iter_occurrences, expand_events, is_occurrence, last_occurrence
+from validators import validate_recurrence
+from handlers.exceptions import ValidationException
+
+def test_weekly_occurrences_start_inside_the_window():
+    dates = list(iter_occurrences(date(2020, 1, 6), "weekly", 2,
+                                  window_start=date(2030, 1, 1), window_end=date(2030, 2, 1)))
+    assert dates == [date(2030, 1, 7), date(2030, 1, 21)]
+    assert list(iter_occurrences(date(2020, 1, 6), "weekly", 2, window_start=date(2030, 1, 1),
+                                 window_end=date(2030, 2, 1), descending=True)) == dates[::-1]
+
+def test_monthly_occurrences_clamp_to_month_end_and_respect_count():
+    dates = list(iter_occurrences(date(2030, 1, 31), "monthly", count=4))
+    assert dates == [date(2030, 1, 31), date(2030, 2, 28), date(2030, 3, 31), date(2030, 4, 30)]
+    assert list(iter_occurrences(date(2030, 1, 31), "monthly", until=date(2030, 3, 1))) == dates[:2]
+
+def test_unbounded_series_needs_a_window_end():
+    with pytest.raises(ValueError):
+        list(iter_occurrences(date(2030, 1, 1), "weekly"))
+
+def test_expand_merges_series_with_one_off_events_newest_first():
+    events = [
+        {"id": 1, "date": date(2030, 1, 9), "title": "One-off"},
+        {"id": 2, "date": date(2030, 1, 1), "title": "Weekly", "recurrence_freq": "weekly", "recurrence_interval": 1},
+        {"id": 3, "date": date(2029, 12, 15), "title": "Monthly", "recurrence_freq": "monthly", "recurrence_count": 2},
+        {"id": 4, "date": date(2031, 1, 1), "title": "Outside"},
+    ]
+    expanded = list(expand_events(events, date(2030, 1, 1), date(2030, 1, 20)))
+    assert [(e["id"], e["date"]) for e in expanded] == [
+        (2, date(2030, 1, 15)), (3, date(2030, 1, 15)), (1, date(2030, 1, 9)), (2, date(2030, 1, 8)), (2, date(2030, 1, 1)),
+    ]
+    assert expanded[0]["occurrence_date"] == date(2030, 1, 15)
+    assert "occurrence_date" not in expanded[2]
+    # Lazy: only as many occurrences as requested are produced
+    assert len(list(expand_events(events, None, None, horizon=date(2100, 1, 1), limit=3))) == 3
+
+def test_series_limit_caps_each_series_but_never_drops_one_off_events():
+    events = [
+        {"id": 1, "date": date(2008, 1, 7), "recurrence_freq": "weekly", "recurrence_interval": 1},
+        {"id": 2, "date": date(2010, 1, 4), "recurrence_freq": "weekly", "recurrence_interval": 1},
+        {"id": 3, "date": date(2015, 6, 1), "title": "One-off"},
+    ]
+    expanded = list(expand_events(events, None, None, horizon=date(2030, 1, 1), series_limit=500))
+    assert len(expanded) == 1001
+    assert [e["id"] for e in expanded].count(1) == 500
+    assert expanded[-1]["id"] == 3
+
+def test_is_occurrence_and_rule_validation():
+    series = {"date": date(2030, 1, 1), "recurrence_freq": "weekly", "recurrence_interval": 1}
+    assert is_occurrence(series, date(2030, 1, 22))
+    assert not is_occurrence(series, date(2030, 1, 23))
+    assert validate_recurrence("Weekly", None, None, None, date(2030, 1, 1))["freq"] == "weekly"
+    assert validate_recurrence(None, None, None, None, date(2030, 1, 1)) is None
+    with pytest.raises(ValidationException):
+        validate_recurrence("weekly", 1, date(2029, 1, 1), None, date(2030, 1, 1))
+    with pytest.raises(ValidationException):
+        validate_recurrence(None, 2, None, None, date(2030, 1, 1))
+
+def test_last_occurrence_of_bounded_and_unbounded_series():
+    assert last_occurrence({"date": date(2030, 1, 31), "recurrence_freq": "monthly", "recurrence_count": 3}) == date(2030, 3, 31)
+    assert last_occurrence({"date": date(2030, 1, 1), "recurrence_freq": "weekly", "recurrence_until": date(2030, 1, 20)}) == date(2030, 1, 15)
+    assert last_occurrence({"date": date(2030, 1, 1), "recurrence_freq": "weekly"}) is None
+    assert last_occurrence({"date": date(2030, 1, 1), "recurrence_freq": None}) == date(2030, 1, 1)
@@ -0,0 +1,58 @@
+import time
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+import security
+from security import VerifiedToken, VerifiedTokenCache, create_access_token, get_current_token
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def fresh_token_cache(monkeypatch):
+    cache = VerifiedTokenCache(max_entries=8)
+    monkeypatch.setattr(security, "token_cache", cache)
+    monkeypatch.setattr(security, "_revocation_check", None)
+    return cache
+
+
+def test_repeat_tokens_skip_jwt_decode(fresh_token_cache, monkeypatch):
+    token = create_access_token(7)
+    decode_calls = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: decode_calls.append(1) or real_decode(*a, **kw))
+
+    assert get_current_token(_credentials(token)).user_id == 7
+    assert get_current_token(_credentials(token)).user_id == 7
+    assert len(decode_calls) == 1
+    assert fresh_token_cache.stats()["hits"] == 1
+
+
+def test_expired_entries_are_not_served():
+    cache = VerifiedTokenCache(max_entries=8)
+    cache.put("stale", VerifiedToken(user_id=1, exp=time.time() - 1))
+    cache.put("live", VerifiedToken(user_id=2, exp=time.time() + 60))
+    assert cache.get("stale") is None
+    assert cache.get("live").user_id == 2
+    assert cache.stats()["expired"] == 1
+
+
+def test_cache_is_bounded():
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    for i in range(3):
+        cache.put(f"t{i}", VerifiedToken(user_id=i, exp=exp))
+    assert cache.get("t0") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_revocation_check_applies_to_cached_tokens(fresh_token_cache, monkeypatch):
+    token = create_access_token(3)
+    assert get_current_token(_credentials(token)).user_id == 3
+    monkeypatch.setattr(security, "_revocation_check", lambda verified: verified.user_id == 3)
+    with pytest.raises(HTTPException) as exc:
+        get_current_token(_credentials(token))
+    assert exc.value.status_code == 401
+    assert fresh_token_cache.get(token) is None
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+import pytest
+from singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_execution():
+    flight = SingleFlight("test_threads")
+    started = threading.Event()
+    executions = []
+
+    def load():
+        executions.append(1)
+        started.set()
+        time.sleep(0.1)
+        return {"id": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("event:1", load))) for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(executions) == 1
+    assert results == [{"id": 1}] * 8
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+
+def test_errors_propagate_to_waiters_and_are_not_cached():
+    flight = SingleFlight("test_errors")
+
+    def fail():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", fail)
+    assert flight.do("k", lambda: 42) == 42
+
+
+def test_async_tasks_share_one_execution():
+    flight = SingleFlight("test_async")
+    executions = []
+
+    async def load():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("k", load) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(executions) == 1
+    assert flight.stats()["coalesced"] == 4
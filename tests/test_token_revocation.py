@@ -0,0 +1,49 @@
+import time
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+import security
+from security import VerifiedTokenCache, create_access_token, get_current_token, verify_access_token
+from token_revocation import InMemoryRevocationStore, RedisRevocationStore
+
+
+def test_memory_store_forgets_revocations_after_expiry():
+    store = InMemoryRevocationStore()
+    store.revoke("short", time.time() + 0.05)
+    store.revoke("long", time.time() + 60)
+    assert store.is_revoked("short")
+    time.sleep(0.06)
+    assert not store.is_revoked("short")
+    assert store.is_revoked("long")
+    assert store.stats()["revoked"] == 1
+    assert store.stats()["heap_size"] == 1
+
+
+def test_memory_store_ignores_already_expired_tokens():
+    store = InMemoryRevocationStore()
+    store.revoke("gone", time.time() - 1)
+    assert store.stats()["revoked"] == 0
+
+
+def test_redis_store_expires_with_token():
+    store = RedisRevocationStore(client=fakeredis.FakeRedis(), prefix="test:")
+    store.revoke("abc", time.time() + 60)
+    assert store.is_revoked("abc")
+    assert not store.is_revoked("other")
+    assert 0 < store.client.pttl("test:revoked:abc") <= 60000
+
+
+def test_revoked_token_is_rejected(monkeypatch):
+    store = InMemoryRevocationStore()
+    monkeypatch.setattr(security, "token_cache", VerifiedTokenCache(max_entries=8))
+    monkeypatch.setattr(security, "_revocation_check", lambda verified: store.is_revoked(verified.jti))
+    token = create_access_token(5)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    verified = get_current_token(credentials)
+    assert verified.jti and verified.jti != verify_access_token(create_access_token(5)).jti
+    store.revoke(verified.jti, verified.exp)
+    with pytest.raises(HTTPException) as exc:
+        get_current_token(credentials)
+    assert exc.value.status_code == 401
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+import pytest
+import services.token_service as token_service_module
+from services.token_service import TokenService, hash_refresh_token
+from handlers.exceptions import AuthenticationException
+from security import verify_access_token
+
+class StubConnection:
+    def start_transaction(self):
+        pass
+    def commit(self):
+        pass
+    def rollback(self):
+        pass
+    def close(self):
+        pass
+
+class StubRefreshRepo:
+    def __init__(self):
+        self.rows = {}
+    def create(self, user_id, token_hash, family_id, expires_at, conn=None):
+        token_id = len(self.rows) + 1
+        self.rows[token_hash] = {"id": token_id, "user_id": user_id, "family_id": family_id,
+                                 "expires_at": expires_at, "revoked_at": None}
+        return token_id
+    def get_by_hash(self, token_hash, conn, for_update=False):
+        row = self.rows.get(token_hash)
+        return dict(row) if row else None
+    def mark_replaced(self, token_id, replaced_by, conn):
+        for row in self.rows.values():
+            if row["id"] == token_id:
+                row["revoked_at"] = datetime.utcnow()
+    def revoke_family(self, family_id, conn=None):
+        live = [row for row in self.rows.values() if row["family_id"] == family_id and row["revoked_at"] is None]
+        for row in live:
+            row["revoked_at"] = datetime.utcnow()
+        return len(live)
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(token_service_module, "get_db_connection", StubConnection)
+    return TokenService(refresh_repo=StubRefreshRepo())
+
+def test_refresh_rotates_and_stores_only_digests(service):
+    first = service.issue_refresh_token(user_id=4)
+    assert first not in service.refresh_repo.rows
+    assert hash_refresh_token(first) in service.refresh_repo.rows
+
+    result = service.refresh(first)
+    assert result["user_id"] == 4
+    assert verify_access_token(result["token"]).user_id == 4
+    assert result["refresh_token"] != first
+    assert service.refresh(result["refresh_token"])["user_id"] == 4
+
+def test_replayed_refresh_token_revokes_family(service):
+    first = service.issue_refresh_token(user_id=4)
+    second = service.refresh(first)["refresh_token"]
+    with pytest.raises(AuthenticationException):
+        service.refresh(first)
+    with pytest.raises(AuthenticationException):
+        service.refresh(second)
+
+def test_expired_and_unknown_refresh_tokens_are_rejected(service):
+    token = service.issue_refresh_token(user_id=4)
+    service.refresh_repo.rows[hash_refresh_token(token)]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+    with pytest.raises(AuthenticationException):
+        service.refresh(token)
+    with pytest.raises(AuthenticationException):
+        service.refresh("not-a-token")
+
+def test_logout_only_revokes_the_callers_refresh_tokens(service):
+    token = service.issue_refresh_token(user_id=4)
+    with pytest.raises(AuthenticationException):
+        service.revoke_refresh_token(token, user_id=5)
+    assert service.refresh_repo.rows[hash_refresh_token(token)]["revoked_at"] is None
+    service.revoke_refresh_token(token, user_id=4)
+    with pytest.raises(AuthenticationException):
+        service.refresh(token)
@@ -0,0 +1,65 @@
+import pytest
+import services.user_import_service as import_module
+from services.user_import_service import UserImportService, parse_user_import
+from handlers.exceptions import ValidationException
+from utils import verify_password
+
+class StubUserRepo:
+    def __init__(self, registered=(), taken_during_insert=()):
+        self.registered = set(registered)
+        self.taken_during_insert = set(taken_during_insert)
+        self.batches = []
+    def get_existing_emails(self, emails):
+        return {email for email in emails if email in self.registered}
+    def create_users_batch(self, users):
+        self.batches.append(users)
+        created = {}
+        for user in users:
+            if user["email"] not in self.taken_during_insert:
+                created[user["email"]] = 100 + len(self.registered)
+                self.registered.add(user["email"])
+        return {"created": created, "conflicts": [u["email"] for u in users if u["email"] not in created]}
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    monkeypatch.setattr(import_module, "get_bcrypt_rounds", lambda: 4)
+
+def test_parse_csv_and_json():
+    csv_rows = parse_user_import(b"name,email,password\nAna,ana@example.com,secret1\n", "csv")
+    assert csv_rows == [{"name": "Ana", "email": "ana@example.com", "password": "secret1"}]
+    json_rows = parse_user_import(b'{"users": [{"name": "Ana", "email": "a@b.co", "password": "x"}]}', "json")
+    assert json_rows[0]["email"] == "a@b.co"
+    with pytest.raises(ValidationException):
+        parse_user_import(b"name,email\nAna,ana@example.com\n", "csv")
+
+def test_import_reports_each_row_without_aborting():
+    repo = StubUserRepo(registered={"taken@example.com"}, taken_during_insert={"race@example.com"})
+    service = UserImportService(user_repository=repo, batch_size=2, hash_workers=1)
+    rows = [
+        {"name": "Ana", "email": "Ana@Example.com", "password": "secret1"},
+        {"name": "Bo", "email": "taken@example.com", "password": "secret1"},
+        {"name": "Cy", "email": "ana@example.com", "password": "secret1"},
+        {"name": "D", "email": "d@example.com", "password": "secret1"},
+        {"name": "Eve", "email": "race@example.com", "password": "secret1"},
+        {"name": "Fay", "email": "fay@example.com", "password": "secret1"},
+    ]
+    result = service.import_users(rows)
+    assert [r["status"] for r in result["results"]] == ["created", "conflict", "conflict", "invalid", "conflict", "created"]
+    assert (result["created"], result["conflict"], result["invalid"]) == (2, 3, 1)
+    # Only rows that reached the insert were hashed and batched
+    inserted = [user for batch in repo.batches for user in batch]
+    assert [user["email"] for user in inserted] == ["ana@example.com", "race@example.com", "fay@example.com"]
+    assert len(repo.batches) == 2
+    assert verify_password("secret1", inserted[0]["password"])
+
+def test_passwords_are_hashed_in_worker_processes():
+    service = UserImportService(user_repository=StubUserRepo(), hash_workers=2)
+    hashes = service._hash_passwords(["secret1", "secret2", "secret3"])
+    assert [verify_password(p, h) for p, h in zip(["secret1", "secret2", "secret3"], hashes)] == [True] * 3
+    assert hashes[0].startswith("$2b$04$")
+    # The pool outlives the call: a second import reuses the same worker processes
+    from services.user_import_service import get_hash_pool, shutdown_hash_pool
+    pool = get_hash_pool()
+    service._hash_passwords(["secret4", "secret5"])
+    assert get_hash_pool() is pool
+    shutdown_hash_pool()
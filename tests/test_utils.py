@@ -0,0 +1,25 @@
+import pytest
+import utils
+from utils import calibrate_bcrypt_rounds, configure_bcrypt_rounds, hash_password, password_needs_rehash
+
+
+@pytest.fixture
+def restore_bcrypt_config(monkeypatch):
+    saved = utils.pwd_context.to_dict()
+    monkeypatch.setattr(utils, "_bcrypt_rounds", None)
+    yield
+    utils.pwd_context.load(saved)
+
+
+def test_calibration_stops_at_first_cost_over_target():
+    rounds, timings = calibrate_bcrypt_rounds(target_ms=0.0, min_rounds=4, max_rounds=8, samples=1)
+    assert rounds == 4
+    assert list(timings) == [4]
+
+
+def test_hashes_below_configured_cost_need_rehash(restore_bcrypt_config):
+    stale = hash_password("password123", rounds=4)
+    configure_bcrypt_rounds(5)
+    assert password_needs_rehash(stale)
+    assert not password_needs_rehash(hash_password("password123", rounds=5))
+    assert utils.get_bcrypt_rounds() == 5
@@ -0,0 +1,82 @@
+import threading
+
+from write_behind import AttendanceWriteBehindQueue
+
+
+class RecordingFlush:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+    def __call__(self, event_id, statuses):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append((event_id, dict(statuses)))
+
+
+def test_updates_are_coalesced_per_attendee():
+    flush = RecordingFlush()
+    queue = AttendanceWriteBehindQueue(flush, interval_seconds=60, max_batch=100)
+    queue.submit(1, 2, "going")
+    queue.submit(1, 2, "maybe")
+    queue.submit(1, 3, "going")
+    queue.submit(5, 2, "not_going")
+
+    assert queue.flush() == 3
+    assert flush.batches == [(1, {2: "maybe", 3: "going"}), (5, {2: "not_going"})]
+    assert queue.stats()["coalesced"] == 1
+    assert queue.flush() == 0
+
+
+def test_failed_flush_is_retried_unless_superseded():
+    flush = RecordingFlush(fail_times=1)
+    queue = AttendanceWriteBehindQueue(flush, interval_seconds=60, max_batch=100, max_attempts=2)
+    queue.submit(1, 2, "going")
+    queue.submit(1, 3, "going")
+    assert queue.flush() == 0
+    queue.submit(1, 3, "maybe")
+
+    assert queue.flush() == 2
+    assert flush.batches == [(1, {2: "going", 3: "maybe"})]
+
+
+def test_updates_are_dropped_after_max_attempts():
+    flush = RecordingFlush(fail_times=10)
+    queue = AttendanceWriteBehindQueue(flush, interval_seconds=60, max_batch=100, max_attempts=2)
+    queue.submit(1, 2, "going")
+    queue.flush()
+    queue.flush()
+    assert queue.stats()["pending"] == 0
+    assert queue.stats()["dropped"] == 1
+
+
+def test_size_threshold_wakes_the_flusher_and_stop_flushes_the_rest():
+    flushed = threading.Event()
+    batches = []
+    def flush_event(event_id, statuses):
+        batches.append((event_id, dict(statuses)))
+        flushed.set()
+
+    queue = AttendanceWriteBehindQueue(flush_event, interval_seconds=60, max_batch=2)
+    queue.start()
+    queue.submit(1, 2, "going")
+    queue.submit(1, 3, "going")
+    assert flushed.wait(5)
+
+    queue.submit(1, 4, "maybe")
+    queue.stop()
+    assert batches == [(1, {2: "going", 3: "going"}), (1, {4: "maybe"})]
+
+
+def test_direct_writes_discard_or_flush_the_pending_statuses():
+    flush = RecordingFlush()
+    queue = AttendanceWriteBehindQueue(flush, interval_seconds=60, max_batch=100)
+    queue.submit(1, 2, "going")
+    queue.submit(1, 3, "maybe")
+    queue.submit(1, 4, "going")
+
+    assert queue.discard(1, [2, 5]) == 1
+    assert queue.flush_pending(1, [3]) == 1
+    assert flush.batches == [(1, {3: "maybe"})]
+    assert queue.flush() == 1
+    assert flush.batches[-1] == (1, {4: "going"})
@@ -0,0 +1,143 @@
+"""Revoked access tokens
+
+A token is revoked by its `jti` claim until its own `exp`; after that the
+signature check rejects it anyway, so the entry can be forgotten. Memory
+therefore only ever holds revoked tokens that are still alive.
+
+The in-memory store is per process. With several workers use the Redis
+store so a logout handled by one worker is seen by all of them.
+"""
+import heapq
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import metrics
+from config import REVOCATION_BACKEND, REVOCATION_REDIS_URL, CACHE_KEY_PREFIX
+from security import VerifiedToken
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """Expiring set of revoked token ids"""
+
+    def revoke(self, jti: str, exp: float) -> None:
+        raise NotImplementedError
+
+    def is_revoked(self, jti: str) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """Dict for O(1) lookups plus a min-heap on `exp` to drop entries as they expire"""
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._revocations = 0
+
+    def _purge_expired(self, now: float) -> None:
+        # Callers hold the lock; each entry is popped once, so purging is amortized O(log n)
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            exp, jti = heapq.heappop(heap)
+            # A token revoked twice has two heap entries; only the current one removes it
+            if self._revoked.get(jti) == exp:
+                del self._revoked[jti]
+
+    def revoke(self, jti: str, exp: float) -> None:
+        now = time.time()
+        if exp <= now:
+            return
+        with self._lock:
+            self._purge_expired(now)
+            self._revoked[jti] = exp
+            heapq.heappush(self._expiry_heap, (exp, jti))
+            self._revocations += 1
+
+    def is_revoked(self, jti: str) -> bool:
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            return jti in self._revoked
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "revoked": len(self._revoked),
+                "heap_size": len(self._expiry_heap),
+                "revocations": self._revocations,
+            }
+
+
+class RedisRevocationStore(RevocationStore):
+    """Revocations shared by all workers; Redis expires each key at the token's `exp`"""
+
+    def __init__(self, url: str = REVOCATION_REDIS_URL, client=None, prefix: str = CACHE_KEY_PREFIX):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The 'redis' package is required for the redis revocation backend")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, jti: str) -> str:
+        return f"{self.prefix}revoked:{jti}"
+
+    def revoke(self, jti: str, exp: float) -> None:
+        ttl_ms = int((exp - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        self.client.set(self._key(jti), b"1", px=ttl_ms)
+
+    def is_revoked(self, jti: str) -> bool:
+        return bool(self.client.exists(self._key(jti)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+def create_revocation_store(backend: str = REVOCATION_BACKEND) -> RevocationStore:
+    """Build the revocation store selected in configuration"""
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return InMemoryRevocationStore()
+    if backend == "redis":
+        return RedisRevocationStore()
+    raise ValueError(f"Unknown revocation backend: {backend}")
+
+
+_store: Optional[RevocationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_revocation_store() -> RevocationStore:
+    """Return the process-wide revocation store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_revocation_store()
+                metrics.register("token_revocation", _store.stats)
+                logger.info(f"Token revocation store initialized: {type(_store).__name__}")
+    return _store
+
+
+def is_token_revoked(verified: VerifiedToken) -> bool:
+    """Revocation hook for security.get_current_user_id"""
+    # Tokens issued before jti claims existed cannot be revoked individually
+    if not verified.jti:
+        return False
+    return get_revocation_store().is_revoked(verified.jti)
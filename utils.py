@@ -1,7 +1,13 @@
 import re
+import statistics
+import time
+from typing import Dict, Optional, Tuple
 from passlib.context import CryptContext
+from config import BCRYPT_ROUNDS, BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS
+from executors import get_auth_executor
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_bcrypt_rounds: Optional[int] = None
 
 def validate_email(email: str) -> bool:
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -10,8 +16,65 @@ def validate_email(email: str) -> bool:
 def validate_password(password: str) -> bool:
     return len(password) >= 6
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    if rounds:
+        return pwd_context.handler("bcrypt").using(rounds=rounds).hash(password)
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash in the auth pool so bcrypt does not block the event loop"""
+    # Pass the cost explicitly: process-pool workers do not share this module's state
+    return await get_auth_executor().run(hash_password, password, _bcrypt_rounds)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify in the auth pool so bcrypt does not block the event loop"""
+    return await get_auth_executor().run(verify_password, plain_password, hashed_password)
+
+
+def configure_bcrypt_rounds(rounds: int) -> None:
+    """Hash new passwords with `rounds` and report weaker hashes as needing an update"""
+    global _bcrypt_rounds
+    pwd_context.update(bcrypt__rounds=rounds, bcrypt__min_rounds=rounds)
+    _bcrypt_rounds = rounds
+
+
+def get_bcrypt_rounds() -> Optional[int]:
+    """Configured bcrypt cost, or None when passlib's default is used"""
+    return _bcrypt_rounds
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = BCRYPT_MIN_ROUNDS,
+                            max_rounds: int = BCRYPT_MAX_ROUNDS, samples: int = 3) -> Tuple[int, Dict[int, float]]:
+    """Pick the highest bcrypt cost whose verification stays within `target_ms` on this host.
+
+    Returns the chosen rounds and the median verify time (ms) measured per cost.
+    Each extra round doubles the work, so measuring stops at the first cost
+    over the target.
+    """
+    timings: Dict[int, float] = {}
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        hashed = pwd_context.handler("bcrypt").using(rounds=rounds).hash("calibration-password")
+        durations = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            pwd_context.verify("calibration-password", hashed)
+            durations.append((time.perf_counter() - start) * 1000)
+        timings[rounds] = statistics.median(durations)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+if BCRYPT_ROUNDS:
+    configure_bcrypt_rounds(BCRYPT_ROUNDS)
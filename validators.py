@@ -1,7 +1,7 @@
 """Input validation utilities"""
 
 from datetime import date, time
-from typing import Optional
+from typing import Optional, List
 from handlers.exceptions import ValidationException
 
 
@@ -186,6 +186,17 @@ def validate_event_id(event_id: int) -> int:
     return event_id
 
 
+def validate_event_ids(event_ids: List[int], max_items: int) -> List[int]:
+    """Validate a bulk list of event IDs and drop duplicates, keeping the first position"""
+    if not event_ids:
+        raise ValidationException("At least one event ID is required")
+
+    if len(event_ids) > max_items:
+        raise ValidationException(f"At most {max_items} events can be changed at once")
+
+    return list(dict.fromkeys(validate_event_id(event_id) for event_id in event_ids))
+
+
 def validate_keyword(keyword: Optional[str]) -> Optional[str]:
     """Validate search keyword"""
     if keyword is None:
@@ -204,3 +215,37 @@ def validate_keyword(keyword: Optional[str]) -> Optional[str]:
     
     return keyword if keyword else None
 
+
+
+def validate_recurrence(
+    freq: Optional[str],
+    interval: Optional[int],
+    until: Optional[date],
+    count: Optional[int],
+    start: date
+) -> Optional[dict]:
+    """Validate a recurrence rule; returns None for a one-off event"""
+    if freq is None:
+        if interval not in (None, 1) or until is not None or count is not None:
+            raise ValidationException("Recurrence frequency is required with an interval, until or count")
+        return None
+    
+    if not isinstance(freq, str) or freq.strip().lower() not in ('weekly', 'monthly'):
+        raise ValidationException("Recurrence frequency must be one of: weekly, monthly")
+    
+    interval = 1 if interval is None else interval
+    if not isinstance(interval, int) or not 1 <= interval <= 52:
+        raise ValidationException("Recurrence interval must be an integer between 1 and 52")
+    
+    if until is not None and until < start:
+        raise ValidationException("Recurrence end date must be on or after the event date")
+    
+    if count is not None and (not isinstance(count, int) or count < 1):
+        raise ValidationException("Recurrence count must be a positive integer")
+    
+    return {
+        "freq": freq.strip().lower(),
+        "interval": interval,
+        "until": until,
+        "count": count
+    }
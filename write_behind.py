@@ -0,0 +1,212 @@
+"""Write-behind queue for attendance updates
+
+In write-behind mode an attendance update is validated, placed in an
+in-process map keyed by (event_id, user_id) and acknowledged. A later update
+for the same pair replaces the queued one, so an attendee flipping between
+"going" and "maybe" costs one row write per flush instead of one per click.
+A background thread flushes the map every `interval_seconds`, or sooner once
+`max_batch` pairs are pending, as one transaction per event.
+
+Durability: an acknowledged update is only in this process's memory until
+its flush commits. A crash or kill -9 loses up to one interval of updates;
+a normal shutdown calls `stop()`, which flushes synchronously. Failed
+flushes are retried up to `max_attempts` times (a newer update for the pair
+wins over the retry) and then dropped with an error log. Until the flush
+lands, reads (and other workers) still see the previous status: attendee
+lists and feeds lag an acknowledged update by up to `interval_seconds`
+(ATTENDANCE_WRITE_BEHIND_INTERVAL_MS). Pending statuses are not overlaid on
+reads, since only this process could see them and the list ETags would not
+change with them.
+
+Direct writes to the same attendees go through `discard` (the bulk update
+replaces the queued status) or `flush_pending` (the occurrence update reads
+the series status), so a queued status never lands on top of them.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from config import (
+    ATTENDANCE_WRITE_BEHIND_INTERVAL_MS,
+    ATTENDANCE_WRITE_BEHIND_MAX_BATCH,
+    ATTENDANCE_WRITE_BEHIND_MAX_ATTEMPTS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AttendanceWriteBehindQueue:
+    """Coalescing map of pending statuses flushed by a daemon thread.
+
+    `flush_event(event_id, {user_id: status})` must apply one event's batch
+    atomically and raise on failure.
+    """
+
+    def __init__(
+        self,
+        flush_event: Callable[[int, Dict[int, str]], Any],
+        interval_seconds: float = ATTENDANCE_WRITE_BEHIND_INTERVAL_MS / 1000,
+        max_batch: int = ATTENDANCE_WRITE_BEHIND_MAX_BATCH,
+        max_attempts: int = ATTENDANCE_WRITE_BEHIND_MAX_ATTEMPTS
+    ):
+        self.flush_event = flush_event
+        self.interval_seconds = interval_seconds
+        self.max_batch = max(1, max_batch)
+        self.max_attempts = max(1, max_attempts)
+        self._pending: Dict[Tuple[int, int], str] = {}
+        self._attempts: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so the thread and stop() never write the same batch twice
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._submitted = 0
+        self._coalesced = 0
+        self._written = 0
+        self._flushes = 0
+        self._failures = 0
+        self._dropped = 0
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="attendance-write-behind", daemon=True)
+            self._thread.start()
+
+    def submit(self, event_id: int, user_id: int, status: str) -> None:
+        """Queue a status; replaces any status still pending for the same attendee"""
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError("Attendance write-behind queue is stopped")
+            key = (event_id, user_id)
+            if key in self._pending:
+                self._coalesced += 1
+            self._pending[key] = status
+            self._attempts.pop(key, None)
+            self._submitted += 1
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wake.set()
+
+    def discard(self, event_id: int, user_ids: Iterable[int]) -> int:
+        """Drop the statuses pending for these attendees before a direct write replaces them.
+
+        Waits for a flush in progress, so no older status lands after the
+        caller's write. Returns the number of statuses dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                dropped = 0
+                for user_id in user_ids:
+                    key = (event_id, user_id)
+                    if self._pending.pop(key, None) is not None:
+                        dropped += 1
+                    self._attempts.pop(key, None)
+                return dropped
+
+    def flush_pending(self, event_id: int, user_ids: Iterable[int]) -> int:
+        """Write the statuses pending for these attendees now, for a direct write that reads them"""
+        with self._flush_lock:
+            with self._lock:
+                statuses = {
+                    user_id: self._pending.pop((event_id, user_id))
+                    for user_id in user_ids
+                    if (event_id, user_id) in self._pending
+                }
+            if not statuses:
+                return 0
+            try:
+                self.flush_event(event_id, statuses)
+            except Exception:
+                self._requeue(event_id, statuses)
+                raise
+            with self._lock:
+                for user_id in statuses:
+                    self._attempts.pop((event_id, user_id), None)
+                self._written += len(statuses)
+            return len(statuses)
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of statuses written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            by_event: Dict[int, Dict[int, str]] = {}
+            for (event_id, user_id), status in batch.items():
+                by_event.setdefault(event_id, {})[user_id] = status
+
+            written = 0
+            for event_id, statuses in by_event.items():
+                try:
+                    self.flush_event(event_id, statuses)
+                    written += len(statuses)
+                    with self._lock:
+                        for user_id in statuses:
+                            self._attempts.pop((event_id, user_id), None)
+                except Exception as e:
+                    logger.error(f"Write-behind flush failed for event {event_id}: {str(e)}")
+                    self._requeue(event_id, statuses)
+
+            with self._lock:
+                self._written += written
+                self._flushes += 1
+            return written
+
+    def _requeue(self, event_id: int, statuses: Dict[int, str]) -> None:
+        with self._lock:
+            self._failures += 1
+            for user_id, status in statuses.items():
+                key = (event_id, user_id)
+                if key in self._pending:
+                    continue  # superseded by a newer update while flushing
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts >= self.max_attempts:
+                    self._attempts.pop(key, None)
+                    self._dropped += 1
+                    logger.error(f"Dropping attendance update for user {user_id} in event {event_id} after {attempts} attempts")
+                    continue
+                self._attempts[key] = attempts
+                self._pending[key] = status
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            if self._stopping:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush loop error: {str(e)}")
+                time.sleep(self.interval_seconds)
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """Stop accepting updates, stop the thread and flush what is left synchronously"""
+        with self._lock:
+            self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        written = self.flush()
+        with self._lock:
+            left = len(self._pending)
+        if left:
+            logger.error(f"{left} queued attendance updates could not be written at shutdown")
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "submitted": self._submitted,
+                "coalesced": self._coalesced,
+                "written": self._written,
+                "flushes": self._flushes,
+                "failures": self._failures,
+                "dropped": self._dropped,
+            }